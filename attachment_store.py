@@ -0,0 +1,68 @@
+"""
+附件存储模块 - 服务端按内容哈希缓存反馈图片，供MCP资源按需读取（不依赖Qt）
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from config import ATTACHMENT_CACHE_MAX_BYTES, ATTACHMENT_URI_PREFIX
+
+
+class AttachmentStore:
+    """有界LRU附件缓存：按字节总量淘汰最久未使用的附件"""
+
+    def __init__(self, max_bytes: int = ATTACHMENT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, data: bytes, mime_type: str, width: int = 0, height: int = 0) -> Optional[dict]:
+        """保存附件并返回轻量级句柄；附件超过缓存上限无法保存时返回None（调用方应直接内联返回）"""
+        if len(data) > self.max_bytes:
+            return None
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if digest in self._items:
+                self._items.move_to_end(digest)
+            else:
+                self._items[digest] = (data, mime_type)
+                self._total_bytes += len(data)
+                self._evict()
+
+        return {
+            "uri": f"{ATTACHMENT_URI_PREFIX}{digest}",
+            "mime_type": mime_type,
+            "width": width,
+            "height": height,
+            "bytes": len(data),
+            "sha256": digest,
+        }
+
+    def get(self, digest: str) -> Optional[Tuple[bytes, str]]:
+        """按哈希获取附件数据和MIME类型，不存在或已被淘汰时返回None"""
+        with self._lock:
+            item = self._items.get(digest)
+            if item is not None:
+                self._items.move_to_end(digest)
+            return item
+
+    def __contains__(self, digest: str) -> bool:
+        with self._lock:
+            return digest in self._items
+
+    def _evict(self):
+        """淘汰最久未使用的附件直到总量不超过上限"""
+        while self._total_bytes > self.max_bytes and self._items:
+            _, (data, _) = self._items.popitem(last=False)
+            self._total_bytes -= len(data)
+
+    @property
+    def total_bytes(self) -> int:
+        """当前缓存的字节总量"""
+        return self._total_bytes
+
+
+# 全局实例
+attachment_store = AttachmentStore()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+反馈往返延迟基准测试
+在 QT_QPA_PLATFORM=offscreen 下通过 server.launch_feedback_ui 驱动反馈窗口，窗口显示后自动提交，
+统计各阶段耗时的百分位数，并可写入JSON基线供后续运行对比。
+
+阶段：
+  call_to_shown        工具调用 -> 窗口显示
+  shown_to_interactive 窗口显示 -> 事件循环空闲（可响应输入）
+  submit_to_result     提交 -> server.py 收到完整结果
+  total                工具调用 -> server.py 收到完整结果
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import platform
+import tempfile
+from datetime import datetime
+from config import UI_HOST_ENV, AUTO_SUBMIT_ENV
+from metrics import percentile
+
+PHASES = ["call_to_shown", "shown_to_interactive", "submit_to_result", "total"]
+PERCENTILES = [50, 90, 95, 99]
+DEFAULT_BASELINE = "benchmark_baseline.json"
+
+
+def summarize(samples):
+    """将各阶段样本（毫秒）汇总为百分位统计"""
+    summary = {}
+    for phase in PHASES:
+        values = sorted(sample[phase] for sample in samples)
+        stats = {f"p{pct}": round(percentile(values, pct), 2) for pct in PERCENTILES}
+        stats["max"] = round(max(values), 2)
+        summary[phase] = stats
+    return summary
+
+
+async def run_once(server, project_directory):
+    """执行一次往返并返回各阶段耗时（毫秒）"""
+    called_at = time.time()
+    result = await server.launch_feedback_ui(project_directory, "benchmark")
+    returned_at = time.time()
+
+    # 自动提交的反馈内容以计时JSON开头，后面可能带有后缀文本
+    marks, _ = json.JSONDecoder().raw_decode(result["interactive_feedback"])
+    return {
+        "call_to_shown": (marks["shown"] - called_at) * 1000,
+        "shown_to_interactive": (marks["interactive"] - marks["shown"]) * 1000,
+        "submit_to_result": (returned_at - marks["submit"]) * 1000,
+        "total": (returned_at - called_at) * 1000,
+    }
+
+
+async def run_mode(mode, iterations, warmup, project_directory):
+    """在指定模式（host: 常驻宿主进程, process: 每次调用独立进程）下运行基准测试"""
+    os.environ[UI_HOST_ENV] = "1" if mode == "host" else "0"
+    import server
+
+    samples = []
+    try:
+        for index in range(warmup + iterations):
+            sample = await run_once(server, project_directory)
+            if index >= warmup:
+                samples.append(sample)
+    finally:
+        await server.ui_host_client.stop()
+    return samples
+
+
+def compare_with_baseline(results, baseline, tolerance, min_delta_ms):
+    """与基线比较p50/p95，同时超出相对容差和绝对差值下限才视为退化，返回退化项列表"""
+    regressions = []
+    for mode, summary in results.items():
+        base_summary = baseline.get("modes", {}).get(mode)
+        if not base_summary:
+            continue
+        for phase in PHASES:
+            for key in ("p50", "p95"):
+                base = base_summary.get(phase, {}).get(key)
+                current = summary[phase][key]
+                if base is None:
+                    continue
+                change = (current - base) / base if base > 0 else 0
+                regressed = change > tolerance and current - base > min_delta_ms
+                marker = "❌" if regressed else "  "
+                print(f"{marker} {mode:7} {phase:21} {key}: {base:8.2f}ms -> {current:8.2f}ms ({change:+.0%})")
+                if regressed:
+                    regressions.append((mode, phase, key))
+    return regressions
+
+
+def print_summary(mode, summary, iterations):
+    """打印一个模式的统计结果"""
+    print(f"\n[{mode}] {iterations} 次迭代（毫秒）")
+    header = "".join(f"{f'p{pct}':>10}" for pct in PERCENTILES) + f"{'max':>10}"
+    print(f"{'':22}{header}")
+    for phase in PHASES:
+        stats = summary[phase]
+        row = "".join(f"{stats[f'p{pct}']:10.2f}" for pct in PERCENTILES) + f"{stats['max']:10.2f}"
+        print(f"{phase:22}{row}")
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Interactive Feedback MCP 反馈往返延迟基准测试')
+    parser.add_argument('--iterations', type=int, default=20, help='每个模式的计时迭代次数 (默认: 20)')
+    parser.add_argument('--warmup', type=int, default=1, help='不计入统计的预热次数 (默认: 1)')
+    parser.add_argument('--mode', choices=['host', 'process', 'both'], default='both', help='测试模式 (默认: both)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help=f'基线文件路径 (默认: {DEFAULT_BASELINE})')
+    parser.add_argument('--write-baseline', action='store_true', help='将本次结果写入基线文件')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='相对基线允许的退化比例 (默认: 0.2)')
+    parser.add_argument('--min-delta-ms', type=float, default=5.0, help='小于该绝对差值的变化不视为退化 (默认: 5)')
+
+    args = parser.parse_args()
+
+    # 无界面运行，窗口显示后自动提交；子进程继承这些环境变量
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    os.environ[AUTO_SUBMIT_ENV] = "1"
+    project_directory = os.path.join(tempfile.gettempdir(), "interactive_feedback_benchmark")
+    os.makedirs(project_directory, exist_ok=True)
+
+    modes = ["host", "process"] if args.mode == "both" else [args.mode]
+    iterations = max(1, args.iterations)
+    results = {}
+    for mode in modes:
+        samples = asyncio.run(run_mode(mode, iterations, max(0, args.warmup), project_directory))
+        results[mode] = summarize(samples)
+        print_summary(mode, results[mode], iterations)
+
+    passed = True
+    if not args.write_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\n与基线对比: {args.baseline}（容差 {args.tolerance:.0%}）")
+        regressions = compare_with_baseline(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"\n❌ {len(regressions)} 项指标相对基线退化")
+            passed = False
+        else:
+            print("\n✅ 未发现退化")
+
+    if args.write_baseline:
+        baseline = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "modes": results,
+        }
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\n基线已写入: {args.baseline}")
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,9 @@
 from functools import partial
 from PySide6.QtWidgets import QPushButton, QGridLayout
 
+from metrics import timed
+from tracing import traced
+
 
 class ButtonCoreManager:
     """按钮核心逻辑管理器"""
@@ -12,6 +15,8 @@ class ButtonCoreManager:
         self.parent_ui = parent_ui
         self._last_button_size = None
     
+    @timed("ui.button_refresh_ms")
+    @traced("ButtonCoreManager.refresh_quick_response_buttons")
     def refresh_quick_response_buttons(self):
         """刷新快捷按钮UI（优化版本 - 增量更新）"""
         # 防止初始化期间重复调用
@@ -63,6 +68,7 @@ class ButtonCoreManager:
         
         return False
     
+    @timed("ui.button_rebuild_ms")
     def _rebuild_all_buttons(self, quick_response_widget, layout_info):
         """完全重建所有按钮"""
         self.parent_ui.performance_manager.increment_stat("button_rebuilds")
@@ -187,6 +193,9 @@ class ButtonCoreManager:
     
     def _center_window(self):
         """将窗口居中显示"""
+        if not self.parent_ui.isWindow():
+            # 嵌入标签页时由外层窗口负责位置
+            return
         from PySide6.QtWidgets import QApplication
         screen = QApplication.primaryScreen().geometry()
         window_geometry = self.parent_ui.geometry()
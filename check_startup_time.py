@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动时间检查工具
+用 python -X importtime 测量反馈界面模块的冷启动导入耗时，超出预算或提前导入了延迟模块时返回非0退出码
+"""
+
+import os
+import sys
+import statistics
+import subprocess
+from config import STARTUP_IMPORT_BUDGET_MS, STARTUP_LAZY_MODULES
+
+
+def measure_import(module, python=sys.executable):
+    """
+    在新的解释器中导入模块一次并解析 -X importtime 输出
+
+    Returns:
+        tuple: (模块累计导入耗时毫秒, {模块名: 自身耗时毫秒})
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=script_dir,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败:\n{completed.stderr}")
+
+    total_ms = None
+    self_times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # 表头
+        self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2]
+        self_times[name.strip()] = self_us / 1000
+        if name.strip() == module and not name[1:].startswith(" "):
+            total_ms = cumulative_us / 1000
+
+    if total_ms is None:
+        raise RuntimeError(f"importtime 输出中没有找到 {module}")
+    return total_ms, self_times
+
+
+def check_startup_time(module="feedback_ui", budget_ms=STARTUP_IMPORT_BUDGET_MS, runs=5, top=10):
+    """
+    多次测量并与预算比较
+
+    Returns:
+        bool: 是否通过检查
+    """
+    samples = [measure_import(module) for _ in range(runs)]
+    totals = [total for total, _ in samples]
+    median_ms = statistics.median(totals)
+    _, self_times = samples[totals.index(sorted(totals)[len(totals) // 2])]
+
+    print(f"{module} 导入耗时: 中位数 {median_ms:.1f}ms（{runs}次，最小 {min(totals):.1f}ms，最大 {max(totals):.1f}ms）")
+    print(f"预算: {budget_ms}ms")
+    print(f"\n自身耗时最高的 {top} 个模块:")
+    for name, ms in sorted(self_times.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {ms:8.1f}ms  {name}")
+
+    passed = True
+    eager = [name for name in STARTUP_LAZY_MODULES
+             if any(imported == name or imported.startswith(name + ".") for imported in self_times)]
+    if eager:
+        print(f"\n❌ 以下模块应延迟导入，但在启动时被导入: {', '.join(eager)}")
+        passed = False
+    if median_ms > budget_ms:
+        print(f"\n❌ 冷启动导入耗时超出预算 {median_ms - budget_ms:.1f}ms")
+        passed = False
+    if passed:
+        print("\n✅ 启动时间检查通过")
+    return passed
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Interactive Feedback MCP 启动时间预算检查')
+    parser.add_argument('--module', default='feedback_ui', help='要测量的模块 (默认: feedback_ui)')
+    parser.add_argument('--budget-ms', type=float, default=STARTUP_IMPORT_BUDGET_MS, help=f'导入耗时预算，毫秒 (默认: {STARTUP_IMPORT_BUDGET_MS})')
+    parser.add_argument('--runs', type=int, default=5, help='测量次数，取中位数 (默认: 5)')
+    parser.add_argument('--top', type=int, default=10, help='显示自身耗时最高的模块数 (默认: 10)')
+
+    args = parser.parse_args()
+
+    passed = check_startup_time(args.module, args.budget_ms, max(1, args.runs), args.top)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
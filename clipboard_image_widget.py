@@ -4,7 +4,6 @@ from PySide6.QtCore import Qt, Signal, QThread, QTimer
 from PySide6.QtGui import QPixmap, QGuiApplication
 import os
 from typing import List, Dict, Optional
-from image_handler import ImageHandler
 from i18n import i18n
 from temp_manager import ensure_temp_images_dir, generate_clipboard_filename, get_temp_file_path
 
@@ -16,13 +15,15 @@ class ImageProcessingThread(QThread):
     def __init__(self, file_path: str, parent=None):
         super().__init__(parent)
         self.file_path = file_path
-        self.image_handler = ImageHandler()
     
     def run(self):
         """处理图片"""
         try:
+            # 在工作线程中加载图片处理模块（PIL），不占用窗口启动时间
+            from image_handler import ImageHandler
+            
             self.progress.emit(50)
-            result = self.image_handler.process_image(self.file_path)
+            result = ImageHandler().process_image(self.file_path)
             self.progress.emit(100)
             self.finished.emit(result)
         except Exception as e:
@@ -108,16 +109,25 @@ class ClipboardImageWidget(QWidget):
     """剪贴板图片上传组件 - 简化版本，只支持剪贴板粘贴"""
     images_changed = Signal(list)  # 图片列表变化信号
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, translator=None):
         super().__init__(parent)
+        self.i18n = translator or i18n  # 所属窗口的翻译器
         self.uploaded_images = []  # 存储上传的图片数据
-        self.image_handler = ImageHandler()
+        self._image_handler = None
         self.processing_thread = None
         self.is_processing = False  # 防止重复处理标志
         self.setup_ui()
         # 设置焦点策略以接收键盘事件
         self.setFocusPolicy(Qt.StrongFocus)
     
+    @property
+    def image_handler(self):
+        """图片处理器（首次使用时才加载PIL）"""
+        if self._image_handler is None:
+            from image_handler import ImageHandler
+            self._image_handler = ImageHandler()
+        return self._image_handler
+    
     def setup_ui(self):
         """设置UI - 改回垂直布局，但保持紧凑设计"""
         layout = QVBoxLayout(self)
@@ -145,7 +155,7 @@ class ClipboardImageWidget(QWidget):
         paste_layout.setContentsMargins(8, 4, 8, 4)
         
         # 粘贴提示文本 - 更简洁
-        self.paste_label = QLabel("📋 " + i18n.t("paste_screenshot_hint"))
+        self.paste_label = QLabel("📋 " + self.i18n.t("paste_screenshot_hint"))
         self.paste_label.setAlignment(Qt.AlignCenter)
         self.paste_label.setStyleSheet("""
             QLabel {
@@ -220,13 +230,13 @@ class ClipboardImageWidget(QWidget):
                         self.process_image(clipboard_path)
                         # 显示成功提示
                         self.paste_label.setText("✅ 已粘贴图片，正在处理...")
-                        QTimer.singleShot(2000, lambda: self.paste_label.setText("📋 " + i18n.t("paste_screenshot_hint")))
+                        QTimer.singleShot(2000, lambda: self.paste_label.setText("📋 " + self.i18n.t("paste_screenshot_hint")))
                     else:
-                        QMessageBox.warning(self, i18n.t("warning"), "无法保存剪贴板图片")
+                        QMessageBox.warning(self, self.i18n.t("warning"), "无法保存剪贴板图片")
                 except Exception as e:
-                    QMessageBox.warning(self, i18n.t("warning"), f"处理剪贴板图片时出错: {str(e)}")
+                    QMessageBox.warning(self, self.i18n.t("warning"), f"处理剪贴板图片时出错: {str(e)}")
             else:
-                QMessageBox.information(self, i18n.t("info"), i18n.t("no_image_in_clipboard"))
+                QMessageBox.information(self, self.i18n.t("info"), self.i18n.t("no_image_in_clipboard"))
         finally:
             # 延迟重置处理标志，防止快速重复点击
             QTimer.singleShot(500, lambda: setattr(self, 'is_processing', False))
@@ -254,7 +264,7 @@ class ClipboardImageWidget(QWidget):
                 # 显示错误信息
                 QMessageBox.warning(
                     self, 
-                    i18n.t("image_process_error"), 
+                    self.i18n.t("image_process_error"), 
                     result['error']
                 )
             
@@ -267,7 +277,7 @@ class ClipboardImageWidget(QWidget):
             # 使用更优雅的错误处理：通过UI显示错误而不是控制台输出
             QMessageBox.critical(
                 self, 
-                i18n.t("error"), 
+                self.i18n.t("error"), 
                 f"图片处理过程中发生错误: {str(e)}"
             )
             # 确保线程清理
@@ -277,11 +287,11 @@ class ClipboardImageWidget(QWidget):
     
     def update_preview(self):
         """更新图片预览"""
-        # 清空现有预览
-        for i in reversed(range(self.preview_layout.count())):
-            child = self.preview_layout.itemAt(i).widget()
+        # 清空现有预览（连同上次添加的弹性空间一起移除，避免每次刷新累积一个空白项）
+        while self.preview_layout.count():
+            child = self.preview_layout.takeAt(0).widget()
             if child:
-                child.setParent(None)
+                child.deleteLater()
         
         # 添加新的预览
         for image_data in self.uploaded_images:
@@ -325,11 +335,11 @@ class ClipboardImageWidget(QWidget):
                     self.process_image(clipboard_path)
                     # 显示成功提示
                     self.paste_label.setText("✅ 已粘贴图片，正在处理...")
-                    QTimer.singleShot(2000, lambda: self.paste_label.setText("📋 " + i18n.t("paste_screenshot_hint")))
+                    QTimer.singleShot(2000, lambda: self.paste_label.setText("📋 " + self.i18n.t("paste_screenshot_hint")))
                 else:
-                    QMessageBox.warning(self, i18n.t("warning"), "无法保存剪贴板图片")
+                    QMessageBox.warning(self, self.i18n.t("warning"), "无法保存剪贴板图片")
             except Exception as e:
-                QMessageBox.warning(self, i18n.t("warning"), f"处理剪贴板图片时出错: {str(e)}")
+                QMessageBox.warning(self, self.i18n.t("warning"), f"处理剪贴板图片时出错: {str(e)}")
     
     def cleanup(self):
         """清理资源"""
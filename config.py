@@ -10,6 +10,21 @@ import os
 # 临时文件相关配置
 TEMP_DIR_NAME = '.interactive_feedback_temp_images'
 TEMP_DIR_PATH = os.path.join(os.path.expanduser('~'), TEMP_DIR_NAME)
+PROFILE_DIR_NAME = '.interactive_feedback_profiles'  # 性能剖析结果目录（与临时图片目录同级）
+PROFILE_DIR_PATH = os.path.join(os.path.expanduser('~'), PROFILE_DIR_NAME)
+PROFILE_ENV = 'INTERACTIVE_FEEDBACK_PROFILE'  # 设为 1 时以cProfile剖析每次反馈会话
+
+# 项目配置文件（服务端与UI共用，不依赖Qt）
+PROJECT_CONFIG_FILE_NAME = '.interactive_feedback_config.json'
+PROJECT_CONFIG_PATH = os.path.join(os.path.expanduser('~'), PROJECT_CONFIG_FILE_NAME)
+PROJECT_CONFIG_ENV = 'INTERACTIVE_FEEDBACK_CONFIG'  # 指定项目配置文件路径（覆盖默认位置）
+PROJECT_CONFIG_VERSION = 1
+
+# 规则文件相关配置
+CURSOR_RULE_FILE_NAME = 'RIPER-5-cursor-rule.txt'
+RULE_CACHE_FILE_NAME = '.interactive_feedback_rule_cache.json'  # 模式规则解析缓存（按文件mtime和哈希校验）
+RULE_CACHE_PATH = os.path.join(os.path.expanduser('~'), RULE_CACHE_FILE_NAME)
+RULE_MODES = ['RESEARCH', 'INNOVATE', 'PLAN', 'EXECUTE', 'REVIEW']
 
 # 图片处理相关配置
 SUPPORTED_IMAGE_FORMATS = {
@@ -25,6 +40,23 @@ SUPPORTED_IMAGE_FORMATS = {
 MAX_FILE_SIZE = 1024 * 1024  # 1MB
 MAX_DIMENSION = 2048
 
+# 图片编码搜索配置（每个尺寸先试最低质量，放得下再二分查找最高质量）
+IMAGE_SCALE_FACTORS = [1.0, 0.8, 0.6, 0.5, 0.4, 0.3, 0.25, 0.2]  # 生成优化附件时依次尝试的缩放比例
+IMAGE_MIN_WIDTH = 200  # 缩放后的最小尺寸
+IMAGE_MIN_HEIGHT = 150
+IMAGE_QUALITY_MIN = 15
+IMAGE_QUALITY_MAX = 85
+IMAGE_QUALITY_STEP = 5  # 质量二分查找的粒度
+IMAGE_SIZE_TOLERANCE = 0.85  # 编码结果达到目标大小的该比例即足够接近，停止搜索
+IMAGE_PROBE_SIZE = 640  # 预测缩放比例用的缩略图探针长边上限（像素）
+IMAGE_PREDICTION_MARGIN = 1.15  # 按实测大小外推的更大比例不超过目标的该倍数时才去验证
+IMAGE_DECODED_CACHE_BYTES = 64 * 1024 * 1024  # 已粘贴图片保留的解码像素上限，超出时释放最久未用的
+IMAGE_CACHE_DIR_NAME = 'optimized_cache'  # 临时图片目录下的优化结果缓存子目录
+IMAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 优化结果磁盘缓存上限，超出时删除最久未用的条目
+IMAGE_CACHE_ENV = 'INTERACTIVE_FEEDBACK_IMAGE_CACHE'  # 设为 0 时禁用优化结果磁盘缓存
+COMPRESS_QUALITY_MIN = 25  # 压缩大图时的最低质量
+COMPRESS_SCALE_FACTORS = [0.8, 0.6, 0.4, 0.2]  # 最低质量仍超出大小时依次尝试的缩放比例
+
 # 文件命名模式
 CLIPBOARD_FILE_PREFIX = 'clipboard'
 TEMP_FILE_PREFIX = 'temp'
@@ -35,8 +67,59 @@ DEFAULT_CLEANUP_DAYS = 7
 CLEANUP_BATCH_SIZE = 100  # 每次清理的最大文件数
 
 # UI配置
+FOLLOW_UP_TIMEOUT_SECONDS = 20  # 提交后等待追加反馈的时长（秒）
+AUTO_SUBMIT_ENV = 'INTERACTIVE_FEEDBACK_AUTO_SUBMIT'  # 设为 1 时窗口显示后自动提交计时数据（基准测试用）
 DEFAULT_LANGUAGE = 'zh_CN'
 AVAILABLE_LANGUAGES = ['zh_CN', 'en_US']
+CONFIG_FLUSH_DELAY_MS = 500  # 项目配置修改后延迟写回的防抖时间（毫秒），窗口关闭时立即写回
+
+# 常驻UI宿主进程配置
+UI_HOST_ENV = 'INTERACTIVE_FEEDBACK_UI_HOST'  # 设为 0 时每次调用都启动独立UI进程
+UI_HOST_READY_TIMEOUT = 30  # 等待宿主进程就绪的最长时间（秒）
+STICKY_WINDOW_ENV = 'INTERACTIVE_FEEDBACK_STICKY'  # 设为 1 时按项目保留并复用反馈窗口
+STICKY_WINDOW_LIMIT = 4  # 最多保留的空闲项目窗口数
+TABBED_WINDOW_ENV = 'INTERACTIVE_FEEDBACK_TABS'  # 设为 0 时每个请求使用独立窗口
+MAX_OPEN_TABS = 6  # 同时打开的标签页上限，其余请求在调度队列中等待
+
+# 反馈附件配置
+ATTACHMENTS_MODE_ENV = 'INTERACTIVE_FEEDBACK_ATTACHMENTS'  # lazy: 返回附件句柄并通过资源按需读取; inline: 直接返回图片内容
+ATTACHMENT_URI_PREFIX = 'feedback://attachments/'
+ATTACHMENT_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 服务端附件缓存上限 64MB
+
+# 非阻塞反馈票据配置
+TICKET_MAX_COUNT = 32  # 同时保留的票据上限
+TICKET_TTL_SECONDS = 600  # 已完成结果的保留时长（秒）
+TICKET_MAX_WAIT_MS = 50000  # get_feedback 单次最长等待时间（毫秒）
+
+# 追踪配置
+TRACE_ENV = 'INTERACTIVE_FEEDBACK_TRACE'  # 设为JSONL文件路径时启用追踪（服务端与UI进程写入同一文件）
+
+# 指标配置
+METRICS_FILE_ENV = 'INTERACTIVE_FEEDBACK_METRICS'  # 设为文件路径时UI进程在每次反馈结束后导出指标JSON
+METRICS_HISTOGRAM_SIZE = 1024  # 每个直方图保留的最近样本数
+METRICS_EVENT_LIMIT = 20  # 每类事件（如界面卡顿）保留的最近记录数
+METRICS_URI = 'feedback://metrics'
+
+# 事件循环看门狗配置
+WATCHDOG_ENV = 'INTERACTIVE_FEEDBACK_WATCHDOG'  # 设为 0 时关闭事件循环卡顿检测
+WATCHDOG_INTERVAL_MS = 50  # 心跳定时器间隔（毫秒）
+WATCHDOG_STALL_MS = 200  # 事件循环延迟超过该值视为卡顿，并记录主线程调用栈
+
+# 长会话内存预算（memory_profile.py，默认负载下各子系统的Python堆留存上限，KB）
+MEMORY_BUDGETS_KB = {
+    'logs': 768,             # 5000行日志
+    'images': 384,           # 30张截图的图片信息和预览
+    'attachments': 1280,     # 30张截图的Base64附件
+    'quick_responses': 256,  # 50次快捷按钮编辑
+    'reset': 512,            # reset_for_prompt 之后仍留存的内存
+}
+MEMORY_PEAK_BUDGET_KB = 5120  # 整个模拟会话的Python堆峰值上限
+
+# 启动时间预算（check_startup_time.py）
+STARTUP_IMPORT_BUDGET_MS = 350  # feedback_ui 冷启动导入耗时上限（毫秒，取多次运行的中位数）
+STARTUP_LAZY_MODULES = [  # 必须在首次使用时才导入的模块
+    'PIL', 'psutil', 'subprocess', 'ui_dialogs', 'cleanup_temp_images', 'image_handler'
+]
 
 # 应用信息
 APP_NAME = 'Interactive Feedback MCP'
@@ -0,0 +1,319 @@
+"""
+配置存储模块 - 负责项目配置的快照读取和延迟批量写入（不依赖Qt）
+
+整个项目配置一次读入类型化的内存快照，之后的读取都不访问存储；修改只更新快照并记录脏键，
+由调用方（UI的防抖定时器或窗口关闭时）调用 flush() 一次性写回。同一进程中同一项目的窗口共用一个快照。
+存储后端只需实现 read_group(group) -> dict 和 write_group(group, values)（值为None表示删除该键）。
+
+默认后端是带版本号的JSON文件（PROJECT_CONFIG_PATH，原子替换写入，写入期间持有同目录下的 .lock 文件锁），
+服务端无需导入Qt即可通过
+load_project_profile() 读取项目配置。文件结构：
+  {"version": 1, "projects": {"<设置组>": {"run_command": ..., ...}}}
+"""
+import os
+import sys
+import json
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypedDict
+
+from config import PROJECT_CONFIG_PATH, PROJECT_CONFIG_ENV, PROJECT_CONFIG_VERSION
+from file_utils import atomic_write
+from metrics import metrics
+
+
+class ProjectProfile(TypedDict):
+    run_command: str
+    execute_automatically: bool
+    suffix_mode: str  # "force", "smart", "none"
+    button_size: str  # "small", "medium", "large", "custom"
+    custom_button_width: int
+    custom_button_height: int
+    visible_buttons: List[int]  # 空列表表示全部可见（由UI按按钮数量补全）
+    language: str  # "zh_CN", "en_US"
+    use_base64_transmission: bool
+    base64_target_size_kb: int
+    enable_follow_up: bool
+    commandSectionVisible: bool
+    quick_responses: List[Tuple[str, str]]  # 空列表表示使用默认按钮
+    scripted_reply: str  # 非空时服务端直接以该文本作为反馈返回，不打开界面（无人值守/脚本场景）
+
+
+def _to_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes")
+    return bool(value)
+
+
+def _to_int(value) -> int:
+    return int(value)
+
+
+def _to_str(value) -> str:
+    return str(value)
+
+
+def _to_int_list(value) -> List[int]:
+    # INI格式下列表可能读回字符串列表或单个值
+    if not isinstance(value, (list, tuple)):
+        value = [value]
+    return [int(item) for item in value]
+
+
+def _to_pair_list(value) -> List[Tuple[str, str]]:
+    if not isinstance(value, (list, tuple)):
+        return []
+    return [(str(item[0]), str(item[1])) for item in value if isinstance(item, (list, tuple)) and len(item) == 2]
+
+
+# 键 -> (默认值, 类型转换)
+PROJECT_SCHEMA: Dict[str, Tuple[Any, Callable[[Any], Any]]] = {
+    "run_command": ("", _to_str),
+    "execute_automatically": (False, _to_bool),
+    "suffix_mode": ("force", _to_str),
+    "button_size": ("medium", _to_str),
+    "custom_button_width": (120, _to_int),
+    "custom_button_height": (40, _to_int),
+    "visible_buttons": ([], _to_int_list),
+    "language": ("zh_CN", _to_str),
+    "use_base64_transmission": (True, _to_bool),
+    "base64_target_size_kb": (30, _to_int),
+    "enable_follow_up": (False, _to_bool),
+    "commandSectionVisible": (False, _to_bool),
+    "quick_responses": ([], _to_pair_list),
+    "scripted_reply": ("", _to_str),
+}
+
+
+def _copy(value):
+    return list(value) if isinstance(value, list) else value
+
+
+def coerce_profile(raw: Dict[str, Any]) -> ProjectProfile:
+    """把后端读出的原始值转换为类型化的快照，缺失或无法转换的键使用默认值"""
+    profile = {}
+    for key, (default, convert) in PROJECT_SCHEMA.items():
+        value = raw.get(key)
+        try:
+            profile[key] = _copy(default) if value is None else convert(value)
+        except (TypeError, ValueError):
+            profile[key] = _copy(default)
+    return ProjectProfile(**profile)
+
+
+def get_project_settings_group(project_dir: str) -> str:
+    """
+    根据项目目录生成设置组名称
+    使用目录名 + 完整路径哈希，既可读又唯一
+    """
+    basename = os.path.basename(os.path.normpath(project_dir))
+    full_hash = hashlib.md5(project_dir.encode('utf-8')).hexdigest()[:8]
+    return f"{basename}_{full_hash}"
+
+
+def get_project_config_path() -> str:
+    """项目配置文件路径（可由 INTERACTIVE_FEEDBACK_CONFIG 覆盖）"""
+    return os.environ.get(PROJECT_CONFIG_ENV) or PROJECT_CONFIG_PATH
+
+
+@contextmanager
+def _exclusive_file_lock(lock_path: str):
+    """跨进程排他锁（持有期间阻塞其他进程获取同一把锁）"""
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+            while True:
+                try:
+                    # LK_LOCK 约重试10秒后仍失败才抛出OSError，此时继续等待
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+class JsonConfigBackend:
+    """JSON文件存储后端：写入时重新读取最新文件再合并改动的键，临时文件+原子替换，读取方不会看到半个文件
+
+    读取-合并-替换在进程内由线程锁、跨进程（常驻宿主、独立UI进程、服务端迁移）由 <配置文件>.lock 文件锁保护，
+    并发写入不同的键不会互相覆盖。
+    """
+
+    def __init__(self, path: Optional[str] = None, fallback=None):
+        self.path = path or get_project_config_path()
+        # 旧存储后端（如QSettings）：文件中还没有某个项目时从中迁移一次
+        self.fallback = fallback
+        self._lock = threading.Lock()
+
+    def read_group(self, group: str) -> dict:
+        """读取一个项目的配置"""
+        with self._lock:
+            projects = self._read_file()["projects"]
+        if group in projects:
+            return dict(projects[group])
+        if self.fallback is None:
+            return {}
+
+        legacy = self.fallback.read_group(group)
+        values = {key: value for key, value in coerce_profile(legacy).items() if key in legacy}
+        if values:
+            try:
+                self.write_group(group, values)
+                metrics.inc("config.migrations")
+            except OSError:
+                # 配置文件暂时不可写：本次使用迁移出的值，下次打开时再迁移
+                pass
+        return values
+
+    def write_group(self, group: str, values: dict):
+        """合并写入若干键（值为None时删除）"""
+        with self._locked():
+            data = self._read_file(for_write=True)
+            project = data["projects"].setdefault(group, {})
+            for key, value in values.items():
+                if value is None:
+                    project.pop(key, None)
+                else:
+                    project[key] = value
+            self._write_file(data)
+
+    def remove_group(self, group: str):
+        """删除一个项目的全部配置"""
+        with self._locked():
+            data = self._read_file(for_write=True)
+            if data["projects"].pop(group, None) is not None:
+                self._write_file(data)
+
+    @contextmanager
+    def _locked(self):
+        """写入方的进程内锁 + 文件锁"""
+        with self._lock, _exclusive_file_lock(self.path + ".lock"):
+            yield
+
+    def _read_file(self, for_write: bool = False) -> dict:
+        """读取整个文件；不存在或无法读取时返回空结构
+
+        只读方从不改动文件。写入方遇到内容损坏（不是合法的配置JSON）时先把它备份为 .bak 再视为空；
+        其他读取错误（如暂时的权限问题）直接抛出，避免用空配置覆盖一个只是暂时读不到的文件。
+        """
+        empty = {"version": PROJECT_CONFIG_VERSION, "projects": {}}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or not isinstance(data.get("projects"), dict):
+                raise ValueError("invalid project config structure")
+        except FileNotFoundError:
+            return empty
+        except ValueError:
+            if for_write:
+                try:
+                    os.replace(self.path, self.path + ".bak")
+                except OSError:
+                    pass
+            return empty
+        except OSError:
+            if for_write:
+                raise
+            return empty
+        return data
+
+    def _write_file(self, data: dict):
+        """原子写入整个文件"""
+        data["version"] = max(data.get("version", 0), PROJECT_CONFIG_VERSION)
+        atomic_write(self.path, json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+def load_project_profile(project_directory: str) -> ProjectProfile:
+    """直接从配置文件读取项目配置（服务端使用：每次读取最新内容，不导入Qt）"""
+    group = get_project_settings_group(project_directory)
+    return coerce_profile(JsonConfigBackend().read_group(group))
+
+
+class ProjectConfigStore:
+    """单个项目的配置快照"""
+
+    def __init__(self, backend, group: str):
+        self.backend = backend
+        self.group = group
+        self._lock = threading.Lock()
+        self._profile = None
+        self._dirty = set()
+
+    def load(self, force: bool = False) -> ProjectProfile:
+        """返回快照副本；首次调用（或force）时从后端一次性读取整个项目配置"""
+        with self._lock:
+            if self._profile is None or force:
+                self._profile = coerce_profile(self.backend.read_group(self.group))
+                self._dirty.clear()
+                metrics.inc("config.loads")
+            return ProjectProfile(**{key: _copy(value) for key, value in self._profile.items()})
+
+    def get(self, key: str):
+        """读取单个键（不访问存储）"""
+        self.load()
+        with self._lock:
+            return _copy(self._profile[key])
+
+    def set(self, key: str, value) -> bool:
+        """修改快照中的一个键，值有变化时返回True（等待flush写回）"""
+        return self.update({key: value})
+
+    def update(self, values: Dict[str, Any]) -> bool:
+        """批量修改快照，只有值变化的键才会被写回"""
+        self.load()
+        changed = False
+        with self._lock:
+            for key, value in values.items():
+                if key not in PROJECT_SCHEMA:
+                    raise KeyError(f"Unknown project setting: {key}")
+                if self._profile[key] != value:
+                    self._profile[key] = _copy(value)
+                    self._dirty.add(key)
+                    changed = True
+        return changed
+
+    @property
+    def has_pending_changes(self) -> bool:
+        return bool(self._dirty)
+
+    def flush(self) -> bool:
+        """把所有脏键一次性写回后端，没有待写入的修改时返回False"""
+        with self._lock:
+            if not self._dirty:
+                return False
+            values = {key: _copy(self._profile[key]) for key in self._dirty}
+        # 写入成功后才清除脏标记：失败时修改保留在 _dirty 中，下次flush重试
+        self.backend.write_group(self.group, values)
+        with self._lock:
+            # 写入期间再次修改过的键仍需写回
+            self._dirty.difference_update(key for key, value in values.items() if self._profile[key] == value)
+        metrics.inc("config.flushes")
+        return True
+
+
+_stores: Dict[str, ProjectConfigStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_project_store(backend, group: str) -> ProjectConfigStore:
+    """获取项目的配置快照（同一进程内按设置组共享）"""
+    with _stores_lock:
+        store = _stores.get(group)
+        if store is None:
+            store = _stores[group] = ProjectConfigStore(backend, group)
+        return store
@@ -1,14 +1,11 @@
 """
 反馈业务逻辑模块 - 负责反馈提交和处理的核心业务逻辑
 """
-import os
-import json
-import subprocess
-import sys
 from typing import Optional
 
-from i18n import i18n
+from config import FOLLOW_UP_TIMEOUT_SECONDS
 from ui_config import FeedbackResult
+from tracing import traced
 
 
 class FeedbackLogicManager:
@@ -16,58 +13,134 @@ class FeedbackLogicManager:
     
     def __init__(self, parent_ui):
         self.parent_ui = parent_ui
+        self._follow_up_timer = None
+        self._follow_up_remaining = 0
     
+    @property
+    def in_follow_up(self) -> bool:
+        """是否处于追加反馈阶段"""
+        return self._follow_up_timer is not None
+    
+    @traced("FeedbackLogicManager.submit_feedback")
     def submit_feedback(self):
         """提交反馈"""
+        if self.in_follow_up:
+            self._finish_follow_up(self.parent_ui.feedback_text.toPlainText().strip())
+            return
+        
         feedback_text = self.parent_ui.feedback_text.toPlainText().strip()
+        attachments = []
+        answers = []
+        if self.parent_ui.question_form.has_questions():
+            answers = self.parent_ui.question_form.answers()
         
         # 处理上传的图片
         if hasattr(self.parent_ui, 'uploaded_images') and self.parent_ui.uploaded_images:
-            feedback_text += self._process_uploaded_images()
+            image_info, attachments = self._process_uploaded_images()
+            feedback_text += image_info
         
         # 根据选择的后缀选项追加相应内容
-        if feedback_text:
+        if feedback_text or any(answer["answer"] for answer in answers):
             feedback_text += self._get_feedback_suffix()
         
-        self.parent_ui.feedback_result = FeedbackResult(
+        result = FeedbackResult(
             logs="".join(self.parent_ui.log_buffer),
             interactive_feedback=feedback_text,
         )
+        if attachments:
+            result["attachments"] = attachments
+        if answers:
+            result["answers"] = answers
+        self.parent_ui.feedback_result = result
+        
+        # 开启追加反馈时窗口保留片刻；结果已就绪，期间关闭窗口同样立即完成
+        if feedback_text and self.parent_ui.config.get("enable_follow_up", False):
+            self._start_follow_up()
+            return
+        self.parent_ui.close()
+    
+    def _start_follow_up(self):
+        """进入追加反馈阶段"""
+        from PySide6.QtCore import QTimer
+        
+        self.parent_ui.feedback_text.clear()
+        self.parent_ui.description_label.setText(self.parent_ui.i18n.t("follow_up_hint"))
+        
+        self._follow_up_remaining = FOLLOW_UP_TIMEOUT_SECONDS
+        self._follow_up_timer = QTimer(self.parent_ui)
+        self._follow_up_timer.timeout.connect(self._on_follow_up_tick)
+        self._follow_up_timer.start(1000)
+        self._update_follow_up_button()
+        self.parent_ui.feedback_text.setFocus()
+    
+    def _on_follow_up_tick(self):
+        """追加反馈倒计时"""
+        self._follow_up_remaining -= 1
+        if self._follow_up_remaining <= 0:
+            self._finish_follow_up("")
+        else:
+            self._update_follow_up_button()
+    
+    def _update_follow_up_button(self):
+        """在提交按钮上显示剩余时间"""
+        self.parent_ui.submit_button.setText(self.parent_ui.i18n.t("send_follow_up").format(seconds=self._follow_up_remaining))
+    
+    def _finish_follow_up(self, additional_feedback: str):
+        """结束追加反馈阶段，合并追加内容后关闭窗口"""
+        self.stop_follow_up()
+        if additional_feedback:
+            result = self.parent_ui.feedback_result
+            result["interactive_feedback"] = f"{result['interactive_feedback']}\n\n[额外反馈]: {additional_feedback}"
         self.parent_ui.close()
     
+    def stop_follow_up(self):
+        """停止追加反馈倒计时"""
+        if self._follow_up_timer is not None:
+            self._follow_up_timer.stop()
+            self._follow_up_timer.deleteLater()
+            self._follow_up_timer = None
+    
     def _process_uploaded_images(self):
-        """处理上传的图片"""
+        """处理上传的图片，返回(附加文本, 图片附件列表)"""
         # 检查是否启用base64传输
         use_base64 = self.parent_ui.config.get("use_base64_transmission", False)
         
         if use_base64:
             return self._process_base64_images()
         else:
-            return self._process_path_images()
+            return self._process_path_images(), []
     
     def _process_base64_images(self):
-        """处理base64传输的图片"""
-        image_info = "\n\n[附件图片 - Base64优化传输]:\n"
+        """处理base64传输的图片：优化后的图片作为独立的图片内容返回，文本中只保留说明"""
+        image_info = "\n\n[附件图片 - 已随结果附带]:\n"
+        attachments = []
         
         for i, img_data in enumerate(self.parent_ui.uploaded_images, 1):
             if img_data.get('success'):
                 image_path = self._get_image_path(img_data)
                 
                 if image_path:
-                    base64_result = self._generate_optimized_base64(image_path)
+                    optimized = self._generate_optimized_image(image_path, img_data.get('pipeline'))
                     
-                    if base64_result and base64_result.get('success'):
-                        image_info += f"图片{i}: {base64_result['base64']}\n"
-                        image_info += f"优化信息: 原始{base64_result['original_size']} → 优化{base64_result['optimized_size']}, "
-                        image_info += f"大小{base64_result['file_size_kb']}KB, 压缩比{base64_result['compression_ratio']}\n\n"
+                    if optimized and optimized.get('success'):
+                        width, height = optimized['optimized_size']
+                        attachments.append({
+                            'index': i,
+                            'mime_type': optimized['mime_type'],
+                            'width': width,
+                            'height': height,
+                            'data': optimized['data'],
+                        })
+                        image_info += f"图片{i}: 原始{optimized['original_size']} → 优化{optimized['optimized_size']}, "
+                        image_info += f"大小{optimized['file_size_kb']}KB, 压缩比{optimized['compression_ratio']}\n"
                     else:
-                        # base64生成失败，回退到路径模式
+                        # 图片优化失败，回退到路径模式
                         image_info += f"图片{i}路径: {image_path}\n"
                         image_info += f"图片{i}信息: {img_data.get('original_info', {})}\n"
-                        image_info += f"注意: Base64优化失败，请直接查看路径文件\n\n"
+                        image_info += f"注意: 图片优化失败，请直接查看路径文件\n\n"
         
-        image_info += "[处理指令]: 以上图片已通过优化Base64传输，请分析图片内容并处理用户反馈。\n"
-        return image_info
+        image_info += "[处理指令]: 以上图片已附在结果中（图片内容，或attachments中可按需读取的资源URI），请分析图片内容并处理用户反馈。\n"
+        return image_info, attachments
     
     def _process_path_images(self):
         """处理路径传输的图片"""
@@ -99,8 +172,8 @@ class FeedbackLogicManager:
             return img_data['processed_path']
         return None
     
-    def _generate_optimized_base64(self, image_path):
-        """生成优化的base64"""
+    def _generate_optimized_image(self, image_path, pipeline=None):
+        """生成优化后的图片数据（复用粘贴时的图片处理管线，不再重新解码）"""
         try:
             from image_handler import ImageHandler
             handler = ImageHandler()
@@ -112,16 +185,16 @@ class FeedbackLogicManager:
             
             # 使用配置中的目标大小
             target_size = self.parent_ui.config.get("base64_target_size_kb", 50)
-            return handler.get_optimized_base64(image_path, target_size)
+            return handler.get_optimized_image(image_path, target_size, pipeline)
         except Exception as e:
             return None
     
     def _get_feedback_suffix(self):
         """获取反馈后缀"""
         if self.parent_ui.suffix_radio_force.isChecked():
-            return i18n.t("suffix_force")
+            return self.parent_ui.i18n.t("suffix_force")
         elif self.parent_ui.suffix_radio_smart.isChecked():
-            return i18n.t("suffix_smart")
+            return self.parent_ui.i18n.t("suffix_smart")
         # suffix_radio_none 不追加任何内容
         return ""
     
@@ -140,76 +213,4 @@ class FeedbackLogicManager:
         app.setPalette(get_dark_mode_palette(app))
         app.setStyle("Fusion")
         
-        result = self.parent_ui.run()
-
-        # 在获得结果后调用interactive-feedback-mcp等待用户反馈
-        if result and result.get("interactive_feedback"):
-            print("正在调用interactive-feedback-mcp等待您的反馈...")
-            mcp_result = self._call_interactive_feedback_mcp(
-                self.parent_ui.project_directory, 
-                "用户反馈已提交，等待进一步指示"
-            )
-            
-            # 如果MCP返回了额外的反馈，可以合并到结果中
-            if mcp_result and mcp_result.get("interactive_feedback"):
-                original_feedback = result["interactive_feedback"]
-                additional_feedback = mcp_result["interactive_feedback"]
-                if additional_feedback.strip():  # 只有在有额外反馈时才合并
-                    result["interactive_feedback"] = f"{original_feedback}\n\n[额外反馈]: {additional_feedback}"
-
-        return result
-    
-    def _call_interactive_feedback_mcp(self, project_directory: str, summary: str):
-        """调用interactive-feedback-mcp等待用户反馈"""
-        try:
-            # 构建MCP调用命令
-            mcp_command = [
-                sys.executable, "-c",
-                f"""
-import json
-import sys
-try:
-    # 模拟MCP interactive_feedback调用
-    print("MCP Interactive Feedback Started")
-    print(f"Project: {project_directory}")
-    print(f"Summary: {summary}")
-    print("等待用户反馈...")
-    
-    # 这里应该是实际的MCP调用逻辑
-    # 暂时用输入等待来模拟
-    user_input = input("请输入反馈（按Enter结束）: ")
-    
-    result = {{
-        "logs": "MCP调用完成",
-        "interactive_feedback": user_input
-    }}
-    
-    print(json.dumps(result))
-except Exception as e:
-    print(json.dumps({{"error": str(e)}}))
-"""
-            ]
-            
-            # 执行MCP调用
-            process = subprocess.Popen(
-                mcp_command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            stdout, stderr = process.communicate()
-            
-            if process.returncode == 0:
-                try:
-                    result = json.loads(stdout.strip().split('\n')[-1])
-                    return result
-                except:
-                    return {"logs": stdout, "interactive_feedback": ""}
-            else:
-                print(f"MCP调用失败: {stderr}")
-                return {"logs": stderr, "interactive_feedback": ""}
-                
-        except Exception as e:
-            print(f"调用interactive-feedback-mcp时出错: {e}")
-            return {"logs": str(e), "interactive_feedback": ""} 
\ No newline at end of file
+        return self.parent_ui.run()
@@ -0,0 +1,76 @@
+"""
+反馈调度模块 - 负责排列等待显示的反馈请求（不依赖Qt）
+
+调度规则：
+  1. 优先级高的请求先出队；
+  2. 同一优先级内按项目轮转，某个项目连续发起大量请求时不会饿死其他项目；
+  3. 同一项目内保持先来先出。
+"""
+from collections import OrderedDict, deque
+from typing import Any, Dict, Optional, Tuple
+
+
+class FeedbackScheduler:
+    """带优先级和项目公平性的反馈请求队列"""
+
+    def __init__(self):
+        # 优先级 -> 项目 -> 请求ID队列（项目的先后顺序即轮转顺序）
+        self._queues: Dict[int, "OrderedDict[str, deque]"] = {}
+        # 请求ID -> (优先级, 项目, 请求数据)
+        self._items: Dict[Any, Tuple[int, str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, request_id) -> bool:
+        return request_id in self._items
+
+    def push(self, request_id, project: str, priority: int = 0, payload: Any = None):
+        """加入一条请求"""
+        if request_id in self._items:
+            return
+        self._items[request_id] = (priority, project, payload)
+        projects = self._queues.setdefault(priority, OrderedDict())
+        projects.setdefault(project, deque()).append(request_id)
+
+    def pop(self) -> Optional[Tuple[Any, Any]]:
+        """取出下一条请求，返回 (请求ID, 请求数据)，队列为空时返回None"""
+        if not self._queues:
+            return None
+
+        priority = max(self._queues)
+        projects = self._queues[priority]
+        project, queue = next(iter(projects.items()))
+        request_id = queue.popleft()
+
+        # 轮转：出队的项目移到末尾，队列空了则移除
+        if queue:
+            projects.move_to_end(project)
+        else:
+            del projects[project]
+        if not projects:
+            del self._queues[priority]
+
+        _, _, payload = self._items.pop(request_id)
+        return request_id, payload
+
+    def remove(self, request_id) -> bool:
+        """移除尚未出队的请求（如请求被取消），成功时返回True"""
+        item = self._items.pop(request_id, None)
+        if item is None:
+            return False
+
+        priority, project, _ = item
+        projects = self._queues[priority]
+        queue = projects[project]
+        queue.remove(request_id)
+        if not queue:
+            del projects[project]
+        if not projects:
+            del self._queues[priority]
+        return True
+
+    def priority_of(self, request_id) -> Optional[int]:
+        """获取排队中请求的优先级"""
+        item = self._items.get(request_id)
+        return item[0] if item else None
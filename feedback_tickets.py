@@ -0,0 +1,114 @@
+"""
+反馈票据模块 - 负责非阻塞反馈请求的票据管理（不依赖Qt）
+
+start_feedback 创建票据并在后台等待反馈结果，get_feedback 凭票据查询或限时等待结果。
+已完成的结果在内存中保留一段时间后过期，票据总数有上限。
+"""
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
+from typing import Awaitable, Optional
+
+from config import TICKET_MAX_COUNT, TICKET_TTL_SECONDS
+
+
+class TicketError(Exception):
+    """票据不存在、已过期或票据数量超限"""
+
+
+class FeedbackTicket:
+    """一次非阻塞反馈请求"""
+
+    def __init__(self, ticket_id: str, task: asyncio.Task):
+        self.ticket_id = ticket_id
+        self.task = task
+        self.created_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.task.done()
+
+
+class TicketStore:
+    """有界票据存储：已完成的票据超过TTL后过期，超出数量上限时淘汰最早完成的票据"""
+
+    def __init__(self, max_tickets: int = TICKET_MAX_COUNT, ttl_seconds: float = TICKET_TTL_SECONDS):
+        self.max_tickets = max_tickets
+        self.ttl_seconds = ttl_seconds
+        self._tickets: "OrderedDict[str, FeedbackTicket]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def create(self, awaitable: Awaitable) -> FeedbackTicket:
+        """在后台运行反馈请求并返回票据"""
+        self._purge_expired()
+        if len(self._tickets) >= self.max_tickets and not self._evict_finished():
+            # 协程不会再被调度：关闭它，避免 "coroutine was never awaited" 警告
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise TicketError(f"Too many pending feedback requests (limit {self.max_tickets})")
+
+        ticket = FeedbackTicket(uuid.uuid4().hex, asyncio.ensure_future(awaitable))
+
+        def on_done(_task):
+            ticket.finished_at = time.monotonic()
+            if _task.cancelled():
+                return
+            # 取走异常，避免未读取的结果触发 "exception was never retrieved" 警告
+            _task.exception()
+
+        ticket.task.add_done_callback(on_done)
+        self._tickets[ticket.ticket_id] = ticket
+        return ticket
+
+    def get(self, ticket_id: str) -> FeedbackTicket:
+        """获取票据，不存在或已过期时抛出TicketError"""
+        self._purge_expired()
+        ticket = self._tickets.get(ticket_id)
+        if ticket is None:
+            raise TicketError(f"Unknown or expired feedback ticket: {ticket_id}")
+        return ticket
+
+    async def wait(self, ticket_id: str, timeout: float) -> Optional[dict]:
+        """限时等待票据结果，仍未完成时返回None；请求失败时抛出原异常"""
+        ticket = self.get(ticket_id)
+        if not ticket.done and timeout > 0:
+            # asyncio.wait 超时或被取消时都不会取消后台的反馈请求
+            await asyncio.wait([ticket.task], timeout=timeout)
+        if not ticket.done:
+            return None
+        if ticket.task.cancelled():
+            raise TicketError(f"Feedback ticket {ticket_id} was cancelled")
+        return ticket.task.result()
+
+    def cancel_all(self):
+        """取消所有未完成的请求（服务关闭时调用）"""
+        for ticket in self._tickets.values():
+            if not ticket.done:
+                ticket.task.cancel()
+        self._tickets.clear()
+
+    def _purge_expired(self):
+        """移除已过期的已完成票据"""
+        now = time.monotonic()
+        expired = [
+            ticket_id for ticket_id, ticket in self._tickets.items()
+            if ticket.finished_at is not None and now - ticket.finished_at > self.ttl_seconds
+        ]
+        for ticket_id in expired:
+            del self._tickets[ticket_id]
+
+    def _evict_finished(self) -> bool:
+        """淘汰最早创建的已完成票据，没有可淘汰的票据时返回False"""
+        for ticket_id, ticket in self._tickets.items():
+            if ticket.done:
+                del self._tickets[ticket_id]
+                return True
+        return False
+
+
+# 全局实例
+ticket_store = TicketStore()
@@ -1,34 +1,27 @@
 # Interactive Feedback MCP UI
 # Developed by Fábio Ferreira (https://x.com/fabiomlferreira)
 # Inspired by/related to dotcursorrules.com (https://dotcursorrules.com/)
+#
+# 启动时间敏感：对话框（ui_dialogs）、图片处理（PIL）和命令执行（subprocess）
+# 都在首次使用时才导入，冷启动预算由 check_startup_time.py 检查。
 import os
 import sys
 import json
-import psutil
+import time
 import argparse
-import subprocess
-import threading
-from typing import Optional
-from functools import partial
+from typing import TYPE_CHECKING, List, Optional
 
-# 导入国际化和图片组件
+# 导入国际化
 from i18n import i18n
-from clipboard_image_widget import ClipboardImageWidget
+from config import AUTO_SUBMIT_ENV
+import tracing
+from metrics import metrics
 
 # 导入新的模块化组件
-from ui_utils import (
-    set_dark_title_bar, get_dark_mode_palette, kill_tree, 
-    get_user_environment, LogSignals, FeedbackTextEdit
-)
-from ui_config import (
-    FeedbackResult, FeedbackConfig, UIConfigManager, 
-    get_project_settings_group, get_default_config
-)
+from ui_utils import set_dark_title_bar, get_dark_mode_palette, kill_tree, LogSignals
+from ui_config import FeedbackResult, FeedbackQuestion, UIConfigManager
+from rule_catalog import rule_catalog
 from quick_response_manager import QuickResponseManager
-from ui_dialogs import (
-    QuickResponseEditDialog, QuickResponseItemDialog, 
-    TempImagesCleanupDialog
-)
 from ui_i18n import UIInternationalization
 
 # 导入新的深度模块化组件
@@ -39,13 +32,12 @@ from ui_events import UIEventManager
 from ui_settings import UISettingsManager
 from feedback_logic import FeedbackLogicManager
 
-from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QLabel, QLineEdit, QPushButton, QCheckBox, QTextEdit, QGroupBox,
-    QDialog, QListWidget, QListWidgetItem, QMessageBox, QRadioButton, QSpinBox, QComboBox
-)
-from PySide6.QtCore import Qt, Signal, QObject, QTimer, QSettings
-from PySide6.QtGui import QTextCursor, QIcon, QKeyEvent, QFont, QFontDatabase, QPalette, QColor
+from PySide6.QtWidgets import QApplication, QMainWindow
+from PySide6.QtCore import Qt, Signal, QSettings, QTimer
+from PySide6.QtGui import QIcon
+
+if TYPE_CHECKING:
+    import subprocess
 
 # 类型定义已移至 ui_config.py
 
@@ -54,14 +46,26 @@ from PySide6.QtGui import QTextCursor, QIcon, QKeyEvent, QFont, QFontDatabase, Q
 # 自定义组件已移至 ui_utils.py
 
 class FeedbackUI(QMainWindow):
-    def __init__(self, project_directory: str, prompt: str):
+    # 窗口关闭时发出最终结果（常驻UI宿主进程通过该信号获取结果）
+    feedback_finished = Signal(dict)
+
+    def __init__(self, project_directory: str, prompt: str, questions: Optional[List[FeedbackQuestion]] = None,
+                 trace_id: Optional[str] = None):
         super().__init__()
+        self.trace_id = trace_id
+        with tracing.span("FeedbackUI.__init__", trace_id=trace_id):
+            self._init_window(project_directory, prompt, questions)
+    
+    def _init_window(self, project_directory: str, prompt: str, questions: Optional[List[FeedbackQuestion]]):
+        """构建窗口（在 FeedbackUI.__init__ 追踪区间内执行）"""
         self.project_directory = project_directory
         self.prompt = prompt
+        self.questions = questions or []
 
-        self.process: Optional[subprocess.Popen] = None
+        self.process: Optional["subprocess.Popen"] = None
         self.log_buffer = []
         self.feedback_result = None
+        self._finished_emitted = False
         self.log_signals = LogSignals()
         # log_signals连接将在event_manager初始化后设置
         
@@ -71,18 +75,22 @@ class FeedbackUI(QMainWindow):
         # 初始化窗口基本设置
         self._setup_window()
         
-        # 初始化QSettings
+        # 初始化QSettings（窗口几何）和项目配置快照（同一进程内同一项目只读取一次存储）
         self.settings = QSettings("InteractiveFeedbackMCP", "InteractiveFeedbackMCP")
-        self.project_group_name = get_project_settings_group(self.project_directory)
+        with tracing.span("init.config_manager"):
+            self.config_manager = UIConfigManager(self.project_directory, self.settings)
+        self.project_group_name = self.config_manager.project_group_name
         
-        # 先设置临时的i18n语言（使用默认中文），这样可以正确生成默认按钮
-        i18n.set_language("zh_CN")
+        # 每个窗口持有自己的翻译器：常驻宿主中多个窗口（标签页、常驻窗口）可以使用不同语言，
+        # 切换语言不影响其他窗口。先使用默认中文，这样可以正确生成默认按钮
+        self.i18n = i18n.for_language("zh_CN")
         
         # 初始化默认快捷按钮
         self.default_quick_responses = self._get_default_quick_responses()
         
         # 加载快捷按钮配置
-        self.quick_responses = self._load_quick_responses()
+        with tracing.span("FeedbackUI.load_quick_responses"):
+            self.quick_responses = self._load_quick_responses()
         
         # 初始化自定义按钮标志
         self._has_custom_buttons = False
@@ -91,13 +99,15 @@ class FeedbackUI(QMainWindow):
         self._initialize_managers()
         
         # 加载配置
-        self.config = self.settings_manager.load_settings()
+        with tracing.span("UISettingsManager.load_settings"):
+            self.config = self.settings_manager.load_settings()
         
         # 设置国际化语言
-        i18n.set_language(self.config["language"])
+        self.i18n.set_language(self.config["language"])
 
         # 创建UI
-        self.layout_manager.create_ui()
+        with tracing.span("UILayoutManager.create_ui"):
+            self.layout_manager.create_ui()
         
         # 设置base64传输选项的初始状态
         self.layout_manager.set_base64_initial_state()
@@ -106,7 +116,8 @@ class FeedbackUI(QMainWindow):
         self._update_visible_buttons_config()
 
         # 应用初始设置
-        self.settings_manager.apply_initial_settings()
+        with tracing.span("UISettingsManager.apply_initial_settings"):
+            self.settings_manager.apply_initial_settings()
 
         set_dark_title_bar(self, True)
         
@@ -118,7 +129,8 @@ class FeedbackUI(QMainWindow):
         self._is_initializing = False
         
         # 初始化完成后，根据语言设置更新按钮文本
-        self._update_buttons_for_language_change()
+        with tracing.span("FeedbackUI.update_buttons_for_language"):
+            self._update_buttons_for_language_change()
 
         if self.config.get("execute_automatically", False):
             self.event_manager.run_command()
@@ -134,24 +146,29 @@ class FeedbackUI(QMainWindow):
     def _initialize_managers(self):
         """初始化所有管理器"""
         # 配置管理器
-        self.config_manager = UIConfigManager(self.project_directory)
-        self.settings_manager = UISettingsManager(self)
+        with tracing.span("init.settings_manager"):
+            self.settings_manager = UISettingsManager(self)
         
         # 性能管理器
-        self.performance_manager = UIPerformanceManager(self)
+        with tracing.span("init.performance_manager"):
+            self.performance_manager = UIPerformanceManager(self)
         
         # UI管理器
-        self.layout_manager = UILayoutManager(self)
-        self.button_core_manager = ButtonCoreManager(self)
+        with tracing.span("init.layout_manager"):
+            self.layout_manager = UILayoutManager(self)
+        with tracing.span("init.button_core_manager"):
+            self.button_core_manager = ButtonCoreManager(self)
         
         # 事件管理器
-        self.event_manager = UIEventManager(self)
+        with tracing.span("init.event_manager"):
+            self.event_manager = UIEventManager(self)
         
         # 连接日志信号
         self.log_signals.append_log.connect(self.event_manager.append_log)
         
         # 业务逻辑管理器
-        self.feedback_logic_manager = FeedbackLogicManager(self)
+        with tracing.span("init.feedback_logic_manager"):
+            self.feedback_logic_manager = FeedbackLogicManager(self)
         
         # 在UI创建后初始化的管理器（保持兼容性）
         self.quick_response_manager = None
@@ -178,30 +195,30 @@ class FeedbackUI(QMainWindow):
 
     def _get_default_quick_responses(self):
         """获取默认快捷按钮列表（统一配置，确保中英文功能对等）"""
-        current_language = i18n.language
+        current_language = self.i18n.language
         
-        # 提取完整规则
-        mode_rules = self._extract_mode_rules_from_cursor_rule()
+        # 完整规则（规则目录缓存的解析结果）
+        mode_rules = rule_catalog.mode_instructions()
         
         # 统一的按钮配置，两种语言功能完全对等
         buttons = [
             # RIPER-5协议模式按钮（两种语言都有）
-            (i18n.t("riper_research_full"), mode_rules.get("RESEARCH", i18n.t("riper_research_feedback"))),
-            (i18n.t("riper_innovate_full"), mode_rules.get("INNOVATE", i18n.t("riper_innovate_feedback"))),
-            (i18n.t("riper_plan_full"), mode_rules.get("PLAN", i18n.t("riper_plan_feedback"))),
-            (i18n.t("riper_execute_full"), mode_rules.get("EXECUTE", i18n.t("riper_execute_feedback"))),
-            (i18n.t("riper_review_full"), mode_rules.get("REVIEW", i18n.t("riper_review_feedback"))),
+            (self.i18n.t("riper_research_full"), mode_rules.get("RESEARCH", self.i18n.t("riper_research_feedback"))),
+            (self.i18n.t("riper_innovate_full"), mode_rules.get("INNOVATE", self.i18n.t("riper_innovate_feedback"))),
+            (self.i18n.t("riper_plan_full"), mode_rules.get("PLAN", self.i18n.t("riper_plan_feedback"))),
+            (self.i18n.t("riper_execute_full"), mode_rules.get("EXECUTE", self.i18n.t("riper_execute_feedback"))),
+            (self.i18n.t("riper_review_full"), mode_rules.get("REVIEW", self.i18n.t("riper_review_feedback"))),
             
             # 核心执行策略
-            (i18n.t("complete_all_checklist"), i18n.t("complete_all_feedback")),
-            (i18n.t("smart_execute_checklist"), i18n.t("smart_execute_feedback")),
-            (i18n.t("execute_next_item"), i18n.t("execute_next_feedback")),
-            (i18n.t("summarize_to_cursorrule"), i18n.t("summarize_cursorrule_feedback")),
+            (self.i18n.t("complete_all_checklist"), self.i18n.t("complete_all_feedback")),
+            (self.i18n.t("smart_execute_checklist"), self.i18n.t("smart_execute_feedback")),
+            (self.i18n.t("execute_next_item"), self.i18n.t("execute_next_feedback")),
+            (self.i18n.t("summarize_to_cursorrule"), self.i18n.t("summarize_cursorrule_feedback")),
             
             # 常用反馈（统一的三个核心按钮）
-            (i18n.t("looks_good"), i18n.t("looks_good_feedback")),
-            (i18n.t("needs_adjustment"), i18n.t("needs_adjustment_feedback")),
-            (i18n.t("complete"), i18n.t("complete_feedback")),
+            (self.i18n.t("looks_good"), self.i18n.t("looks_good_feedback")),
+            (self.i18n.t("needs_adjustment"), self.i18n.t("needs_adjustment_feedback")),
+            (self.i18n.t("complete"), self.i18n.t("complete_feedback")),
         ]
         
         return buttons
@@ -232,80 +249,18 @@ class FeedbackUI(QMainWindow):
 
     def _load_quick_responses(self):
         """加载快捷按钮配置"""
-        self.settings.beginGroup(self.project_group_name)
-        
         # 尝试加载自定义配置
-        saved_responses = self.settings.value("quick_responses", None)
+        saved_responses = self.config_manager.load_quick_responses()
         
-        if saved_responses and len(saved_responses) > 0:
+        if saved_responses:
             # 标记有自定义配置
             self._has_custom_buttons = True
-            self.settings.endGroup()
             return saved_responses
         else:
-            # 如果没有保存的配置，生成统一的默认配置
+            # 如果没有保存的配置，直接使用已初始化的默认按钮
             self._has_custom_buttons = False
-            self.settings.endGroup()
-            # 直接使用已初始化的默认按钮
             return self.default_quick_responses
     
-
-    
-    def _extract_mode_rules_from_cursor_rule(self):
-        """从RIPER-5-cursor-rule.txt提取各模式的完整规则"""
-        cursor_rule_path = os.path.join(os.path.dirname(__file__), "RIPER-5-cursor-rule.txt")
-        
-        if not os.path.exists(cursor_rule_path):
-            return {}
-        
-        try:
-            with open(cursor_rule_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # 定义各模式的规则提取模式
-            mode_patterns = {
-                "RESEARCH": (
-                    r"### 模式1: RESEARCH.*?(?=### 模式2: INNOVATE)",
-                    "RESEARCH模式规则"
-                ),
-                "INNOVATE": (
-                    r"### 模式2: INNOVATE.*?(?=### 模式3: PLAN)",
-                    "INNOVATE模式规则"
-                ),
-                "PLAN": (
-                    r"### 模式3: PLAN.*?(?=### 模式4: EXECUTE)",
-                    "PLAN模式规则"
-                ),
-                "EXECUTE": (
-                    r"### 模式4: EXECUTE.*?(?=### 模式5: REVIEW)",
-                    "EXECUTE模式规则"
-                ),
-                "REVIEW": (
-                    r"### 模式5: REVIEW.*?(?=## 关键协议指南)",
-                    "REVIEW模式规则"
-                )
-            }
-            
-            extracted_rules = {}
-            
-            for mode, (pattern, description) in mode_patterns.items():
-                import re
-                match = re.search(pattern, content, re.DOTALL)
-                if match:
-                    rule_text = match.group(0)
-                    # 清理文本，移除过多的空行
-                    rule_text = re.sub(r'\n\s*\n\s*\n', '\n\n', rule_text)
-                    extracted_rules[mode] = rule_text.strip()
-                else:
-                    # 如果提取失败，使用备用文本
-                    extracted_rules[mode] = f"请严格按照{mode}模式的协议执行，参考RIPER-5-cursor-rule.txt中的详细规则。"
-            
-            return extracted_rules
-            
-        except Exception as e:
-            # 如果读取失败，返回空字典
-            return {}
-    
     def _update_visible_buttons_config(self):
         """更新visible_buttons配置以匹配当前按钮数量"""
         current_visible = self.config.get("visible_buttons", [])
@@ -319,10 +274,8 @@ class FeedbackUI(QMainWindow):
             
             self.config["visible_buttons"] = current_visible
             
-            # 保存更新后的配置
-            self.settings.beginGroup(self.project_group_name)
-            self.settings.setValue("visible_buttons", current_visible)
-            self.settings.endGroup()
+            # 保存更新后的配置（延迟写回，启动期间不访问存储）
+            self.config_manager.set_value("visible_buttons", list(current_visible))
 
     def _get_smart_default_responses(self):
         """获取统一的默认快捷按钮（不区分项目类型）"""
@@ -331,31 +284,36 @@ class FeedbackUI(QMainWindow):
 
     def _save_quick_responses(self):
         """保存快捷按钮配置"""
-        self.settings.beginGroup(self.project_group_name)
-        self.settings.setValue("quick_responses", self.quick_responses)
-        self.settings.endGroup()
+        self.config_manager.save_quick_responses(self.quick_responses)
         
         # 标记用户有自定义配置
         self._has_custom_buttons = True
 
     def _edit_quick_responses(self):
         """编辑快捷按钮配置（优化版本）"""
+        from PySide6.QtWidgets import QDialog
+        from ui_dialogs import QuickResponseEditDialog
+        
         dialog = QuickResponseEditDialog(self.quick_responses, self)
         if dialog.exec() == QDialog.Accepted:
-            # 清理缓存（配置可能已更改）
-            self.performance_manager.clear_layout_cache()
-            
-            self.quick_responses = dialog.quick_responses
-            self._save_quick_responses()
-            
-            # 批量执行UI更新
-            def update_ui():
-                self.button_core_manager.refresh_quick_response_buttons()
-                self.settings_manager.save_config()
-                self._adjust_window_size()
-                return True
-            
-            self.performance_manager.batch_ui_updates(update_ui)
+            self._apply_quick_responses(dialog.quick_responses)
+
+    def _apply_quick_responses(self, quick_responses):
+        """应用编辑后的快捷按钮配置：保存并刷新按钮"""
+        # 清理缓存（配置可能已更改）
+        self.performance_manager.clear_layout_cache()
+        
+        self.quick_responses = quick_responses
+        self._save_quick_responses()
+        
+        # 批量执行UI更新
+        def update_ui():
+            self.button_core_manager.refresh_quick_response_buttons()
+            self.settings_manager.save_config()
+            self._adjust_window_size()
+            return True
+        
+        self.performance_manager.batch_ui_updates(update_ui)
 
     def clear_logs(self):
         self.log_buffer = []
@@ -408,6 +366,9 @@ class FeedbackUI(QMainWindow):
 
     def _center_window(self):
         """将窗口居中显示"""
+        if not self.isWindow():
+            # 嵌入标签页时由外层窗口负责位置
+            return
         screen = QApplication.primaryScreen().geometry()
         window_geometry = self.geometry()
         x = (screen.width() - window_geometry.width()) // 2
@@ -418,82 +379,86 @@ class FeedbackUI(QMainWindow):
         """刷新界面文本以适应语言变化（优化版本）"""
         def update_text():
             # 更新窗口标题
-            self.setWindowTitle(i18n.t("window_title"))
+            self.setWindowTitle(self.i18n.t("window_title"))
             
             # 更新按钮文本（添加安全检查）
             try:
                 if hasattr(self, 'toggle_command_button') and self.toggle_command_button is not None:
                     if self.command_group.isVisible():
-                        self.toggle_command_button.setText(i18n.t("hide_command_section"))
+                        self.toggle_command_button.setText(self.i18n.t("hide_command_section"))
                     else:
-                        self.toggle_command_button.setText(i18n.t("show_command_section"))
+                        self.toggle_command_button.setText(self.i18n.t("show_command_section"))
                 
                 if hasattr(self, 'run_button') and self.run_button is not None:
                     if self.process:
-                        self.run_button.setText(i18n.t("stop"))
+                        self.run_button.setText(self.i18n.t("stop"))
                     else:
-                        self.run_button.setText(i18n.t("run"))
+                        self.run_button.setText(self.i18n.t("run"))
                 
                 if hasattr(self, 'clear_button') and self.clear_button is not None:
-                    self.clear_button.setText(i18n.t("clear"))
+                    self.clear_button.setText(self.i18n.t("clear"))
                 
                 if hasattr(self, 'auto_check') and self.auto_check is not None:
-                    self.auto_check.setText(i18n.t("execute_automatically"))
+                    self.auto_check.setText(self.i18n.t("execute_automatically"))
                 
                 if hasattr(self, 'save_button') and self.save_button is not None:
-                    self.save_button.setText(i18n.t("save_configuration"))
+                    self.save_button.setText(self.i18n.t("save_configuration"))
                 
                 if hasattr(self, 'tools_button') and self.tools_button is not None:
-                    self.tools_button.setText(i18n.t("tools_menu"))
-                    self.tools_button.setToolTip(i18n.t("tools_menu_tooltip"))
+                    self.tools_button.setText(self.i18n.t("tools_menu"))
+                    self.tools_button.setToolTip(self.i18n.t("tools_menu_tooltip"))
                 
                 if hasattr(self, 'submit_button') and self.submit_button is not None:
-                    self.submit_button.setText(i18n.t("send_feedback"))
+                    self.submit_button.setText(self.i18n.t("send_feedback"))
             except RuntimeError:
                 # UI对象已被删除，忽略此错误
                 pass
             
             try:
                 if hasattr(self, 'feedback_text') and self.feedback_text is not None:
-                    self.feedback_text.setPlaceholderText(i18n.t("placeholder_feedback"))
+                    self.feedback_text.setPlaceholderText(self.i18n.t("placeholder_feedback"))
                 
                 if hasattr(self, 'working_dir_label') and self.working_dir_label is not None:
                     formatted_path = self._format_windows_path(self.project_directory)
-                    self.working_dir_label.setText(f"{i18n.t('working_directory')}: {formatted_path}")
+                    self.working_dir_label.setText(f"{self.i18n.t('working_directory')}: {formatted_path}")
                 
                 # 更新组框标题
                 if hasattr(self, 'command_group') and self.command_group is not None:
-                    self.command_group.setTitle(i18n.t("command"))
+                    self.command_group.setTitle(self.i18n.t("command"))
                 
                 if hasattr(self, 'feedback_group') and self.feedback_group is not None:
-                    self.feedback_group.setTitle(i18n.t("feedback"))
+                    self.feedback_group.setTitle(self.i18n.t("feedback"))
                 
                 # 更新反馈后缀选项
                 if hasattr(self, 'suffix_group') and self.suffix_group is not None:
-                    self.suffix_group.setTitle(i18n.t("feedback_suffix_options"))
+                    self.suffix_group.setTitle(self.i18n.t("feedback_suffix_options"))
                 
                 if hasattr(self, 'suffix_radio_force') and self.suffix_radio_force is not None:
-                    self.suffix_radio_force.setText(i18n.t("force_mcp_call"))
-                    self.suffix_radio_force.setToolTip(i18n.t("force_mcp_tooltip"))
+                    self.suffix_radio_force.setText(self.i18n.t("force_mcp_call"))
+                    self.suffix_radio_force.setToolTip(self.i18n.t("force_mcp_tooltip"))
                 
                 if hasattr(self, 'suffix_radio_smart') and self.suffix_radio_smart is not None:
-                    self.suffix_radio_smart.setText(i18n.t("smart_judgment"))
-                    self.suffix_radio_smart.setToolTip(i18n.t("smart_judgment_tooltip"))
+                    self.suffix_radio_smart.setText(self.i18n.t("smart_judgment"))
+                    self.suffix_radio_smart.setToolTip(self.i18n.t("smart_judgment_tooltip"))
                 
                 if hasattr(self, 'suffix_radio_none') and self.suffix_radio_none is not None:
-                    self.suffix_radio_none.setText(i18n.t("no_special_append"))
-                    self.suffix_radio_none.setToolTip(i18n.t("no_append_tooltip"))
+                    self.suffix_radio_none.setText(self.i18n.t("no_special_append"))
+                    self.suffix_radio_none.setToolTip(self.i18n.t("no_append_tooltip"))
+                
+                if hasattr(self, 'follow_up_checkbox') and self.follow_up_checkbox is not None:
+                    self.follow_up_checkbox.setText(self.i18n.t("allow_follow_up"))
+                    self.follow_up_checkbox.setToolTip(self.i18n.t("allow_follow_up_tooltip"))
                 
                 # 更新图片传输选项区域
                 if hasattr(self, 'image_transmission_group') and self.image_transmission_group is not None:
-                    self.image_transmission_group.setTitle(i18n.t("image_transmission_options"))
+                    self.image_transmission_group.setTitle(self.i18n.t("image_transmission_options"))
                 
                 if hasattr(self, 'base64_checkbox') and self.base64_checkbox is not None:
-                    self.base64_checkbox.setText(i18n.t("enable_base64_transmission"))
-                    self.base64_checkbox.setToolTip(i18n.t("base64_transmission_tooltip"))
+                    self.base64_checkbox.setText(self.i18n.t("enable_base64_transmission"))
+                    self.base64_checkbox.setToolTip(self.i18n.t("base64_transmission_tooltip"))
                 
                 if hasattr(self, 'size_limit_label') and self.size_limit_label is not None:
-                    self.size_limit_label.setText(i18n.t("target_size"))
+                    self.size_limit_label.setText(self.i18n.t("target_size"))
             except RuntimeError:
                 # UI对象已被删除，忽略此错误
                 pass
@@ -580,6 +545,28 @@ class FeedbackUI(QMainWindow):
         from ui_config import is_default_button
         return is_default_button(button_text, response_text)
 
+    def showEvent(self, event):
+        """窗口显示时记录时间；基准测试模式下在事件循环空闲后自动提交"""
+        super().showEvent(event)
+        if os.environ.get(AUTO_SUBMIT_ENV) == "1" and self.feedback_result is None and not self._finished_emitted:
+            shown_at = time.time()
+            # 0ms定时器在显示后的首轮事件处理完成时触发，即窗口可以响应输入的时刻
+            QTimer.singleShot(0, lambda: self._auto_submit(shown_at))
+
+    def _auto_submit(self, shown_at: float):
+        """基准测试钩子：以计时数据（JSON）作为反馈内容提交"""
+        if self.feedback_result is not None or self._finished_emitted:
+            return
+        interactive_at = time.time()
+        self.feedback_text.setPlainText(json.dumps({
+            "shown": shown_at,
+            "interactive": interactive_at,
+            "submit": time.time(),
+        }))
+        self.feedback_logic_manager.submit_feedback()
+        if self.feedback_logic_manager.in_follow_up:
+            self.close()
+
     def keyPressEvent(self, event):
         """处理键盘事件，支持全局Ctrl+V粘贴图片"""
         if self.event_manager.handle_key_press(event):
@@ -588,112 +575,98 @@ class FeedbackUI(QMainWindow):
 
     def closeEvent(self, event):
         """处理窗口关闭事件"""
-        self.event_manager.handle_close_event(event)
-        super().closeEvent(event)
+        try:
+            self.feedback_logic_manager.stop_follow_up()
+            self.event_manager.handle_close_event(event)
+            super().closeEvent(event)
+        finally:
+            # 保存设置失败也不能阻断反馈结果的回传
+            if not self._finished_emitted:
+                self._finished_emitted = True
+                self.feedback_finished.emit(self.get_result())
+
+    def reset_for_prompt(self, prompt: str, questions: Optional[List[FeedbackQuestion]] = None,
+                         trace_id: Optional[str] = None):
+        """复用窗口：换上新的提示并清空反馈区域，保留已加载的配置和按钮"""
+        self.trace_id = trace_id
+        with tracing.span("FeedbackUI.reset_for_prompt", trace_id=trace_id):
+            self._reset_for_prompt(prompt, questions)
+
+    def _reset_for_prompt(self, prompt: str, questions: Optional[List[FeedbackQuestion]]):
+        """清空反馈区域并换上新的提示"""
+        self.prompt = prompt
+        self.questions = questions or []
+        self.feedback_result = None
+        self._finished_emitted = False
+        self.feedback_logic_manager.stop_follow_up()
 
-    def run(self) -> FeedbackResult:
-        self.show()
-        QApplication.instance().exec()
+        # 闲置期间同一项目的其他窗口可能切换了语言：按共享的项目配置快照更新本窗口的翻译器
+        language = self.config_manager.get_value("language")
+        if language != self.config.get("language") and self.i18n.set_language(language):
+            self.config["language"] = language
+            self._refresh_ui_text()
 
-        if self.process:
-            kill_tree(self.process)
+        self.log_buffer = []
+        self.log_text.clear()
+        self.description_label.setText(prompt)
+        self.question_form.set_questions(self.questions)
+        self.feedback_text.clear()
+        self.clipboard_image_widget.clear_images()
+        self.submit_button.setText(self.i18n.t("send_feedback"))
 
+        if self.config.get("execute_automatically", False):
+            self.event_manager.run_command()
+
+    def get_result(self) -> FeedbackResult:
+        """获取当前反馈结果（未提交时返回空反馈）"""
         if not self.feedback_result:
             return FeedbackResult(logs="".join(self.log_buffer), interactive_feedback="")
 
         return self.feedback_result
 
-def get_project_settings_group(project_dir: str) -> str:
-    # Create a safe, unique group name from the project directory path
-    # Using only the last component + hash of full path to keep it somewhat readable but unique
-    import hashlib
-    basename = os.path.basename(os.path.normpath(project_dir))
-    full_hash = hashlib.md5(project_dir.encode('utf-8')).hexdigest()[:8]
-    return f"{basename}_{full_hash}"
-
-def _call_interactive_feedback_mcp(project_directory: str, summary: str):
-    """调用interactive-feedback-mcp等待用户反馈"""
-    try:
-        # 导入MCP工具（如果可用）
-        import subprocess
-        import sys
-        import json
-        
-        # 构建MCP调用命令
-        mcp_command = [
-            sys.executable, "-c",
-            f"""
-import json
-import sys
-try:
-    # 模拟MCP interactive_feedback调用
-    print("MCP Interactive Feedback Started")
-    print(f"Project: {project_directory}")
-    print(f"Summary: {summary}")
-    print("等待用户反馈...")
-    
-    # 这里应该是实际的MCP调用逻辑
-    # 暂时用输入等待来模拟
-    user_input = input("请输入反馈（按Enter结束）: ")
-    
-    result = {{
-        "logs": "MCP调用完成",
-        "interactive_feedback": user_input
-    }}
-    
-    print(json.dumps(result))
-except Exception as e:
-    print(json.dumps({{"error": str(e)}}))
-"""
-        ]
-        
-        # 执行MCP调用
-        process = subprocess.Popen(
-            mcp_command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        
-        stdout, stderr = process.communicate()
-        
-        if process.returncode == 0:
-            try:
-                result = json.loads(stdout.strip().split('\n')[-1])
-                return result
-            except:
-                return {"logs": stdout, "interactive_feedback": ""}
-        else:
-            print(f"MCP调用失败: {stderr}")
-            return {"logs": stderr, "interactive_feedback": ""}
-            
-    except Exception as e:
-        print(f"调用interactive-feedback-mcp时出错: {e}")
-        return {"logs": str(e), "interactive_feedback": ""}
+    def run(self) -> FeedbackResult:
+        self.show()
+        QApplication.instance().exec()
 
-def feedback_ui(project_directory: str, prompt: str, output_file: Optional[str] = None) -> Optional[FeedbackResult]:
+        if self.process:
+            kill_tree(self.process)
+
+        return self.get_result()
+
+def feedback_ui(project_directory: str, prompt: str, output_file: Optional[str] = None,
+                output_stream=None, questions: Optional[List[FeedbackQuestion]] = None,
+                trace_id: Optional[str] = None) -> Optional[FeedbackResult]:
     app = QApplication.instance() or QApplication()
     app.setPalette(get_dark_mode_palette(app))
     app.setStyle("Fusion")
-    ui = FeedbackUI(project_directory, prompt)
+    from ui_watchdog import EventLoopWatchdog, is_watchdog_enabled
+    watchdog = EventLoopWatchdog() if is_watchdog_enabled() else None
+    if watchdog is not None:
+        watchdog.start()
+    ui = FeedbackUI(project_directory, prompt, questions, trace_id)
     result = ui.run()
-
-    # 在获得结果后调用interactive-feedback-mcp等待用户反馈
-    if result and result.get("interactive_feedback"):
-        print("正在调用interactive-feedback-mcp等待您的反馈...")
-        mcp_result = _call_interactive_feedback_mcp(project_directory, "用户反馈已提交，等待进一步指示")
-        
-        # 如果MCP返回了额外的反馈，可以合并到结果中
-        if mcp_result and mcp_result.get("interactive_feedback"):
-            original_feedback = result["interactive_feedback"]
-            additional_feedback = mcp_result["interactive_feedback"]
-            if additional_feedback.strip():  # 只有在有额外反馈时才合并
-                result["interactive_feedback"] = f"{original_feedback}\n\n[额外反馈]: {additional_feedback}"
+    if watchdog is not None:
+        watchdog.stop()
+    metrics.export_json()
+
+    if output_stream is not None and result:
+        # 以分帧协议直接写入输出流，不经过磁盘
+        from ipc_protocol import write_result_frames
+        with tracing.span("write_result_frames", trace_id=trace_id):
+            write_result_frames(output_stream, None, result)
+        return None
 
     if output_file and result:
         # Ensure the directory exists
         os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else ".", exist_ok=True)
-        # Save the result to the output file
+        # Save the result to the output file (attachment bytes are base64 encoded for JSON)
+        if result.get("attachments"):
+            import base64
+            result = dict(result)
+            result["attachments"] = [
+                dict(attachment, data=base64.b64encode(attachment["data"]).decode("ascii"))
+                for attachment in result["attachments"]
+            ]
         with open(output_file, "w") as f:
             json.dump(result, f)
         return None
@@ -710,9 +683,22 @@ if __name__ == "__main__":
     parser.add_argument("--project-directory", default=os.getcwd(), help="The project directory to run the command in")
     parser.add_argument("--prompt", default="I implemented the changes you requested.", help="The prompt to show to the user")
     parser.add_argument("--output-file", help="Path to save the feedback result as JSON")
+    parser.add_argument("--stream", action="store_true", help="Stream the feedback result as frames on stdout")
+    parser.add_argument("--questions", help="JSON list of questions ({question, choices}) to show as a form")
+    parser.add_argument("--trace-id", help="Trace id shared with the server when tracing is enabled")
+    parser.add_argument("--profile", action="store_true", help="Profile the whole session with cProfile (also enabled by INTERACTIVE_FEEDBACK_PROFILE=1)")
     args = parser.parse_args()
 
-    result = feedback_ui(args.project_directory, args.prompt, args.output_file)
+    output_stream = None
+    if args.stream:
+        # 协议独占真实stdout，其余print输出重定向到stderr
+        output_stream = sys.stdout.buffer
+        sys.stdout = sys.stderr
+
+    questions = json.loads(args.questions) if args.questions else None
+    from profiling import is_profiling_enabled, profile_session
+    with profile_session("feedback_ui", args.profile or is_profiling_enabled()):
+        result = feedback_ui(args.project_directory, args.prompt, args.output_file, output_stream, questions, args.trace_id)
     if result:
         print(f"\nLogs collected: \n{result['logs']}")
         print(f"\nFeedback received:\n{result['interactive_feedback']}")
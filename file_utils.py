@@ -0,0 +1,23 @@
+"""
+文件工具模块 - 与Qt无关的文件操作（配置、缓存、指标导出共用）
+"""
+import os
+import threading
+
+
+def atomic_write(path: str, payload: bytes):
+    """原子写入：先写同目录下的临时文件再替换目标文件，读取方不会看到半个文件
+
+    临时文件名包含进程和线程ID，并发写入互不干扰；失败时删除临时文件后抛出原异常。
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
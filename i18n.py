@@ -3,6 +3,7 @@
 国际化支持模块
 支持中文、英文等多种语言
 """
+import copy
 
 class I18n:
     def __init__(self, language="zh_CN"):
@@ -40,6 +41,11 @@ class I18n:
                 "force_mcp_tooltip": "执行完后需要调用interactive-feedback-mcp 等待我的反馈",
                 "smart_judgment_tooltip": "执行完后自行判定是否需要调用interactive-feedback-mcp 等待我的反馈",
                 "no_append_tooltip": "不在反馈内容后追加任何MCP调用指令",
+                "allow_follow_up": "提交后允许追加",
+                "allow_follow_up_tooltip": "提交后窗口保留片刻，可再补充一条追加反馈",
+                "send_follow_up": "发送追加反馈 ({seconds}秒后自动完成)",
+                "follow_up_hint": "反馈已提交。可在下方补充追加反馈，留空发送或关闭窗口即完成。",
+                "queued_requests": "另有 {count} 个反馈请求排队中",
                 
 
                 
@@ -89,6 +95,7 @@ class I18n:
                 "placeholder_width": "宽度",
                 "placeholder_height": "高度",
                 "placeholder_feedback": "在此输入您的反馈 (Ctrl+Enter 提交)",
+                "question_answer_placeholder": "输入答案，或点击上方选项",
                 
                 # 消息
                 "configuration_saved": "项目配置已保存。\n",
@@ -202,6 +209,11 @@ class I18n:
                 "force_mcp_tooltip": "Need to call interactive-feedback-mcp after execution to wait for my feedback",
                 "smart_judgment_tooltip": "Determine whether to call interactive-feedback-mcp after execution based on the situation",
                 "no_append_tooltip": "Do not append any MCP call instructions after feedback content",
+                "allow_follow_up": "Allow follow-up",
+                "allow_follow_up_tooltip": "Keep the window open briefly after submitting for one additional message",
+                "send_follow_up": "Send Follow-up (auto-finish in {seconds}s)",
+                "follow_up_hint": "Feedback submitted. Add a follow-up below; send it empty or close the window to finish.",
+                "queued_requests": "{count} more feedback request(s) queued",
                 
 
                 
@@ -251,6 +263,7 @@ class I18n:
                 "placeholder_width": "Width",
                 "placeholder_height": "Height",
                 "placeholder_feedback": "Enter your feedback here (Ctrl+Enter to submit)",
+                "question_answer_placeholder": "Type an answer or pick a choice above",
                 
                 # Messages
                 "configuration_saved": "Configuration saved for this project.\n",
@@ -346,6 +359,14 @@ class I18n:
             return True
         return False
     
+    def for_language(self, language):
+        """创建使用指定语言的独立翻译器（共享翻译表，切换语言互不影响）"""
+        translator = copy.copy(self)
+        if language not in self.translations:
+            language = self.language
+        translator.language = language
+        return translator
+
     def get_available_languages(self):
         """获取可用语言列表"""
         return list(self.translations.keys())
@@ -0,0 +1,132 @@
+"""
+图片缓存模块 - 按源图片内容哈希在磁盘上缓存优化/压缩后的图片（不依赖Qt）
+
+键由源文件内容的sha256、输出类型和所有影响结果的编码参数共同决定，同一张截图再次附加
+或在多轮反馈中重复发送时，只需计算一次哈希并读取一个文件，不再重新搜索编码参数。
+每个条目是 <键>.bin（图片字节）和 <键>.json（元数据）。最近使用顺序记录在文件的mtime上
+（命中时刷新），因此常驻宿主和独立UI进程共享同一份LRU；总量超过 IMAGE_CACHE_MAX_BYTES 时
+删除最久未使用的条目。
+"""
+import os
+import json
+import hashlib
+import threading
+from typing import Optional, Tuple
+
+from config import IMAGE_CACHE_DIR_NAME, IMAGE_CACHE_MAX_BYTES, IMAGE_CACHE_ENV
+from file_utils import atomic_write
+from metrics import metrics
+from temp_manager import temp_manager
+
+CACHE_VERSION = 1
+DATA_SUFFIX = ".bin"
+META_SUFFIX = ".json"
+
+
+def is_image_cache_enabled() -> bool:
+    """INTERACTIVE_FEEDBACK_IMAGE_CACHE=0 时禁用磁盘缓存"""
+    return os.environ.get(IMAGE_CACHE_ENV, "1") != "0"
+
+
+def file_content_hash(file_path: str) -> str:
+    """源文件内容的sha256"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImageCache:
+    """内容寻址的磁盘图片缓存，按字节总量LRU淘汰"""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = IMAGE_CACHE_MAX_BYTES):
+        self.directory = directory or os.path.join(temp_manager.temp_dir, IMAGE_CACHE_DIR_NAME)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(content_hash: str, kind: str, params) -> str:
+        """缓存键：内容哈希 + 输出类型 + 编码参数（参数需可JSON序列化）"""
+        material = json.dumps([CACHE_VERSION, content_hash, kind, params], sort_keys=True)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[bytes, dict]]:
+        """读取缓存的图片字节和元数据，不存在或不完整时返回None"""
+        data_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(data_path, "rb") as f:
+                data = f.read()
+            os.utime(data_path)
+        except (OSError, ValueError):
+            metrics.inc("image.cache_misses")
+            return None
+        metrics.inc("image.cache_hits")
+        return data, meta
+
+    def put(self, key: str, data: bytes, meta: dict):
+        """写入一个条目（原子替换），失败时忽略"""
+        if len(data) > self.max_bytes:
+            return
+        data_path, meta_path = self._paths(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # 先写图片再写元数据：读取方以元数据存在作为条目完整的标志
+            atomic_write(data_path, data)
+            atomic_write(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        except OSError:
+            return
+        with self._lock:
+            self._evict()
+
+    def clear(self):
+        """删除所有缓存条目"""
+        with self._lock:
+            for entry in self._entries():
+                self._remove(entry[2])
+
+    def _paths(self, key: str):
+        base = os.path.join(self.directory, key)
+        return base + DATA_SUFFIX, base + META_SUFFIX
+
+    def _entries(self):
+        """[(mtime, 字节数, 键)]，按最近使用时间从旧到新排序"""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(DATA_SUFFIX):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name[:-len(DATA_SUFFIX)]))
+        entries.sort()
+        return entries
+
+    def _remove(self, key: str):
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _evict(self):
+        """删除最久未使用的条目直到总量不超过上限"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+            metrics.inc("image.cache_evictions")
+
+
+# 全局实例
+image_cache = ImageCache()
@@ -1,9 +1,209 @@
 import os
 import io
+import threading
+import weakref
+from collections import OrderedDict
 from PIL import Image
-from typing import Optional
-import mimetypes
-from config import SUPPORTED_IMAGE_FORMATS, MAX_FILE_SIZE, MAX_DIMENSION
+from typing import Optional, Tuple
+from config import (
+    SUPPORTED_IMAGE_FORMATS, MAX_FILE_SIZE, MAX_DIMENSION,
+    IMAGE_SCALE_FACTORS, IMAGE_MIN_WIDTH, IMAGE_MIN_HEIGHT, IMAGE_QUALITY_MIN, IMAGE_QUALITY_MAX,
+    IMAGE_QUALITY_STEP, IMAGE_SIZE_TOLERANCE, IMAGE_PROBE_SIZE, IMAGE_PREDICTION_MARGIN,
+    IMAGE_DECODED_CACHE_BYTES, COMPRESS_QUALITY_MIN, COMPRESS_SCALE_FACTORS,
+)
+from image_cache import image_cache, file_content_hash, is_image_cache_enabled
+from metrics import metrics, timed
+from tracing import traced
+
+
+def to_rgb(img):
+    """转换为RGB模式，透明图片铺白色背景"""
+    if img.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+        return background
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+# 文件头魔数 -> 格式（与 SUPPORTED_IMAGE_FORMATS 的键一致）
+IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'PNG'),
+    (b'\xff\xd8\xff', 'JPEG'),
+    (b'GIF87a', 'GIF'),
+    (b'GIF89a', 'GIF'),
+    (b'BM', 'BMP'),
+)
+
+
+def sniff_image_format(header: bytes) -> Optional[str]:
+    """根据文件头的魔数识别图片格式，无法识别时返回None"""
+    for signature, image_format in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return image_format
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'WEBP'
+    return None
+
+
+class ImagePipeline:
+    """
+    一张图片在验证、信息、压缩、编码各阶段之间共享的处理状态
+    
+    格式由文件头魔数识别，尺寸和模式只解析文件头；像素按需解码且每一级只解码一次，
+    process_image 的结果中带着它，提交时生成附件不再重新打开和解码文件。
+    
+    解码结果是按需构建的多级缩小图（缩小倍数为2的幂），各候选尺寸从最近的一级缩放：
+    JPEG源用 Image.draft 在解码时直接按 1/2、1/4、1/8 缩小，用不到原尺寸时不会完整解码；
+    其他格式从上一级用 Image.reduce(2) 得到下一级。每一级都已转换为RGB。
+    所有管线解码后的像素合计超过 IMAGE_DECODED_CACHE_BYTES 时，最久未使用的先释放（之后需要时重新解码）。
+    """
+    
+    JPEG_DRAFT_FACTORS = (2, 4, 8)
+    
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.file_size = os.path.getsize(file_path)
+        with open(file_path, 'rb') as f:
+            self.format = sniff_image_format(f.read(16))
+        self.size = None
+        self.mode = None
+        self._header_error = None
+        try:
+            with Image.open(file_path) as img:  # 只解析文件头
+                self.size = img.size
+                self.mode = img.mode
+                self.format = self.format or img.format
+        except Exception as e:
+            self._header_error = e
+        self._levels = {}  # 缩小倍数 -> RGB图片
+        self._lock = threading.Lock()
+        self._content_hash = None
+    
+    @property
+    def content_hash(self) -> str:
+        """源文件内容的sha256（首次使用时计算，作为优化结果缓存的键）"""
+        if self._content_hash is None:
+            self._content_hash = file_content_hash(self.file_path)
+        return self._content_hash
+    
+    @property
+    def is_supported(self) -> bool:
+        return self.format in SUPPORTED_IMAGE_FORMATS
+    
+    @property
+    def info(self) -> Optional[dict]:
+        """图片信息，文件头无法解析时为None"""
+        if self.size is None:
+            return None
+        return {
+            'format': self.format,
+            'size': self.size,
+            'mode': self.mode,
+            'file_size': self.file_size
+        }
+    
+    @property
+    def decoded_bytes(self) -> int:
+        """已解码的各级像素占用的内存"""
+        return sum(image.size[0] * image.size[1] * 3 for image in list(self._levels.values()))
+    
+    def release(self):
+        """释放解码后的像素"""
+        with self._lock:
+            self._levels.clear()
+    
+    def require_header(self):
+        """文件头无法解析时抛出当时的异常"""
+        if self.size is None:
+            raise self._header_error
+    
+    def level(self, factor: int):
+        """缩小 factor 倍的一级（factor 为2的幂）"""
+        self.require_header()
+        with self._lock:
+            image = self._decode_level(factor)
+        _decoded_pipelines.touch(self)
+        return image
+    
+    def _decode_level(self, factor: int):
+        image = self._levels.get(factor)
+        if image is None:
+            larger = [decoded for decoded in self._levels if decoded < factor]
+            if larger:
+                # 已经解码过更大的一级，直接从它缩小
+                base = max(larger)
+                image = self._levels[base].reduce(factor // base)
+            elif factor == 1 or (self.format == 'JPEG' and factor in self.JPEG_DRAFT_FACTORS):
+                with Image.open(self.file_path) as source:
+                    if factor > 1:
+                        source.draft('RGB', (-(-self.size[0] // factor), -(-self.size[1] // factor)))
+                    image = to_rgb(source)
+                    image.load()
+                metrics.inc("image.decodes")
+            else:
+                image = self._decode_level(factor // 2).reduce(2)
+            self._levels[factor] = image
+        return image
+    
+    def _factor_for(self, size) -> int:
+        """不小于目标尺寸的最小一级的缩小倍数"""
+        factor = 1
+        while self.size[0] // (factor * 2) >= size[0] and self.size[1] // (factor * 2) >= size[1]:
+            factor *= 2
+        return factor
+    
+    def resize(self, size):
+        """缩放到指定尺寸（从最近的一级用LANCZOS缩放）"""
+        base = self.level(self._factor_for(size))
+        if base.size == tuple(size):
+            return base
+        return base.resize(size, Image.Resampling.LANCZOS)
+    
+    def probe(self, max_side: int):
+        """长边不超过 max_side 的最大一级（用于预测编码大小）"""
+        factor = 1
+        while max(self.size) // factor > max_side:
+            factor *= 2
+        return self.level(factor)
+
+
+class _DecodedPipelines:
+    """按最近使用顺序跟踪持有解码像素的管线（弱引用），合计超出预算时释放最久未用的"""
+    
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._pipelines = OrderedDict()  # id -> weakref
+        self._lock = threading.Lock()
+    
+    def touch(self, pipeline: ImagePipeline):
+        with self._lock:
+            key = id(pipeline)
+            self._pipelines.pop(key, None)
+            self._pipelines[key] = weakref.ref(pipeline)
+            
+            live = []
+            for key, ref in list(self._pipelines.items()):
+                item = ref()
+                if item is None:
+                    del self._pipelines[key]
+                else:
+                    live.append((key, item))
+            
+            total = sum(item.decoded_bytes for _, item in live)
+            for key, item in live[:-1]:
+                if total <= self.budget_bytes:
+                    break
+                total -= item.decoded_bytes
+                item.release()
+                del self._pipelines[key]
+
+
+_decoded_pipelines = _DecodedPipelines(IMAGE_DECODED_CACHE_BYTES)
+
 
 class ImageHandler:
     """图片处理类，支持压缩、格式验证、Base64编码等功能"""
@@ -17,178 +217,294 @@ class ImageHandler:
         pass
     
     def validate_image_format(self, file_path: str) -> bool:
-        """验证图片格式是否支持"""
+        """验证图片格式是否支持（按文件头魔数识别）"""
         try:
-            mime_type, _ = mimetypes.guess_type(file_path)
-            return mime_type in self.SUPPORTED_FORMATS.values()
+            return ImagePipeline(file_path).is_supported
         except Exception:
             return False
     
     def get_image_info(self, file_path: str) -> Optional[dict]:
         """获取图片信息"""
         try:
-            with Image.open(file_path) as img:
-                return {
-                    'format': img.format,
-                    'size': img.size,
-                    'mode': img.mode,
-                    'file_size': os.path.getsize(file_path)
-                }
+            return ImagePipeline(file_path).info
         except Exception:
             return None
     
-    def compress_image(self, file_path: str, max_size: int = MAX_FILE_SIZE) -> Optional[str]:
-        """压缩图片到指定大小以下"""
+    def compress_image(self, file_path: str, max_size: int = MAX_FILE_SIZE,
+                       pipeline: Optional[ImagePipeline] = None) -> Optional[str]:
+        """压缩图片到指定大小以下（传入pipeline时复用其解码结果）"""
         try:
-            with Image.open(file_path) as img:
-                # 转换为RGB模式（如果需要）
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    # 为透明图片创建白色背景
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                    img = background
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # 计算压缩后的尺寸
-                width, height = img.size
-                if width > self.MAX_DIMENSION or height > self.MAX_DIMENSION:
-                    ratio = min(self.MAX_DIMENSION / width, self.MAX_DIMENSION / height)
-                    new_width = int(width * ratio)
-                    new_height = int(height * ratio)
-                    img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                
-                # 尝试不同的压缩质量
-                for quality in [85, 75, 65, 55, 45, 35, 25]:
-                    output = io.BytesIO()
-                    img.save(output, format='JPEG', quality=quality, optimize=True)
-                    
-                    if output.tell() <= max_size:
-                        # 保存压缩后的图片
-                        compressed_path = file_path.replace('.', '_compressed.')
-                        if not compressed_path.endswith(('.jpg', '.jpeg')):
-                            compressed_path = os.path.splitext(compressed_path)[0] + '_compressed.jpg'
-                        
-                        with open(compressed_path, 'wb') as f:
-                            f.write(output.getvalue())
-                        
-                        return compressed_path
+            pipeline = pipeline or ImagePipeline(file_path)
+            pipeline.require_header()
+            # 计算压缩后的尺寸（JPEG源只按需要的尺寸解码）
+            width, height = pipeline.size
+            if width > self.MAX_DIMENSION or height > self.MAX_DIMENSION:
+                ratio = min(self.MAX_DIMENSION / width, self.MAX_DIMENSION / height)
+                width = int(width * ratio)
+                height = int(height * ratio)
+            
+            cache_key = self._cache_key(
+                pipeline, 'compressed', max_size, self.MAX_DIMENSION, COMPRESS_QUALITY_MIN, IMAGE_QUALITY_MAX,
+                IMAGE_QUALITY_STEP, IMAGE_SIZE_TOLERANCE, COMPRESS_SCALE_FACTORS
+            )
+            cached = image_cache.get(cache_key) if cache_key else None
+            if cached:
+                data = cached[0]
+            else:
+                img = pipeline.resize((width, height))
                 
-                # 如果仍然太大，进一步减小尺寸
-                for scale in [0.8, 0.6, 0.4, 0.2]:
-                    new_width = int(img.size[0] * scale)
-                    new_height = int(img.size[1] * scale)
-                    resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                    
-                    output = io.BytesIO()
-                    resized_img.save(output, format='JPEG', quality=25, optimize=True)
-                    
-                    if output.tell() <= max_size:
-                        compressed_path = file_path.replace('.', '_compressed.')
-                        if not compressed_path.endswith(('.jpg', '.jpeg')):
-                            compressed_path = os.path.splitext(compressed_path)[0] + '_compressed.jpg'
-                        
-                        with open(compressed_path, 'wb') as f:
-                            f.write(output.getvalue())
-                        
-                        return compressed_path
+                # 查找放得下的最高质量
+                found, encodes = self._search_quality(img, max_size, COMPRESS_QUALITY_MIN, IMAGE_QUALITY_MAX)
                 
-                return None  # 无法压缩到目标大小
+                # 如果仍然太大，进一步减小尺寸（最低质量）
+                if not found:
+                    for scale in COMPRESS_SCALE_FACTORS:
+                        resized_img = pipeline.resize((int(width * scale), int(height * scale)))
+                        found, count = self._search_quality(resized_img, max_size, COMPRESS_QUALITY_MIN, COMPRESS_QUALITY_MIN)
+                        encodes += count
+                        if found:
+                            break
+                metrics.inc("image.jpeg_encodes", encodes)
                 
+                if not found:
+                    return None  # 无法压缩到目标大小
+                data = found[1]
+                if cache_key:
+                    image_cache.put(cache_key, data, {'max_size': max_size})
+            
+            # 保存压缩后的图片
+            compressed_path = file_path.replace('.', '_compressed.')
+            if not compressed_path.endswith(('.jpg', '.jpeg')):
+                compressed_path = os.path.splitext(compressed_path)[0] + '_compressed.jpg'
+            
+            with open(compressed_path, 'wb') as f:
+                f.write(data)
+            
+            return compressed_path
+            
         except Exception as e:
             # 使用更优雅的错误处理：返回None并让调用者处理错误
             # 避免在生产环境中直接输出到控制台
             return None
     
-    def get_optimized_base64(self, file_path: str, target_size_kb: int = 50) -> Optional[dict]:
+    def _cache_key(self, pipeline: ImagePipeline, kind: str, *params) -> Optional[str]:
+        """优化结果的磁盘缓存键（源文件内容哈希 + 输出类型 + 影响结果的编码参数），禁用缓存时为None"""
+        if not is_image_cache_enabled():
+            return None
+        return image_cache.make_key(pipeline.content_hash, kind, params)
+    
+    def _encode_jpeg(self, img, quality: int) -> bytes:
+        """以指定质量编码为JPEG"""
+        output = io.BytesIO()
+        img.save(output, format='JPEG', quality=quality, optimize=True)
+        return output.getvalue()
+    
+    def _search_quality(self, img, max_bytes: int, min_quality: int, max_quality: int,
+                        min_data: Optional[bytes] = None) -> Tuple[Optional[Tuple[int, bytes]], int]:
+        """
+        查找不超过max_bytes的最高JPEG质量
+        
+        先试最低质量，放不下时直接放弃这个尺寸；放得下再在剩余质量上二分查找，
+        结果达到 IMAGE_SIZE_TOLERANCE 比例的目标大小时提前结束。
+        每个尺寸最多编码 1 + ceil(log2(质量档数)) 次。
+        
+        Args:
+            min_data: 已有的最低质量编码结果（传入时不再重复编码）
+        
+        Returns:
+            ((质量, JPEG数据) 或 None, 编码次数)
+        """
+        encodes = 0
+        data = min_data
+        if data is None:
+            data = self._encode_jpeg(img, min_quality)
+            encodes += 1
+        if len(data) > max_bytes:
+            return None, encodes
+        
+        best = (min_quality, data)
+        qualities = list(range(min_quality + IMAGE_QUALITY_STEP, max_quality + 1, IMAGE_QUALITY_STEP))
+        low, high = 0, len(qualities) - 1
+        while low <= high and len(best[1]) < max_bytes * IMAGE_SIZE_TOLERANCE:
+            mid = (low + high) // 2
+            data = self._encode_jpeg(img, qualities[mid])
+            encodes += 1
+            if len(data) <= max_bytes:
+                best = (qualities[mid], data)
+                low = mid + 1
+            else:
+                high = mid - 1
+        return best, encodes
+    
+    def _predict_scale_index(self, pipeline, scales, max_bytes: int) -> int:
+        """
+        用一次探针编码预测最低质量下放得下的最大缩放比例
+        
+        取金字塔中长边不超过 IMAGE_PROBE_SIZE 的一级作为探针，以最低质量编码，
+        按每像素字节数估算各比例的编码大小。截图缩小后细节密度变化不大，
+        估算通常与实际相差不超过一档，由 _locate_scale 在附近修正。
+        """
+        width, height = pipeline.size
+        probe = pipeline.probe(IMAGE_PROBE_SIZE)
+        bytes_per_pixel = len(self._encode_jpeg(probe, IMAGE_QUALITY_MIN)) / (probe.size[0] * probe.size[1])
+        
+        for index, scale in enumerate(scales):
+            if bytes_per_pixel * width * height * scale * scale <= max_bytes:
+                return index
+        return len(scales) - 1
+    
+    def _locate_scale(self, pipeline, scales, start: int, max_bytes: int):
+        """
+        从预测位置开始，局部查找最低质量下放得下的最大缩放比例
+        
+        每次编码后按实测大小与面积成正比外推相邻比例的大小：放得下时只有外推结果在
+        IMAGE_PREDICTION_MARGIN 以内才去验证更大一档；放不下时直接跳到外推放得下的比例。
+        
+        Returns:
+            ((缩放比例, 缩放后的图片, 最低质量编码数据) 或 None, 编码次数)
+        """
+        def encode_at(index):
+            scale = scales[index]
+            resized = pipeline.resize((int(pipeline.size[0] * scale), int(pipeline.size[1] * scale)))
+            return scale, resized, self._encode_jpeg(resized, IMAGE_QUALITY_MIN)
+        
+        def estimate(size, index, other):
+            return size * (scales[other] / scales[index]) ** 2
+        
+        found = None
+        ceiling = -1  # 已确认放不下的最小比例的位置
+        index = start
+        encodes = 0
+        while True:
+            attempt = encode_at(index)
+            encodes += 1
+            size = len(attempt[2])
+            if size <= max_bytes:
+                found = attempt
+                if index - 1 <= ceiling or estimate(size, index, index - 1) > max_bytes * IMAGE_PREDICTION_MARGIN:
+                    break
+                index -= 1
+            else:
+                if found or index == len(scales) - 1:
+                    break
+                ceiling = index
+                index = next(
+                    (other for other in range(index + 1, len(scales)) if estimate(size, index, other) <= max_bytes),
+                    len(scales) - 1
+                )
+        return found, encodes
+    
+    @traced("ImageHandler.get_optimized_base64")
+    def get_optimized_base64(self, file_path: str, target_size_kb: int = 50,
+                             pipeline: Optional[ImagePipeline] = None) -> Optional[dict]:
         """
         生成优化的base64数据，平衡文件大小和视觉质量
         
         Args:
             file_path: 图片文件路径
             target_size_kb: 目标文件大小（KB），默认50KB
+            pipeline: process_image 返回的处理管线（复用其解码结果）
         
         Returns:
             包含优化base64数据的字典
         """
+        import base64
+
+        result = self.get_optimized_image(file_path, target_size_kb, pipeline)
+        if result.get('success'):
+            result = dict(result)
+            data = result.pop('data')
+            result['base64'] = f"data:{result.pop('mime_type')};base64,{base64.b64encode(data).decode('utf-8')}"
+        return result
+
+    @timed("image.optimize_ms")
+    @traced("ImageHandler.get_optimized_image")
+    def get_optimized_image(self, file_path: str, target_size_kb: int = 50,
+                            pipeline: Optional[ImagePipeline] = None) -> dict:
+        """
+        生成优化后的图片字节数据，平衡文件大小和视觉质量
+        
+        Args:
+            file_path: 图片文件路径
+            target_size_kb: 目标文件大小（KB），默认50KB
+            pipeline: process_image 返回的处理管线（复用其解码结果）
+        
+        Returns:
+            包含优化后图片字节（data）、MIME类型和优化信息的字典
+        """
         try:
-            import base64
+            pipeline = pipeline or ImagePipeline(file_path)
+            pipeline.require_header()
+            original_size = pipeline.size
+            target_size_bytes = target_size_kb * 1024
             
-            with Image.open(file_path) as img:
-                # 转换为RGB模式
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                    img = background
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                original_size = img.size
-                target_size_bytes = target_size_kb * 1024
-                
-                # 智能缩放策略
-                scale_factors = [1.0, 0.8, 0.6, 0.5, 0.4, 0.3, 0.25, 0.2]
-                quality_levels = [85, 75, 65, 55, 45, 35, 25, 15]
-                
-                best_result = None
+            # 同一内容、目标大小和编码参数的结果直接从磁盘缓存读取
+            cache_key = self._cache_key(
+                pipeline, 'optimized', target_size_bytes, IMAGE_SCALE_FACTORS, IMAGE_MIN_WIDTH, IMAGE_MIN_HEIGHT,
+                IMAGE_QUALITY_MIN, IMAGE_QUALITY_MAX, IMAGE_QUALITY_STEP, IMAGE_SIZE_TOLERANCE,
+                IMAGE_PROBE_SIZE, IMAGE_PREDICTION_MARGIN
+            )
+            cached = image_cache.get(cache_key) if cache_key else None
+            if cached:
+                data, meta = cached
+                return dict(
+                    meta, data=data, encodes=0, cached=True,
+                    original_size=tuple(meta['original_size']), optimized_size=tuple(meta['optimized_size'])
+                )
+            
+            # 智能缩放策略：找到最低质量下放得下的最大尺寸，再取该尺寸下放得下的最高质量
+            # 缩放比例先由探针编码预测，只在预测位置附近缩放和编码
+            best_result = None
+            scales = [
+                scale for scale in IMAGE_SCALE_FACTORS
+                if int(original_size[0] * scale) >= IMAGE_MIN_WIDTH and int(original_size[1] * scale) >= IMAGE_MIN_HEIGHT
+            ]
+            
+            if scales:
+                start = self._predict_scale_index(pipeline, scales, target_size_bytes)
+                located, encodes = self._locate_scale(pipeline, scales, start, target_size_bytes)
+                encodes += 1  # 探针
                 
-                for scale in scale_factors:
-                    # 计算新尺寸
-                    new_width = int(original_size[0] * scale)
-                    new_height = int(original_size[1] * scale)
-                    
-                    # 确保最小尺寸
-                    if new_width < 200 or new_height < 150:
-                        continue
-                    
-                    resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                if located:
+                    scale, resized_img, min_data = located
+                    (quality, data), count = self._search_quality(
+                        resized_img, target_size_bytes, IMAGE_QUALITY_MIN, IMAGE_QUALITY_MAX, min_data
+                    )
+                    encodes += count
+                    file_size_bytes = len(data)
+                    original_file_size = pipeline.file_size
                     
-                    for quality in quality_levels:
-                        output = io.BytesIO()
-                        resized_img.save(output, format='JPEG', quality=quality, optimize=True)
-                        
-                        if output.tell() <= target_size_bytes:
-                            # 保存文件大小（在seek之前）
-                            file_size_bytes = output.tell()
-                            original_file_size = os.path.getsize(file_path)
-                            
-                            # 生成base64
-                            output.seek(0)
-                            base64_data = base64.b64encode(output.getvalue()).decode('utf-8')
-                            
-                            best_result = {
-                                'success': True,
-                                'base64': f"data:image/jpeg;base64,{base64_data}",
-                                'original_size': original_size,
-                                'optimized_size': (new_width, new_height),
-                                'file_size_bytes': file_size_bytes,
-                                'file_size_kb': round(file_size_bytes / 1024, 2),
-                                'compression_ratio': round(file_size_bytes / original_file_size, 3) if original_file_size > 0 else 0,
-                                'scale_factor': scale,
-                                'quality': quality,
-                                'original_file_size_kb': round(original_file_size / 1024, 2)
-                            }
-                            break
-                    
-                    if best_result:
-                        break
-                
-                if not best_result:
-                    return {
-                        'success': False,
-                        'error': f'无法将图片压缩到{target_size_kb}KB以下'
+                    best_result = {
+                        'success': True,
+                        'data': data,
+                        'mime_type': 'image/jpeg',
+                        'original_size': original_size,
+                        'optimized_size': resized_img.size,
+                        'file_size_bytes': file_size_bytes,
+                        'file_size_kb': round(file_size_bytes / 1024, 2),
+                        'compression_ratio': round(file_size_bytes / original_file_size, 3) if original_file_size > 0 else 0,
+                        'scale_factor': scale,
+                        'quality': quality,
+                        'original_file_size_kb': round(original_file_size / 1024, 2),
+                        'encodes': encodes
                     }
+                    if cache_key:
+                        image_cache.put(cache_key, data, {key: value for key, value in best_result.items() if key != 'data'})
                 
-                return best_result
-                
+                metrics.inc("image.jpeg_encodes", encodes)
+            
+            if not best_result:
+                return {
+                    'success': False,
+                    'error': f'无法将图片压缩到{target_size_kb}KB以下'
+                }
+            
+            return best_result
+            
         except Exception as e:
             return {
                 'success': False,
-                'error': f'生成优化base64时出错: {str(e)}'
+                'error': f'生成优化图片时出错: {str(e)}'
             }
 
     def get_smart_base64(self, file_path: str, use_case: str = 'general') -> Optional[dict]:
@@ -233,18 +549,21 @@ class ImageHandler:
         config = configs.get(use_case, configs['general'])
         return self.get_optimized_base64(file_path, config['target_size_kb'])
     
+    @timed("image.process_ms")
     def process_image(self, file_path: str) -> Optional[dict]:
-        """处理图片：验证、压缩、编码，同时保留路径信息"""
+        """处理图片：验证、压缩、编码，同时保留路径信息（结果中的pipeline供提交时复用）"""
         try:
+            pipeline = ImagePipeline(file_path)
+            
             # 验证格式
-            if not self.validate_image_format(file_path):
+            if not pipeline.is_supported:
                 return {
                     'success': False,
                     'error': '不支持的图片格式'
                 }
             
             # 获取图片信息
-            info = self.get_image_info(file_path)
+            info = pipeline.info
             if not info:
                 return {
                     'success': False,
@@ -255,7 +574,7 @@ class ImageHandler:
             processed_path = file_path
             if info['file_size'] > self.MAX_FILE_SIZE:
                 # 需要压缩
-                compressed_path = self.compress_image(file_path)
+                compressed_path = self.compress_image(file_path, pipeline=pipeline)
                 if not compressed_path:
                     return {
                         'success': False,
@@ -268,7 +587,8 @@ class ImageHandler:
                 'success': True,
                 'original_info': info,
                 'original_path': os.path.abspath(file_path),
-                'processed_path': os.path.abspath(processed_path)
+                'processed_path': os.path.abspath(processed_path),
+                'pipeline': pipeline
             }
             
             # 如果是压缩后的文件，不立即删除，让调用方决定何时清理
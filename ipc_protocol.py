@@ -0,0 +1,171 @@
+"""
+进程间通信协议模块 - 服务端与UI进程之间的分帧协议（不依赖Qt）
+
+帧格式：4字节大端序头部长度 + UTF-8 JSON头部 + 载荷
+  头部必须包含 "type"，可选 "id"（请求ID）和 "size"（载荷字节数，默认0）。
+
+一次反馈结果按顺序拆分为多帧发送，接收方无需等待子进程退出即可开始处理：
+  logs（可多帧） -> text -> answers（可选，JSON） -> attachment（每个附件一帧） -> end
+"""
+import json
+import struct
+from typing import Iterator, Optional, Tuple
+
+# 帧类型
+FRAME_READY = "ready"
+FRAME_FEEDBACK = "feedback"
+FRAME_CANCEL = "cancel"
+FRAME_LOGS = "logs"
+FRAME_TEXT = "text"
+FRAME_ANSWERS = "answers"
+FRAME_ATTACHMENT = "attachment"
+FRAME_END = "end"
+FRAME_ERROR = "error"
+FRAME_METRICS = "metrics"  # 请求/返回UI进程的指标快照（载荷为JSON）
+
+_HEADER_LENGTH = struct.Struct(">I")
+MAX_HEADER_SIZE = 1024 * 1024  # 头部最大1MB，超出视为协议错误
+LOG_CHUNK_SIZE = 64 * 1024  # 日志分块大小
+
+
+class ProtocolError(Exception):
+    """协议数据损坏"""
+
+
+def encode_frame(header: dict, payload: bytes = b"") -> bytes:
+    """编码一帧数据"""
+    header = dict(header)
+    header["size"] = len(payload)
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    return _HEADER_LENGTH.pack(len(header_bytes)) + header_bytes + payload
+
+
+def write_frame(stream, header: dict, payload: bytes = b""):
+    """向二进制流写入一帧并立即刷新"""
+    stream.write(encode_frame(header, payload))
+    stream.flush()
+
+
+def _decode_header(header_bytes: bytes) -> dict:
+    """解析帧头部"""
+    try:
+        header = json.loads(header_bytes.decode("utf-8"))
+    except ValueError as e:
+        raise ProtocolError(f"无效的帧头部: {e}")
+    if not isinstance(header, dict) or "type" not in header:
+        raise ProtocolError("帧头部缺少type字段")
+    return header
+
+
+def _read_exact(stream, size: int) -> Optional[bytes]:
+    """从阻塞流中读取指定字节数，流结束时返回None"""
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_frame(stream) -> Optional[Tuple[dict, bytes]]:
+    """从阻塞二进制流读取一帧，流结束时返回None"""
+    length_bytes = _read_exact(stream, _HEADER_LENGTH.size)
+    if length_bytes is None:
+        return None
+    (header_length,) = _HEADER_LENGTH.unpack(length_bytes)
+    if header_length > MAX_HEADER_SIZE:
+        raise ProtocolError(f"帧头部过大: {header_length}")
+
+    header_bytes = _read_exact(stream, header_length)
+    if header_bytes is None:
+        return None
+    header = _decode_header(header_bytes)
+
+    payload = _read_exact(stream, int(header.get("size", 0))) if header.get("size") else b""
+    if payload is None:
+        return None
+    return header, payload
+
+
+async def read_frame_async(reader) -> Optional[Tuple[dict, bytes]]:
+    """从asyncio.StreamReader读取一帧，流结束时返回None"""
+    import asyncio
+
+    try:
+        length_bytes = await reader.readexactly(_HEADER_LENGTH.size)
+        (header_length,) = _HEADER_LENGTH.unpack(length_bytes)
+        if header_length > MAX_HEADER_SIZE:
+            raise ProtocolError(f"帧头部过大: {header_length}")
+        header = _decode_header(await reader.readexactly(header_length))
+        size = int(header.get("size", 0))
+        payload = await reader.readexactly(size) if size else b""
+    except asyncio.IncompleteReadError:
+        return None
+    return header, payload
+
+
+def iter_result_frames(request_id, result: dict) -> Iterator[Tuple[dict, bytes]]:
+    """将一次反馈结果拆分为帧序列"""
+    logs = result.get("logs", "").encode("utf-8")
+    for start in range(0, len(logs), LOG_CHUNK_SIZE):
+        yield {"type": FRAME_LOGS, "id": request_id}, logs[start:start + LOG_CHUNK_SIZE]
+
+    yield {"type": FRAME_TEXT, "id": request_id}, result.get("interactive_feedback", "").encode("utf-8")
+
+    if "answers" in result:
+        yield {"type": FRAME_ANSWERS, "id": request_id}, json.dumps(result["answers"], ensure_ascii=False).encode("utf-8")
+
+    for attachment in result.get("attachments", []):
+        meta = {key: value for key, value in attachment.items() if key != "data"}
+        yield {"type": FRAME_ATTACHMENT, "id": request_id, "meta": meta}, attachment.get("data", b"")
+
+    yield {"type": FRAME_END, "id": request_id}, b""
+
+
+def write_result_frames(stream, request_id, result: dict):
+    """将一次反馈结果以帧序列写入流"""
+    for header, payload in iter_result_frames(request_id, result):
+        stream.write(encode_frame(header, payload))
+    stream.flush()
+
+
+class ResultAssembler:
+    """结果组装器 - 将接收到的帧还原为反馈结果"""
+
+    def __init__(self):
+        self._log_chunks = []
+        self._text = ""
+        self._answers = None
+        self._attachments = []
+
+    def feed(self, header: dict, payload: bytes) -> bool:
+        """处理一帧数据，收到结束帧时返回True"""
+        frame_type = header.get("type")
+        if frame_type == FRAME_LOGS:
+            self._log_chunks.append(payload)
+        elif frame_type == FRAME_TEXT:
+            self._text = payload.decode("utf-8")
+        elif frame_type == FRAME_ANSWERS:
+            self._answers = json.loads(payload.decode("utf-8"))
+        elif frame_type == FRAME_ATTACHMENT:
+            attachment = dict(header.get("meta", {}))
+            attachment["data"] = payload
+            self._attachments.append(attachment)
+        elif frame_type == FRAME_END:
+            return True
+        return False
+
+    def result(self) -> dict:
+        """获取组装完成的结果"""
+        result = {
+            "logs": b"".join(self._log_chunks).decode("utf-8"),
+            "interactive_feedback": self._text,
+        }
+        if self._answers is not None:
+            result["answers"] = self._answers
+        if self._attachments:
+            result["attachments"] = self._attachments
+        return result
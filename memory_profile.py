@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+长会话内存剖析工具
+在 QT_QPA_PLATFORM=offscreen 下模拟一次长时间的反馈会话，用 tracemalloc 按子系统统计Python堆的
+峰值和留存内存，并与 config.MEMORY_BUDGETS_KB 中的预算比较，超出预算时返回非0退出码。
+
+子系统（按顺序执行，每个阶段的留存 = 阶段结束并回收垃圾后相对阶段开始的增量）：
+  logs             追加大量日志行（log_buffer + 日志文本框）
+  images           粘贴多张截图（uploaded_images + 预览缩略图）
+  attachments      以Base64传输模式生成优化后的图片附件
+  quick_responses  反复编辑快捷按钮配置（按钮重建 + 布局缓存）
+  reset            reset_for_prompt 之后相对会话开始仍留存的内存（常驻宿主复用窗口时的泄漏）
+
+tracemalloc 只统计Python分配；Qt在C++侧的分配（QPixmap、文本文档等）只体现在RSS变化中。
+"""
+
+import os
+import gc
+import sys
+import tempfile
+import tracemalloc
+from config import MEMORY_BUDGETS_KB, MEMORY_PEAK_BUDGET_KB, IMAGE_CACHE_ENV
+
+PHASES = ["logs", "images", "attachments", "quick_responses", "reset"]
+
+
+def make_screenshots(count, width, height, directory):
+    """生成模拟截图（带文字和色块的PNG，压缩率接近真实截图）"""
+    from PIL import Image, ImageDraw
+
+    paths = []
+    for index in range(count):
+        image = Image.new("RGB", (width, height), (30 + index % 50, 30, 40))
+        draw = ImageDraw.Draw(image)
+        for row in range(0, height, 18):
+            draw.text((10 + (row * 7 + index * 13) % 200, row), f"line {row} of screenshot {index} " * 6, fill=(220, 220, 220))
+        for block in range(12):
+            x = (block * 157 + index * 31) % max(1, width - 200)
+            y = (block * 89 + index * 17) % max(1, height - 120)
+            draw.rectangle([x, y, x + 200, y + 120], fill=((block * 40) % 256, (index * 20) % 256, 120))
+        path = os.path.join(directory, f"screenshot_{index:03d}.png")
+        image.save(path, "PNG")
+        paths.append(path)
+    return paths
+
+
+class MemoryProfiler:
+    """按阶段测量：tracemalloc 峰值/留存、分配最多的代码位置、进程RSS变化"""
+
+    def __init__(self, app, top):
+        import psutil
+
+        self.app = app
+        self.top = top
+        self.process = psutil.Process()
+        self.results = {}
+        self.max_traced = 0  # 各阶段中Python堆的最高占用（字节）
+
+    def settle(self):
+        """处理挂起的事件和延迟删除，再回收垃圾"""
+        from PySide6.QtCore import QCoreApplication, QEvent
+
+        for _ in range(3):
+            self.app.processEvents()
+            QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        gc.collect()
+
+    def measure(self, name, action, baseline=None):
+        """执行一个阶段；baseline 为留存的起点（默认是阶段开始时的内存）"""
+        self.settle()
+        before_snapshot = tracemalloc.take_snapshot() if self.top else None
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        start_rss = self.process.memory_info().rss
+        tracemalloc.reset_peak()
+
+        holder = action()
+
+        self.settle()
+        current, peak = tracemalloc.get_traced_memory()
+        self.max_traced = max(self.max_traced, peak)
+        origin = start_bytes if baseline is None else baseline
+        result = {
+            "retained_kb": (current - origin) / 1024,
+            "peak_kb": (peak - start_bytes) / 1024,
+            "rss_kb": (self.process.memory_info().rss - start_rss) / 1024,
+            "top": [],
+        }
+        if before_snapshot is not None:
+            exclude = [tracemalloc.Filter(False, tracemalloc.__file__)]
+            after_snapshot = tracemalloc.take_snapshot().filter_traces(exclude)
+            stats = after_snapshot.compare_to(before_snapshot.filter_traces(exclude), "lineno")
+            result["top"] = [
+                (str(stat.traceback[0]), stat.size_diff / 1024)
+                for stat in stats[:self.top] if stat.size_diff > 0
+            ]
+        self.results[name] = result
+        return holder
+
+
+def run_session(log_lines, image_count, image_size, edits, top):
+    """运行模拟会话并返回各子系统的测量结果"""
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QSettings
+    from feedback_ui import FeedbackUI
+    from config_store import JsonConfigBackend, get_project_settings_group
+    from image_handler import ImageHandler
+
+    app = QApplication.instance() or QApplication()
+    project_directory = os.path.join(tempfile.gettempdir(), "interactive_feedback_memory_profile")
+    image_directory = os.path.join(project_directory, "screenshots")
+    os.makedirs(image_directory, exist_ok=True)
+    width, height = image_size
+    screenshots = make_screenshots(image_count, width, height, image_directory)
+
+    # 每次从默认配置开始，保证结果可比较
+    group = get_project_settings_group(project_directory)
+    JsonConfigBackend().remove_group(group)
+    settings = QSettings("InteractiveFeedbackMCP", "InteractiveFeedbackMCP")
+    settings.remove(group)
+    settings.sync()
+
+    # 预热：首次处理图片时的模块导入和缓存（PIL插件、mimetypes）属于一次性开销，不计入会话
+    if screenshots:
+        handler = ImageHandler()
+        handler.process_image(screenshots[0])
+        handler.get_optimized_base64(screenshots[0])
+
+    tracemalloc.start(25)
+    ui = FeedbackUI(project_directory, "memory profile")
+    ui.show()
+    profiler = MemoryProfiler(app, top)
+    profiler.settle()
+    session_start = tracemalloc.get_traced_memory()[0]
+
+    def append_logs():
+        for index in range(log_lines):
+            ui.event_manager.append_log(f"[{index:05d}] compiling module_{index % 50}.py ... ok ({index * 3 % 997} ms)\n")
+            if index % 200 == 0:
+                app.processEvents()
+
+    def paste_images():
+        handler = ImageHandler()
+        for path in screenshots:
+            # 与 ImageProcessingThread 相同的处理，只是在当前线程同步执行
+            ui.clipboard_image_widget.on_image_processed(handler.process_image(path))
+            app.processEvents()
+
+    def build_attachments():
+        ui.config["use_base64_transmission"] = True
+        # 持有结果，模拟提交前附件在内存中的占用
+        return ui.feedback_logic_manager._process_uploaded_images()
+
+    def edit_quick_responses():
+        original = list(ui.quick_responses)
+        for index in range(edits):
+            extra = (f"Option {index}", f"Follow-up option {index}: " + "details " * (index % 8))
+            ui._apply_quick_responses(original + [extra])
+            app.processEvents()
+        ui._apply_quick_responses(original)
+
+    def reset_window():
+        ui.reset_for_prompt("next prompt")
+
+    profiler.measure("logs", append_logs)
+    profiler.measure("images", paste_images)
+    attachments = profiler.measure("attachments", build_attachments)
+    profiler.measure("quick_responses", edit_quick_responses)
+    del attachments
+    profiler.measure("reset", reset_window, baseline=session_start)
+
+    tracemalloc.stop()
+    ui.close()
+    return profiler.results, (profiler.max_traced - session_start) / 1024
+
+
+def print_report(results, session_peak_kb):
+    """打印各子系统的测量结果"""
+    print(f"\n{'子系统':16}{'留存KB':>12}{'峰值KB':>12}{'预算KB':>12}{'RSS变化KB':>12}")
+    for name in PHASES:
+        result = results[name]
+        budget = MEMORY_BUDGETS_KB.get(name)
+        budget_text = f"{budget:12.0f}" if budget is not None else f"{'-':>12}"
+        print(f"{name:18}{result['retained_kb']:12.1f}{result['peak_kb']:12.1f}{budget_text}{result['rss_kb']:12.1f}")
+    print(f"\n会话峰值: {session_peak_kb:.1f}KB（预算 {MEMORY_PEAK_BUDGET_KB}KB）")
+
+    for name in PHASES:
+        if results[name]["top"]:
+            print(f"\n[{name}] 留存最多的分配位置:")
+            for location, size_kb in results[name]["top"]:
+                print(f"  {size_kb:10.1f}KB  {location}")
+
+
+def check_budgets(results, session_peak_kb):
+    """检查预算，返回超出预算的项目列表"""
+    failures = [
+        name for name, budget in MEMORY_BUDGETS_KB.items()
+        if name in results and results[name]["retained_kb"] > budget
+    ]
+    if session_peak_kb > MEMORY_PEAK_BUDGET_KB:
+        failures.append("session_peak")
+    return failures
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Interactive Feedback MCP 长会话内存剖析')
+    parser.add_argument('--log-lines', type=int, default=5000, help='追加的日志行数 (默认: 5000)')
+    parser.add_argument('--images', type=int, default=30, help='粘贴的截图数量 (默认: 30)')
+    parser.add_argument('--image-size', default='1920x1080', help='截图尺寸 (默认: 1920x1080)')
+    parser.add_argument('--edits', type=int, default=50, help='快捷按钮编辑次数 (默认: 50)')
+    parser.add_argument('--top', type=int, default=5, help='每个子系统显示留存最多的分配位置数，0为不统计 (默认: 5)')
+    parser.add_argument('--no-check', action='store_true', help='只输出报告，不检查预算')
+
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # 每次都实际生成附件，不命中上次运行留下的优化图片缓存，保证结果可比较
+    os.environ.setdefault(IMAGE_CACHE_ENV, "0")
+    try:
+        width, height = (int(value) for value in args.image_size.lower().split("x"))
+    except ValueError:
+        parser.error(f"无效的截图尺寸: {args.image_size}")
+
+    results, session_peak_kb = run_session(
+        max(0, args.log_lines), max(0, args.images), (width, height), max(0, args.edits), max(0, args.top)
+    )
+    print_report(results, session_peak_kb)
+
+    if args.no_check:
+        sys.exit(0)
+    failures = check_budgets(results, session_peak_kb)
+    if failures:
+        print(f"\n❌ 超出内存预算: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ 内存预算检查通过")
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
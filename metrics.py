@@ -0,0 +1,160 @@
+"""
+指标模块 - 进程内共享的指标注册表：计数器、仪表和耗时直方图（不依赖Qt）
+
+所有管理器共用全局实例 metrics，快照可导出为JSON文件，或经由MCP资源 feedback://metrics 读取。
+直方图保留最近 METRICS_HISTOGRAM_SIZE 个样本计算 p50/p95/p99，事件（如界面卡顿及其调用栈）
+每类保留最近 METRICS_EVENT_LIMIT 条，内存占用有界。
+"""
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Optional
+
+from config import METRICS_FILE_ENV, METRICS_HISTOGRAM_SIZE, METRICS_EVENT_LIMIT
+from file_utils import atomic_write
+
+
+def percentile(ordered, pct: float) -> float:
+    """对已排序样本取百分位数（线性插值）"""
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class Histogram:
+    """耗时直方图：累计计数/总和/最值，百分位数基于最近的样本窗口"""
+
+    def __init__(self, max_samples: int = METRICS_HISTOGRAM_SIZE):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._samples = deque(maxlen=max_samples)
+
+    def observe(self, value: float):
+        """记录一个样本"""
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self._samples.append(value)
+
+    def snapshot(self) -> dict:
+        """统计快照"""
+        ordered = sorted(self._samples)
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else 0.0,
+            "min": round(self.min or 0.0, 3),
+            "max": round(self.max or 0.0, 3),
+            "p50": round(percentile(ordered, 50), 3),
+            "p95": round(percentile(ordered, 95), 3),
+            "p99": round(percentile(ordered, 99), 3),
+        }
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, float] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._events: Dict[str, deque] = {}
+
+    def inc(self, name: str, value: int = 1):
+        """计数器加值"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        """设置仪表当前值"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value_ms: float):
+        """向直方图记录一个耗时样本（毫秒）"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(value_ms)
+
+    def record_event(self, name: str, data: dict):
+        """记录一条事件（每类只保留最近的若干条）"""
+        with self._lock:
+            events = self._events.get(name)
+            if events is None:
+                events = self._events[name] = deque(maxlen=METRICS_EVENT_LIMIT)
+            events.append(dict(data, timestamp=time.time()))
+
+    @contextmanager
+    def timer(self, name: str):
+        """计时上下文：退出时把耗时记入直方图"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def counter(self, name: str) -> int:
+        """读取计数器"""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> dict:
+        """全部指标的JSON可序列化快照"""
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "timestamp": time.time(),
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "histograms": {name: histogram.snapshot() for name, histogram in self._histograms.items()},
+                "events": {name: list(events) for name, events in self._events.items()},
+            }
+
+    def export_json(self, path: Optional[str] = None) -> Optional[str]:
+        """导出快照到JSON文件（原子替换）；path为空时使用 INTERACTIVE_FEEDBACK_METRICS 指定的路径"""
+        path = path or os.environ.get(METRICS_FILE_ENV)
+        if not path:
+            return None
+        try:
+            atomic_write(path, json.dumps(self.snapshot(), indent=2).encode("utf-8"))
+        except OSError:
+            return None
+        return path
+
+    def reset(self):
+        """清空所有指标"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+            self._events.clear()
+
+
+# 全局实例
+metrics = MetricsRegistry()
+
+
+def timed(name: str):
+    """函数装饰器：把每次调用的耗时（毫秒）记入全局注册表的直方图"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.observe(name, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorator
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能剖析工具
+以 cProfile 剖析反馈会话，结果以 pstats 格式保存到 ~/.interactive_feedback_profiles，并提供汇总热点函数的命令行
+"""
+
+import os
+import sys
+import time
+import cProfile
+from contextlib import contextmanager
+from config import PROFILE_DIR_PATH, PROFILE_ENV
+
+
+def is_profiling_enabled():
+    """是否通过环境变量开启了会话剖析"""
+    return os.environ.get(PROFILE_ENV) == "1"
+
+
+def get_profile_dir():
+    """获取剖析结果目录路径（不存在时创建）"""
+    os.makedirs(PROFILE_DIR_PATH, exist_ok=True)
+    return PROFILE_DIR_PATH
+
+
+def new_profile_path(label="feedback"):
+    """生成新的剖析结果文件路径"""
+    now = time.time()
+    timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now)) + f"_{int(now * 1000) % 1000:03d}"
+    return os.path.join(get_profile_dir(), f"{label}_{timestamp}_{os.getpid()}.pstats")
+
+
+class SessionProfiler:
+    """可跨事件循环启停的cProfile封装（同一线程内同时只能有一个在运行）"""
+
+    def __init__(self, label="feedback"):
+        self.label = label
+        self._profiler = None
+
+    @property
+    def running(self):
+        return self._profiler is not None
+
+    def start(self):
+        """开始剖析"""
+        if self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self):
+        """停止剖析并保存结果，返回文件路径"""
+        if self._profiler is None:
+            return None
+        profiler, self._profiler = self._profiler, None
+        profiler.disable()
+        path = new_profile_path(self.label)
+        profiler.dump_stats(path)
+        print(f"Profile saved: {path}", file=sys.stderr)
+        return path
+
+
+@contextmanager
+def profile_session(label="feedback", enabled=True):
+    """剖析一段代码；enabled为False时不做任何事"""
+    if not enabled:
+        yield
+        return
+    profiler = SessionProfiler(label)
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+
+
+def list_profiles():
+    """按修改时间从新到旧列出剖析结果文件"""
+    if not os.path.exists(PROFILE_DIR_PATH):
+        return []
+    files = [os.path.join(PROFILE_DIR_PATH, f) for f in os.listdir(PROFILE_DIR_PATH) if f.endswith(".pstats")]
+    return sorted(files, key=os.path.getmtime, reverse=True)
+
+
+def summarize_profile(path, top=20, sort="cumulative", stream=None):
+    """打印剖析结果中最热的函数"""
+    import pstats
+
+    stats = pstats.Stats(path, stream=stream or sys.stdout)
+    stats.strip_dirs().sort_stats(sort).print_stats(top)
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Interactive Feedback MCP 会话剖析结果汇总工具')
+    parser.add_argument('file', nargs='?', help='pstats文件路径 (默认: 最新的剖析结果)')
+    parser.add_argument('--top', type=int, default=20, help='显示的函数数量 (默认: 20)')
+    parser.add_argument('--sort', default='cumulative', choices=['cumulative', 'tottime', 'ncalls'], help='排序方式 (默认: cumulative)')
+    parser.add_argument('--list', action='store_true', help='列出所有剖析结果文件')
+
+    args = parser.parse_args()
+
+    profiles = list_profiles()
+    if args.list:
+        print(f"剖析结果目录: {PROFILE_DIR_PATH}")
+        for path in profiles:
+            print(f"  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(os.path.getmtime(path)))}  {os.path.basename(path)}")
+        if not profiles:
+            print("  (空)")
+        return
+
+    path = args.file or (profiles[0] if profiles else None)
+    if not path or not os.path.exists(path):
+        print("没有找到剖析结果文件，请先使用 --profile 或设置环境变量 "
+              f"{PROFILE_ENV}=1 运行反馈界面")
+        sys.exit(1)
+
+    print(f"剖析结果: {path}\n")
+    summarize_profile(path, args.top, args.sort)
+
+
+if __name__ == '__main__':
+    main()
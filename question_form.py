@@ -0,0 +1,86 @@
+"""
+问题表单模块 - 负责在反馈窗口中渲染批量问题并收集答案
+"""
+from functools import partial
+from typing import List
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton
+
+from i18n import i18n
+from ui_config import FeedbackQuestion, QuestionAnswer
+
+
+class QuestionFormWidget(QWidget):
+    """批量问题表单：每个问题一个答案输入框，快捷选项按钮点击后填入答案"""
+
+    def __init__(self, parent=None, translator=None):
+        super().__init__(parent)
+        self.i18n = translator or i18n  # 所属窗口的翻译器
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._rows = []  # (问题文本, 答案输入框)
+        self.setVisible(False)
+
+    def set_questions(self, questions: List[FeedbackQuestion]):
+        """重建表单，没有问题时隐藏"""
+        self._clear()
+        for index, question in enumerate(questions or []):
+            self._add_question_row(index, question)
+        self.setVisible(bool(self._rows))
+
+    def has_questions(self) -> bool:
+        """表单中是否有问题"""
+        return bool(self._rows)
+
+    def answers(self) -> List[QuestionAnswer]:
+        """按问题顺序收集答案"""
+        return [
+            QuestionAnswer(question=question, answer=answer_edit.text().strip())
+            for question, answer_edit in self._rows
+        ]
+
+    def focus_first(self):
+        """聚焦第一个答案输入框"""
+        if self._rows:
+            self._rows[0][1].setFocus()
+
+    def _add_question_row(self, index: int, question: FeedbackQuestion):
+        """添加一个问题：问题标签、可选的快捷选项、答案输入框"""
+        text = question.get("question", "")
+        label = QLabel(f"{index + 1}. {text}")
+        label.setWordWrap(True)
+        self._layout.addWidget(label)
+
+        answer_edit = QLineEdit()
+        answer_edit.setPlaceholderText(self.i18n.t("question_answer_placeholder"))
+        answer_edit.returnPressed.connect(partial(self._focus_next, len(self._rows)))
+
+        choices = question.get("choices") or []
+        if choices:
+            choices_row = QWidget()
+            choices_layout = QHBoxLayout(choices_row)
+            choices_layout.setContentsMargins(0, 0, 0, 0)
+            for choice in choices:
+                button = QPushButton(choice)
+                button.clicked.connect(partial(answer_edit.setText, choice))
+                choices_layout.addWidget(button)
+            choices_layout.addStretch()
+            self._layout.addWidget(choices_row)
+
+        self._layout.addWidget(answer_edit)
+        self._rows.append((text, answer_edit))
+
+    def _focus_next(self, row: int):
+        """回车跳到下一个答案输入框，最后一个时跳到反馈文本框"""
+        if row + 1 < len(self._rows):
+            self._rows[row + 1][1].setFocus()
+        else:
+            self.focusNextChild()
+
+    def _clear(self):
+        """移除所有问题行"""
+        self._rows = []
+        while self._layout.count():
+            item = self._layout.takeAt(0)
+            if item.widget() is not None:
+                item.widget().deleteLater()
@@ -1,12 +1,12 @@
 """
 快捷按钮管理模块 - 负责快捷按钮的创建、布局和管理
 """
-import os
 from functools import partial
 from typing import List, Tuple, Dict, Any
 from PySide6.QtWidgets import QPushButton, QGridLayout, QWidget
 from PySide6.QtCore import QTimer
-from i18n import i18n
+from metrics import metrics
+from rule_catalog import rule_catalog
 
 
 class QuickResponseManager:
@@ -22,41 +22,35 @@ class QuickResponseManager:
         self._is_batch_updating = False  # 批量更新状态标志
         self._pending_layout_update = False  # 待处理的布局更新标志
         
-        # 性能监控
-        self._performance_stats = {
-            "button_rebuilds": 0,
-            "incremental_updates": 0,
-            "cache_hits": 0,
-            "cache_misses": 0,
-            "batch_updates": 0
-        }
+        # 性能监控：与UIPerformanceManager共用同一个指标注册表
+        self.metrics = metrics
         
     def get_default_quick_responses(self, config):
         """获取默认快捷按钮列表（统一配置，确保中英文功能对等）"""
-        current_language = i18n.language
+        current_language = self.parent_ui.i18n.language
         
-        # 提取完整规则
-        mode_rules = self._extract_mode_rules_from_cursor_rule()
+        # 完整规则（规则目录缓存的解析结果）
+        mode_rules = rule_catalog.mode_instructions()
         
         # 统一的按钮配置，两种语言功能完全对等
         buttons = [
             # RIPER-5协议模式按钮（两种语言都有）
-            (i18n.t("riper_research_full"), mode_rules.get("RESEARCH", i18n.t("riper_research_feedback"))),
-            (i18n.t("riper_innovate_full"), mode_rules.get("INNOVATE", i18n.t("riper_innovate_feedback"))),
-            (i18n.t("riper_plan_full"), mode_rules.get("PLAN", i18n.t("riper_plan_feedback"))),
-            (i18n.t("riper_execute_full"), mode_rules.get("EXECUTE", i18n.t("riper_execute_feedback"))),
-            (i18n.t("riper_review_full"), mode_rules.get("REVIEW", i18n.t("riper_review_feedback"))),
+            (self.parent_ui.i18n.t("riper_research_full"), mode_rules.get("RESEARCH", self.parent_ui.i18n.t("riper_research_feedback"))),
+            (self.parent_ui.i18n.t("riper_innovate_full"), mode_rules.get("INNOVATE", self.parent_ui.i18n.t("riper_innovate_feedback"))),
+            (self.parent_ui.i18n.t("riper_plan_full"), mode_rules.get("PLAN", self.parent_ui.i18n.t("riper_plan_feedback"))),
+            (self.parent_ui.i18n.t("riper_execute_full"), mode_rules.get("EXECUTE", self.parent_ui.i18n.t("riper_execute_feedback"))),
+            (self.parent_ui.i18n.t("riper_review_full"), mode_rules.get("REVIEW", self.parent_ui.i18n.t("riper_review_feedback"))),
             
             # 核心执行策略
-            (i18n.t("complete_all_checklist"), i18n.t("complete_all_feedback")),
-            (i18n.t("smart_execute_checklist"), i18n.t("smart_execute_feedback")),
-            (i18n.t("execute_next_item"), i18n.t("execute_next_feedback")),
-            (i18n.t("summarize_to_cursorrule"), i18n.t("summarize_cursorrule_feedback")),
+            (self.parent_ui.i18n.t("complete_all_checklist"), self.parent_ui.i18n.t("complete_all_feedback")),
+            (self.parent_ui.i18n.t("smart_execute_checklist"), self.parent_ui.i18n.t("smart_execute_feedback")),
+            (self.parent_ui.i18n.t("execute_next_item"), self.parent_ui.i18n.t("execute_next_feedback")),
+            (self.parent_ui.i18n.t("summarize_to_cursorrule"), self.parent_ui.i18n.t("summarize_cursorrule_feedback")),
             
             # 常用反馈（统一的三个核心按钮）
-            (i18n.t("looks_good"), i18n.t("looks_good_feedback")),
-            (i18n.t("needs_adjustment"), i18n.t("needs_adjustment_feedback")),
-            (i18n.t("complete"), i18n.t("complete_feedback")),
+            (self.parent_ui.i18n.t("looks_good"), self.parent_ui.i18n.t("looks_good_feedback")),
+            (self.parent_ui.i18n.t("needs_adjustment"), self.parent_ui.i18n.t("needs_adjustment_feedback")),
+            (self.parent_ui.i18n.t("complete"), self.parent_ui.i18n.t("complete_feedback")),
         ]
         
         return buttons
@@ -66,51 +60,6 @@ class QuickResponseManager:
         # 统一提供默认配置，不再根据项目类型区分
         return self.get_default_quick_responses(config)
 
-    def _extract_mode_rules_from_cursor_rule(self):
-        """从RIPER-5-cursor-rule.txt文件中提取模式规则"""
-        cursor_rule_path = os.path.join(os.path.dirname(__file__), "RIPER-5-cursor-rule.txt")
-        mode_rules = {}
-        
-        if not os.path.exists(cursor_rule_path):
-            return mode_rules
-        
-        try:
-            with open(cursor_rule_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # 查找各个模式的规则
-            modes = ["RESEARCH", "INNOVATE", "PLAN", "EXECUTE", "REVIEW"]
-            
-            for mode in modes:
-                # 查找模式标题
-                mode_start = content.find(f"### 模式{modes.index(mode)+1}: {mode}")
-                if mode_start == -1:
-                    mode_start = content.find(f"模式{modes.index(mode)+1}: {mode}")
-                
-                if mode_start != -1:
-                    # 查找下一个模式的开始位置
-                    next_mode_start = len(content)
-                    for next_mode in modes[modes.index(mode)+1:]:
-                        next_start = content.find(f"### 模式{modes.index(next_mode)+1}: {next_mode}", mode_start + 1)
-                        if next_start == -1:
-                            next_start = content.find(f"模式{modes.index(next_mode)+1}: {next_mode}", mode_start + 1)
-                        if next_start != -1:
-                            next_mode_start = min(next_mode_start, next_start)
-                    
-                    # 提取模式内容
-                    mode_content = content[mode_start:next_mode_start]
-                    
-                    # 构建模式指令
-                    mode_instruction = f"请进入{mode}模式，严格按照以下规则执行：\n\n{mode_content.strip()}"
-                    mode_rules[mode] = mode_instruction
-        
-        except Exception:
-            # 如果读取失败，返回默认的模式指令
-            for mode in ["RESEARCH", "INNOVATE", "PLAN", "EXECUTE", "REVIEW"]:
-                mode_rules[mode] = f"请进入{mode}模式并按照RIPER-5协议执行。"
-        
-        return mode_rules
-
     def get_button_size(self, config):
         """根据配置获取按钮尺寸"""
         button_size = config.get("button_size", "medium")
@@ -141,7 +90,7 @@ class QuickResponseManager:
         cache_key = self.get_layout_cache_key(config, quick_responses)
         
         if cache_key not in self._ui_update_cache:
-            self._performance_stats["cache_misses"] += 1
+            self.metrics.inc("ui.cache_misses")
             # 计算布局参数
             visible_buttons = config.get("visible_buttons", list(range(len(quick_responses))))
             visible_count = len([i for i in range(len(quick_responses)) if i in visible_buttons])
@@ -166,7 +115,7 @@ class QuickResponseManager:
                 "visible_buttons": visible_buttons.copy()
             }
         else:
-            self._performance_stats["cache_hits"] += 1
+            self.metrics.inc("ui.cache_hits")
         
         return self._ui_update_cache[cache_key]
 
@@ -233,7 +182,7 @@ class QuickResponseManager:
 
     def update_buttons_incrementally(self, quick_response_widget, layout_info):
         """增量更新按钮（仅更新文本和状态）"""
-        self._performance_stats["incremental_updates"] += 1
+        self.metrics.inc("ui.incremental_updates")
         
         # 更新按钮文本
         for i, button in enumerate(self.quick_response_buttons):
@@ -246,7 +195,7 @@ class QuickResponseManager:
 
     def get_performance_stats(self):
         """获取性能统计信息（用于调试）"""
-        return self._performance_stats.copy()
+        return self.parent_ui.performance_manager.get_performance_stats()
 
     def is_default_button(self, button_text, response_text, index):
         """判断按钮是否为默认按钮"""
@@ -0,0 +1,127 @@
+"""
+规则目录模块 - 负责解析RIPER-5-cursor-rule.txt中各模式的规则并缓存结果（不依赖Qt）
+
+规则文件只做一次线性扫描：遇到 "### 模式N: MODE" 开始一个模式，遇到下一个模式标题或二级标题结束。
+解析结果按文件的 mtime/大小 和 sha256 写入 RULE_CACHE_PATH：mtime未变时直接使用缓存，
+mtime变了但内容哈希相同时也无需重新解析。进程内的结果常驻内存，启动和切换语言时不再重复读文件。
+"""
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, Optional
+
+from config import CURSOR_RULE_FILE_NAME, RULE_CACHE_PATH, RULE_MODES
+from file_utils import atomic_write
+
+CACHE_VERSION = 1
+MODE_HEADING_PREFIX = "### 模式"
+
+
+def parse_mode_rules(content: str) -> Dict[str, str]:
+    """单次扫描提取各模式的规则文本（连续空行合并为一个），没有找到的模式不出现在结果中"""
+    rules: Dict[str, str] = {}
+    current_mode: Optional[str] = None
+    lines = []
+
+    def finish():
+        if current_mode is not None:
+            rules[current_mode] = "\n".join(lines).strip()
+
+    for line in content.splitlines():
+        if line.startswith("## ") or line.startswith(MODE_HEADING_PREFIX):
+            finish()
+            current_mode, lines = None, []
+            if line.startswith(MODE_HEADING_PREFIX):
+                # "### 模式1: RESEARCH" / "### 模式4: EXECUTE (...)"
+                _, _, title = line.partition(":")
+                mode = title.strip().split(" ", 1)[0] if title.strip() else ""
+                if mode in RULE_MODES and mode not in rules:
+                    current_mode = mode
+        if current_mode is None:
+            continue
+        if not line.strip() and lines and not lines[-1].strip():
+            continue
+        lines.append(line.rstrip())
+    finish()
+    return rules
+
+
+class RuleCatalog:
+    """模式规则目录：解析结果缓存在内存和磁盘中，规则文件变化时自动重新解析"""
+
+    def __init__(self, rule_path: Optional[str] = None, cache_path: str = RULE_CACHE_PATH):
+        self.rule_path = rule_path or os.path.join(os.path.dirname(os.path.abspath(__file__)), CURSOR_RULE_FILE_NAME)
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._stamp = None  # 内存中结果对应的 (mtime_ns, size)
+        self._rules: Dict[str, str] = {}
+
+    def mode_rules(self) -> Dict[str, str]:
+        """各模式的规则原文；规则文件不存在或读取失败时返回空字典"""
+        try:
+            stat = os.stat(self.rule_path)
+        except OSError:
+            return {}
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if self._stamp != stamp:
+                self._rules = self._load(stamp)
+                self._stamp = stamp
+            return dict(self._rules)
+
+    def mode_instructions(self) -> Dict[str, str]:
+        """用作快捷按钮反馈内容的模式指令"""
+        return {
+            mode: f"请进入{mode}模式，严格按照以下规则执行：\n\n{rule}"
+            for mode, rule in self.mode_rules().items()
+        }
+
+    def _load(self, stamp) -> Dict[str, str]:
+        """依次尝试磁盘缓存（mtime一致）、内容哈希比对，最后才重新解析"""
+        cache = self._read_cache()
+        if cache and cache.get("path") == self.rule_path and tuple(cache.get("stamp", ())) == stamp:
+            return cache["modes"]
+
+        try:
+            with open(self.rule_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return {}
+
+        digest = hashlib.sha256(data).hexdigest()
+        if cache and cache.get("path") == self.rule_path and cache.get("sha256") == digest:
+            modes = cache["modes"]
+        else:
+            modes = parse_mode_rules(data.decode("utf-8", errors="replace"))
+        self._write_cache({
+            "version": CACHE_VERSION,
+            "path": self.rule_path,
+            "stamp": list(stamp),
+            "sha256": digest,
+            "modes": modes,
+        })
+        return modes
+
+    def _read_cache(self) -> Optional[dict]:
+        """读取磁盘缓存，格式不符时视为没有缓存"""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION or not isinstance(cache.get("modes"), dict):
+            return None
+        return cache
+
+    def _write_cache(self, cache: dict):
+        """写入磁盘缓存（原子替换），失败时只使用内存结果"""
+        try:
+            atomic_write(self.cache_path, json.dumps(cache, ensure_ascii=False).encode("utf-8"))
+        except OSError:
+            pass
+
+
+# 全局实例
+rule_catalog = RuleCatalog()
@@ -4,70 +4,236 @@
 import os
 import sys
 import json
-import tempfile
-import subprocess
+import base64
+import asyncio
 
-from typing import Annotated, Dict
+from contextlib import asynccontextmanager
+from typing import Annotated
 
 from fastmcp import FastMCP
-from pydantic import Field
+from fastmcp.exceptions import ResourceError, ToolError
+from mcp.types import TextContent, ImageContent
+from pydantic import BaseModel, Field
+
+from attachment_store import attachment_store
+from config import UI_HOST_ENV, ATTACHMENTS_MODE_ENV, ATTACHMENT_URI_PREFIX, TICKET_MAX_WAIT_MS, METRICS_URI
+from metrics import metrics
+from config_store import load_project_profile
+from feedback_tickets import TicketError, ticket_store
+from ipc_protocol import ResultAssembler, read_frame_async
+from ui_host_client import ui_host_client
+import tracing
+
+def use_ui_host() -> bool:
+    # The warm UI host can be disabled to fall back to one process per call
+    return os.environ.get(UI_HOST_ENV, "1") != "0"
+
+@asynccontextmanager
+async def ui_host_lifespan(server: FastMCP):
+    # Start warming up the UI host before the first tool call and stop it on shutdown
+    if use_ui_host():
+        await ui_host_client.start()
+    try:
+        yield
+    finally:
+        ticket_store.cancel_all()
+        await ui_host_client.stop()
 
 # The log_level is necessary for Cline to work: https://github.com/jlowin/fastmcp/issues/81
-mcp = FastMCP("Interactive Feedback MCP", log_level="ERROR")
+mcp = FastMCP("Interactive Feedback MCP", log_level="ERROR", lifespan=ui_host_lifespan)
 
-def launch_feedback_ui(project_directory: str, summary: str) -> dict[str, str]:
-    # Create a temporary file for the feedback result
-    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
-        output_file = tmp.name
+class FeedbackQuestion(BaseModel):
+    question: str = Field(description="The question to ask")
+    choices: list[str] = Field(default_factory=list, description="Optional quick-response choices for this question")
 
+async def launch_feedback_ui(project_directory: str, summary: str, priority: int = 0,
+                             questions: list[dict] | None = None) -> dict:
+    # With INTERACTIVE_FEEDBACK_TRACE set, the trace id is handed to the UI side so spans from
+    # both processes end up under the same trace in the JSONL file
+    metrics.inc("server.feedback_requests")
+    with tracing.span("launch_feedback_ui", ui_host=use_ui_host()), metrics.timer("server.feedback_round_trip_ms"):
+        # Project settings come from the shared JSON config file, so they can be read without Qt.
+        # A project with a scripted reply (unattended/CI runs) is answered without opening any UI.
+        profile = load_project_profile(project_directory)
+        if profile["scripted_reply"]:
+            metrics.inc("server.scripted_replies")
+            return {"logs": "", "interactive_feedback": profile["scripted_reply"]}
+        trace_id = tracing.current_trace_id()
+        if use_ui_host():
+            # Reuse the long-lived UI host process (QApplication and modules already loaded).
+            # Concurrent requests share one tabbed window, ordered by priority and per-project fairness.
+            return await ui_host_client.request_feedback(project_directory, summary, priority, questions, trace_id)
+        return await launch_feedback_ui_process(project_directory, summary, questions, trace_id)
+
+# Background waits that reap finished feedback UI processes; the event loop only keeps weak references to tasks
+_reaper_tasks: set[asyncio.Task] = set()
+
+async def launch_feedback_ui_process(project_directory: str, summary: str,
+                                     questions: list[dict] | None = None,
+                                     trace_id: str | None = None) -> dict:
+    # Get the path to feedback_ui.py relative to this script
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    feedback_ui_path = os.path.join(script_dir, "feedback_ui.py")
+
+    # Run feedback_ui.py as a separate process and read the framed result from its stdout
+    # NOTE: There appears to be a bug in uv, so we need
+    # to pass a bunch of special flags to make this work
+    args = [
+        sys.executable,
+        "-u",
+        feedback_ui_path,
+        "--project-directory", project_directory,
+        "--prompt", summary,
+        "--stream"
+    ]
+    if questions:
+        args += ["--questions", json.dumps(questions, ensure_ascii=False)]
+    if trace_id:
+        args += ["--trace-id", trace_id]
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        stdin=asyncio.subprocess.DEVNULL,
+        close_fds=True
+    )
     try:
-        # Get the path to feedback_ui.py relative to this script
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        feedback_ui_path = os.path.join(script_dir, "feedback_ui.py")
-
-        # Run feedback_ui.py as a separate process
-        # NOTE: There appears to be a bug in uv, so we need
-        # to pass a bunch of special flags to make this work
-        args = [
-            sys.executable,
-            "-u",
-            feedback_ui_path,
-            "--project-directory", project_directory,
-            "--prompt", summary,
-            "--output-file", output_file
-        ]
-        result = subprocess.run(
-            args,
-            check=False,
-            shell=False,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            stdin=subprocess.DEVNULL,
-            close_fds=True
-        )
-        if result.returncode != 0:
-            raise Exception(f"Failed to launch feedback UI: {result.returncode}")
-
-        # Read the result from the temporary file
-        with open(output_file, 'r') as f:
-            result = json.load(f)
-        os.unlink(output_file)
-        return result
-    except Exception as e:
-        if os.path.exists(output_file):
-            os.unlink(output_file)
-        raise e
+        # Consume frames as they arrive; the result is complete at the end frame
+        assembler = ResultAssembler()
+        while True:
+            frame = await read_frame_async(process.stdout)
+            if frame is None:
+                raise Exception(f"Failed to launch feedback UI: {await process.wait()}")
+            if assembler.feed(*frame):
+                # The child exits right after the end frame; reap it in the background
+                task = asyncio.ensure_future(process.wait())
+                _reaper_tasks.add(task)
+                task.add_done_callback(_reaper_tasks.discard)
+                return assembler.result()
+    except BaseException:
+        # The tool call was cancelled or the UI failed: close the feedback window
+        if process.returncode is None:
+            process.kill()
+        raise
 
 def first_line(text: str) -> str:
     return text.split("\n")[0].strip()
 
+def use_lazy_attachments() -> bool:
+    # By default attachments are returned as handles and read on demand as resources
+    return os.environ.get(ATTACHMENTS_MODE_ENV, "lazy") != "inline"
+
+def to_tool_content(result: dict) -> list[TextContent | ImageContent]:
+    attachments = result.get("attachments", [])
+    text = {key: value for key, value in result.items() if key != "attachments"}
+
+    inline = attachments
+    if use_lazy_attachments() and attachments:
+        # Only lightweight handles go into the result; the bytes stay in the bounded store
+        stored = [
+            (attachment, attachment_store.put(
+                attachment["data"],
+                attachment.get("mime_type", "image/jpeg"),
+                attachment.get("width", 0),
+                attachment.get("height", 0),
+            ))
+            for attachment in attachments
+        ]
+        # Attachments the store could not keep (too large, or already evicted by the
+        # others in this result) are returned inline so every handle can be read
+        handles = [handle for _, handle in stored if handle is not None and handle["sha256"] in attachment_store]
+        inline = [attachment for attachment, handle in stored if handle not in handles]
+        if handles:
+            text["attachments"] = handles
+        metrics.set_gauge("server.attachment_cache_bytes", attachment_store.total_bytes)
+
+    # One text part with logs and feedback, plus one native image part per inline attachment
+    content = [TextContent(type="text", text=json.dumps(text, ensure_ascii=False))]
+    for attachment in inline:
+        content.append(ImageContent(
+            type="image",
+            data=base64.b64encode(attachment["data"]).decode("ascii"),
+            mimeType=attachment.get("mime_type", "image/jpeg"),
+        ))
+    return content
+
 @mcp.tool()
-def interactive_feedback(
+async def interactive_feedback(
     project_directory: Annotated[str, Field(description="Full path to the project directory")],
     summary: Annotated[str, Field(description="Short, one-line summary of the changes")],
-) -> Dict[str, str]:
+    priority: Annotated[int, Field(description="Optional priority; higher values are shown first when several requests are pending")] = 0,
+) -> list[TextContent | ImageContent]:
     """Request interactive feedback for a given project directory and summary"""
-    return launch_feedback_ui(first_line(project_directory), first_line(summary))
+    with tracing.span("interactive_feedback"):
+        result = await launch_feedback_ui(first_line(project_directory), first_line(summary), priority)
+        with tracing.span("to_tool_content"):
+            return to_tool_content(result)
+
+@mcp.tool()
+async def ask_questions(
+    project_directory: Annotated[str, Field(description="Full path to the project directory")],
+    summary: Annotated[str, Field(description="Short, one-line context for the questions")],
+    questions: Annotated[list[FeedbackQuestion], Field(description="Questions to answer in one form", min_length=1)],
+) -> list[TextContent | ImageContent]:
+    """Ask several questions at once in a single feedback form; the answers are returned in order"""
+    with tracing.span("ask_questions", questions=len(questions)):
+        result = await launch_feedback_ui(
+            first_line(project_directory),
+            first_line(summary),
+            questions=[question.model_dump() for question in questions],
+        )
+        with tracing.span("to_tool_content"):
+            return to_tool_content(result)
+
+@mcp.tool()
+async def start_feedback(
+    project_directory: Annotated[str, Field(description="Full path to the project directory")],
+    summary: Annotated[str, Field(description="Short, one-line summary of the changes")],
+    priority: Annotated[int, Field(description="Optional priority; higher values are shown first when several requests are pending")] = 0,
+) -> str:
+    """Open the feedback UI without waiting and return a ticket; collect the answer later with get_feedback"""
+    try:
+        ticket = ticket_store.create(
+            launch_feedback_ui(first_line(project_directory), first_line(summary), priority)
+        )
+    except TicketError as e:
+        raise ToolError(str(e))
+    return json.dumps({"ticket": ticket.ticket_id, "status": "pending"})
+
+@mcp.tool()
+async def get_feedback(
+    ticket: Annotated[str, Field(description="Ticket returned by start_feedback")],
+    wait_ms: Annotated[int, Field(description=f"How long to wait for the answer in milliseconds (0 returns immediately, max {TICKET_MAX_WAIT_MS})")] = 0,
+) -> list[TextContent | ImageContent]:
+    """Return the feedback for a ticket, or a pending status if the user has not answered yet"""
+    wait_seconds = max(0, min(wait_ms, TICKET_MAX_WAIT_MS)) / 1000
+    try:
+        result = await ticket_store.wait(ticket, wait_seconds)
+    except TicketError as e:
+        raise ToolError(str(e))
+    except Exception as e:
+        raise ToolError(f"Feedback request failed: {e}")
+
+    if result is None:
+        return [TextContent(type="text", text=json.dumps({"ticket": ticket, "status": "pending"}))]
+    return to_tool_content({"ticket": ticket, "status": "done", **result})
+
+@mcp.resource(ATTACHMENT_URI_PREFIX + "{digest}", mime_type="image/jpeg")
+def feedback_attachment(digest: str) -> bytes:
+    """Optimized image attached to an interactive feedback result"""
+    item = attachment_store.get(digest)
+    if item is None:
+        raise ResourceError(f"Attachment {digest} is not available (expired or unknown)")
+    return item[0]
+
+@mcp.resource(METRICS_URI, mime_type="application/json")
+async def feedback_metrics() -> str:
+    """Counters, gauges and latency histograms (p50/p95/p99) of the server and the UI host"""
+    metrics.set_gauge("server.pending_tickets", len(ticket_store))
+    return json.dumps({
+        "server": metrics.snapshot(),
+        "ui_host": await ui_host_client.request_metrics(),
+    }, indent=2)
 
 if __name__ == "__main__":
     mcp.run(transport="stdio")
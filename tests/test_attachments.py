@@ -0,0 +1,42 @@
+"""
+延迟读取的附件：返回的句柄都能通过资源读取，存不下的附件直接内联返回
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server
+from attachment_store import AttachmentStore
+
+
+def attachment(size: int, fill: bytes = b"x") -> dict:
+    return {"data": fill * size, "mime_type": "image/jpeg", "width": 1, "height": 1}
+
+
+def test_put_refuses_attachment_larger_than_store():
+    store = AttachmentStore(max_bytes=10)
+    assert store.put(b"x" * 11, "image/jpeg") is None
+    handle = store.put(b"x" * 10, "image/jpeg")
+    assert store.get(handle["sha256"])[0] == b"x" * 10
+
+
+def test_oversized_attachments_are_returned_inline(monkeypatch):
+    store = AttachmentStore(max_bytes=10)
+    monkeypatch.setattr(server, "attachment_store", store)
+    monkeypatch.delenv(server.ATTACHMENTS_MODE_ENV, raising=False)
+
+    content = server.to_tool_content({
+        "logs": "",
+        "interactive_feedback": "ok",
+        "attachments": [attachment(8, b"a"), attachment(20, b"b"), attachment(8, b"c")],
+    })
+
+    handles = json.loads(content[0].text)["attachments"]
+    assert handles
+    for handle in handles:
+        assert store.get(handle["sha256"]) is not None
+    # 第二个附件超过上限，第一个被第三个淘汰：两者都内联返回
+    assert len(handles) + len(content) - 1 == 3
+    assert [part.type for part in content[1:]] == ["image", "image"]
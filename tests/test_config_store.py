@@ -0,0 +1,65 @@
+"""
+项目配置快照的写回：写入失败时保留未保存的修改
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_store import ProjectConfigStore
+
+
+class FlakyBackend:
+    """内存后端，fail 为 True 时写入抛出OSError"""
+
+    def __init__(self):
+        self.groups = {}
+        self.fail = False
+
+    def read_group(self, group: str) -> dict:
+        return dict(self.groups.get(group, {}))
+
+    def write_group(self, group: str, values: dict):
+        if self.fail:
+            raise OSError("config file is not writable")
+        self.groups.setdefault(group, {}).update(values)
+
+
+def test_failed_flush_keeps_changes_for_retry():
+    backend = FlakyBackend()
+    store = ProjectConfigStore(backend, "project")
+    store.update({"run_command": "make test", "language": "en_US"})
+
+    backend.fail = True
+    with pytest.raises(OSError):
+        store.flush()
+    assert store.has_pending_changes
+    assert backend.groups == {}
+
+    backend.fail = False
+    assert store.flush()
+    assert backend.groups["project"] == {"run_command": "make test", "language": "en_US"}
+    assert not store.has_pending_changes
+    assert not store.flush()
+
+
+def test_change_during_write_stays_pending():
+    backend = FlakyBackend()
+    store = ProjectConfigStore(backend, "project")
+    store.set("run_command", "make test")
+
+    write_group = backend.write_group
+
+    def write_and_modify(group, values):
+        write_group(group, values)
+        store.set("run_command", "make lint")
+
+    backend.write_group = write_and_modify
+    store.flush()
+    backend.write_group = write_group
+
+    assert store.has_pending_changes
+    store.flush()
+    assert backend.groups["project"]["run_command"] == "make lint"
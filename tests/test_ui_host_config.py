@@ -0,0 +1,42 @@
+"""
+项目配置无法写回时，常驻宿主仍然回传反馈结果
+"""
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QStandardPaths
+from PySide6.QtWidgets import QApplication
+
+from config import PROJECT_CONFIG_ENV, IMAGE_CACHE_ENV, STICKY_WINDOW_ENV, TABBED_WINDOW_ENV
+from ipc_protocol import FRAME_FEEDBACK, read_frame
+
+
+def test_result_is_sent_when_config_is_unwritable(tmp_path, monkeypatch):
+    QStandardPaths.setTestModeEnabled(True)
+    monkeypatch.setenv(PROJECT_CONFIG_ENV, str(tmp_path / "missing" / "config.json"))
+    monkeypatch.setenv(IMAGE_CACHE_ENV, "0")
+    monkeypatch.setenv(TABBED_WINDOW_ENV, "0")
+    monkeypatch.setenv(STICKY_WINDOW_ENV, "0")
+    app = QApplication.instance() or QApplication([])
+
+    from ui_host import FeedbackUIHost
+    output = io.BytesIO()
+    host = FeedbackUIHost(app, output)
+    host.handle_request({"type": FRAME_FEEDBACK, "id": 1,
+                         "project_directory": str(tmp_path), "prompt": "prompt"})
+    ui = host.windows[1]
+    ui.config_manager.set_value("run_command", "make test")
+    ui.feedback_text.setPlainText("done")
+    ui.feedback_logic_manager.submit_feedback()
+    app.processEvents()
+
+    assert 1 not in host.windows
+    output.seek(0)
+    frames = []
+    while (frame := read_frame(output)) is not None:
+        frames.append(frame[0])
+    assert frames and all(header["id"] == 1 for header in frames)
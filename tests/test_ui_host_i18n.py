@@ -0,0 +1,122 @@
+"""
+常驻宿主中多个窗口使用不同语言时互不影响（标签页窗口和粘性窗口）
+"""
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QStandardPaths
+from PySide6.QtWidgets import QApplication
+
+from config import PROJECT_CONFIG_ENV, IMAGE_CACHE_ENV, STICKY_WINDOW_ENV, TABBED_WINDOW_ENV
+from config_store import JsonConfigBackend, get_project_settings_group
+from i18n import I18n
+from ipc_protocol import FRAME_FEEDBACK
+
+ZH = I18n("zh_CN")
+EN = I18n("en_US")
+
+
+@pytest.fixture
+def host_factory(tmp_path, monkeypatch):
+    """创建宿主和两个分别配置为中文、英文的项目目录"""
+    QStandardPaths.setTestModeEnabled(True)
+    config_path = str(tmp_path / "config.json")
+    monkeypatch.setenv(PROJECT_CONFIG_ENV, config_path)
+    monkeypatch.setenv(IMAGE_CACHE_ENV, "0")
+    app = QApplication.instance() or QApplication([])
+
+    projects = {}
+    for language in ("zh_CN", "en_US"):
+        directory = tmp_path / language
+        directory.mkdir()
+        JsonConfigBackend(config_path).write_group(
+            get_project_settings_group(str(directory)), {"language": language})
+        projects[language] = str(directory)
+
+    from ui_host import FeedbackUIHost
+    hosts = []
+
+    def create(tabbed: bool = True, sticky: bool = False):
+        monkeypatch.setenv(TABBED_WINDOW_ENV, "1" if tabbed else "0")
+        monkeypatch.setenv(STICKY_WINDOW_ENV, "1" if sticky else "0")
+        host = FeedbackUIHost(app, io.BytesIO())
+        hosts.append(host)
+        return host, projects
+
+    yield create
+
+    for host in hosts:
+        host.finish_all()
+        for ui in list(host.idle_windows.values()):
+            ui.deleteLater()
+    app.processEvents()
+
+
+def open_request(host, request_id, project_directory):
+    host.handle_request({"type": FRAME_FEEDBACK, "id": request_id,
+                         "project_directory": project_directory, "prompt": "prompt"})
+    return host.windows[request_id]
+
+
+def assert_window_language(ui, translator):
+    """后缀、追加反馈提示和按钮文本都使用窗口自己的语言"""
+    assert ui.i18n.language == translator.language
+    ui.suffix_radio_force.setChecked(True)
+    assert ui.feedback_logic_manager._get_feedback_suffix() == translator.t("suffix_force")
+    ui.suffix_radio_smart.setChecked(True)
+    assert ui.feedback_logic_manager._get_feedback_suffix() == translator.t("suffix_smart")
+
+    ui.feedback_logic_manager._start_follow_up()
+    try:
+        assert ui.description_label.text() == translator.t("follow_up_hint")
+        remaining = ui.feedback_logic_manager._follow_up_remaining
+        assert ui.submit_button.text() == translator.t("send_follow_up").format(seconds=remaining)
+    finally:
+        ui.feedback_logic_manager.stop_follow_up()
+
+
+@pytest.mark.parametrize("tabbed", [True, False])
+def test_windows_keep_their_own_language(host_factory, tabbed):
+    host, projects = host_factory(tabbed=tabbed)
+    ui_zh = open_request(host, 1, projects["zh_CN"])
+    ui_en = open_request(host, 2, projects["en_US"])
+
+    assert_window_language(ui_zh, ZH)
+    assert_window_language(ui_en, EN)
+    if tabbed:
+        assert host.tab_window.tabs.count() == 2
+
+
+def test_switching_language_does_not_affect_other_windows(host_factory):
+    host, projects = host_factory()
+    ui_zh = open_request(host, 1, projects["zh_CN"])
+    ui_en = open_request(host, 2, projects["en_US"])
+
+    ui_en.i18n.set_language("zh_CN")
+    ui_zh.i18n.set_language("en_US")
+
+    assert_window_language(ui_zh, EN)
+    assert_window_language(ui_en, ZH)
+
+
+def test_sticky_window_follows_project_language(host_factory):
+    host, projects = host_factory(tabbed=False, sticky=True)
+    ui_zh = open_request(host, 1, projects["zh_CN"])
+    ui_en = open_request(host, 2, projects["en_US"])
+    ui_zh.close()
+    assert host.idle_windows[projects["zh_CN"]] is ui_zh
+
+    # 窗口闲置期间项目语言被（同一进程中的其他窗口）修改
+    ui_zh.config_manager.set_value("language", "en_US")
+    reused = open_request(host, 3, projects["zh_CN"])
+
+    assert reused is ui_zh
+    assert reused.submit_button.text() == EN.t("send_feedback")
+    assert_window_language(reused, EN)
+    assert_window_language(ui_en, EN)
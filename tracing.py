@@ -0,0 +1,105 @@
+"""
+追踪模块 - 轻量级结构化追踪，记录命名区间（span）到JSONL文件（不依赖Qt）
+
+设置环境变量 INTERACTIVE_FEEDBACK_TRACE=<文件路径> 后启用；UI宿主/UI子进程继承该变量，
+服务端生成的追踪ID随请求传给UI进程，两侧的区间写入同一文件，按 trace_id 即可拼接成一次完整调用。
+
+每行一条记录：
+  {"trace_id", "span_id", "parent_id", "name", "pid", "start_ns", "duration_ms", "attrs"}
+start_ns 取自 time.monotonic_ns()（同一台机器上各进程可比较）。
+"""
+import os
+import json
+import time
+import uuid
+import threading
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+from typing import Optional
+
+from config import TRACE_ENV
+
+# 当前追踪上下文: (trace_id, span_id)
+_current = contextvars.ContextVar("feedback_trace", default=(None, None))
+_write_lock = threading.Lock()
+
+
+def trace_file() -> Optional[str]:
+    """追踪文件路径，未启用时返回None"""
+    return os.environ.get(TRACE_ENV) or None
+
+
+def is_enabled() -> bool:
+    """是否启用追踪"""
+    return bool(os.environ.get(TRACE_ENV))
+
+
+def new_trace_id() -> str:
+    """生成新的追踪ID"""
+    return uuid.uuid4().hex
+
+
+def current_trace_id() -> Optional[str]:
+    """当前上下文中的追踪ID"""
+    return _current.get()[0]
+
+
+@contextmanager
+def span(name: str, trace_id: Optional[str] = None, **attrs):
+    """记录一个命名区间；trace_id 为空时沿用当前上下文的追踪ID（没有则新建）"""
+    path = trace_file()
+    if path is None:
+        yield
+        return
+
+    parent_trace_id, parent_id = _current.get()
+    if trace_id is None:
+        trace_id = parent_trace_id or new_trace_id()
+    elif trace_id != parent_trace_id:
+        parent_id = None
+    span_id = uuid.uuid4().hex[:16]
+
+    token = _current.set((trace_id, span_id))
+    start_ns = time.monotonic_ns()
+    try:
+        yield
+    finally:
+        duration_ms = (time.monotonic_ns() - start_ns) / 1e6
+        _current.reset(token)
+        _write({
+            "trace_id": trace_id,
+            "span_id": span_id,
+            "parent_id": parent_id,
+            "name": name,
+            "pid": os.getpid(),
+            "start_ns": start_ns,
+            "duration_ms": round(duration_ms, 3),
+            "attrs": attrs,
+        }, path)
+
+
+def traced(name: str):
+    """方法装饰器：以区间包裹方法调用，追踪ID取自 self.parent_ui.trace_id 或 self.trace_id（都没有时沿用当前上下文）"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not is_enabled():
+                return func(self, *args, **kwargs)
+            owner = getattr(self, "parent_ui", self)
+            with span(name, trace_id=getattr(owner, "trace_id", None)):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _write(record: dict, path: str):
+    """追加一条记录（追加模式写入单行，多进程写同一文件不会交错）"""
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    try:
+        with _write_lock:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+    except OSError:
+        # 追踪失败不影响正常功能
+        pass
@@ -1,15 +1,38 @@
 """
 UI配置管理模块 - 负责配置的加载、保存和管理
 """
-import hashlib
-from typing import TypedDict, List
-from PySide6.QtCore import QSettings
+import sys
+from typing import TypedDict, List, NotRequired
+from PySide6.QtCore import QSettings, QTimer
 from i18n import i18n
+from config import CONFIG_FLUSH_DELAY_MS
+from config_store import ProjectProfile, JsonConfigBackend, get_project_store, get_project_settings_group
+from metrics import metrics
+
+
+class FeedbackAttachment(TypedDict):
+    index: int
+    mime_type: str
+    width: int
+    height: int
+    data: bytes
+
+
+class FeedbackQuestion(TypedDict):
+    question: str
+    choices: NotRequired[List[str]]  # 可选的快捷选项
+
+
+class QuestionAnswer(TypedDict):
+    question: str
+    answer: str
 
 
 class FeedbackResult(TypedDict):
     logs: str
     interactive_feedback: str
+    attachments: NotRequired[List[FeedbackAttachment]]  # 以图片内容返回的附件
+    answers: NotRequired[List[QuestionAnswer]]  # 批量问题的答案（按问题顺序）
 
 
 class FeedbackConfig(TypedDict):
@@ -23,56 +46,85 @@ class FeedbackConfig(TypedDict):
     language: str  # "zh_CN", "en_US"
     use_base64_transmission: bool  # 是否启用Base64传输
     base64_target_size_kb: int  # Base64目标大小（KB）
+    enable_follow_up: bool  # 提交后是否允许在窗口内追加反馈
+
+
+class QSettingsBackend:
+    """基于QSettings的配置存储后端：一次读取整个设置组（项目配置已改存JSON文件，这里只用于迁移旧配置）"""
+
+    def __init__(self, settings: QSettings = None):
+        self.settings = settings or QSettings("InteractiveFeedbackMCP", "InteractiveFeedbackMCP")
+
+    def read_group(self, group: str) -> dict:
+        """读取设置组中的所有键"""
+        self.settings.beginGroup(group)
+        values = {key: self.settings.value(key) for key in self.settings.childKeys()}
+        self.settings.endGroup()
+        return values
+
+    def write_group(self, group: str, values: dict):
+        """写入（值为None时删除）若干键并同步到磁盘"""
+        self.settings.beginGroup(group)
+        for key, value in values.items():
+            if value is None:
+                self.settings.remove(key)
+            else:
+                self.settings.setValue(key, value)
+        self.settings.endGroup()
+        self.settings.sync()
 
 
 class UIConfigManager:
-    """UI配置管理器"""
+    """UI配置管理器：项目配置读自共享快照，修改经防抖后批量写回"""
     
-    def __init__(self, project_directory: str):
+    def __init__(self, project_directory: str, settings: QSettings = None):
         self.project_directory = project_directory
-        self.settings = QSettings("InteractiveFeedbackMCP", "InteractiveFeedbackMCP")
+        self.settings = settings or QSettings("InteractiveFeedbackMCP", "InteractiveFeedbackMCP")
         self.project_group_name = get_project_settings_group(project_directory)
+        # 项目配置存放在与服务端共用的JSON文件中，首次打开旧项目时从QSettings迁移；窗口几何仍留在QSettings
+        backend = JsonConfigBackend(fallback=QSettingsBackend(self.settings))
+        self.store = get_project_store(backend, self.project_group_name)
         
+        # 写回防抖：连续修改只在最后一次修改后写一次
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(CONFIG_FLUSH_DELAY_MS)
+        self._flush_timer.timeout.connect(self.flush)
+    
+    def load_profile(self) -> ProjectProfile:
+        """项目配置快照（整个进程只在首次调用时读取存储）"""
+        return self.store.load()
+    
+    def get_value(self, key: str):
+        """读取一项项目配置"""
+        return self.store.get(key)
+    
+    def set_value(self, key: str, value):
+        """修改一项项目配置（延迟写回）"""
+        self.update_values({key: value})
+    
+    def update_values(self, values: dict):
+        """批量修改项目配置（延迟写回）"""
+        if self.store.update(values):
+            self._flush_timer.start()
+    
+    def flush(self):
+        """立即写回所有未保存的修改；配置文件不可写时只记录错误，修改留在快照中等待下次写回"""
+        self._flush_timer.stop()
+        try:
+            self.store.flush()
+        except OSError as e:
+            metrics.inc("config.flush_errors")
+            print(f"[config] Failed to save project settings: {e}", file=sys.stderr)
+    
     def load_config(self) -> FeedbackConfig:
         """加载配置"""
-        # Load general UI settings for the main window (geometry, state)
-        self.settings.beginGroup("MainWindow_General")
-        geometry = self.settings.value("geometry")
-        window_state = self.settings.value("windowState")
-        self.settings.endGroup()
-        
-        # Load project-specific settings
-        self.settings.beginGroup(self.project_group_name)
-        config = FeedbackConfig(
-            run_command=self.settings.value("run_command", "", type=str),
-            execute_automatically=self.settings.value("execute_automatically", False, type=bool),
-            suffix_mode=self.settings.value("suffix_mode", "force", type=str),
-            button_size=self.settings.value("button_size", "medium", type=str),
-            custom_button_width=self.settings.value("custom_button_width", 120, type=int),
-            custom_button_height=self.settings.value("custom_button_height", 40, type=int),
-            visible_buttons=self.settings.value("visible_buttons", [], type=list),
-            language=self.settings.value("language", "zh_CN", type=str),
-            use_base64_transmission=self.settings.value("use_base64_transmission", True, type=bool),
-            base64_target_size_kb=self.settings.value("base64_target_size_kb", 30, type=int)
-        )
-        self.settings.endGroup()
-        
-        return config, geometry, window_state
+        profile = self.load_profile()
+        return FeedbackConfig(**{key: profile[key] for key in FeedbackConfig.__annotations__})
     
     def save_config(self, config: FeedbackConfig):
         """保存配置"""
-        self.settings.beginGroup(self.project_group_name)
-        self.settings.setValue("run_command", config["run_command"])
-        self.settings.setValue("execute_automatically", config["execute_automatically"])
-        self.settings.setValue("suffix_mode", config["suffix_mode"])
-        self.settings.setValue("button_size", config["button_size"])
-        self.settings.setValue("custom_button_width", config["custom_button_width"])
-        self.settings.setValue("custom_button_height", config["custom_button_height"])
-        self.settings.setValue("visible_buttons", config["visible_buttons"])
-        self.settings.setValue("language", config["language"])
-        self.settings.setValue("use_base64_transmission", config["use_base64_transmission"])
-        self.settings.setValue("base64_target_size_kb", config["base64_target_size_kb"])
-        self.settings.endGroup()
+        self.update_values({key: config[key] for key in FeedbackConfig.__annotations__ if key in config})
     
     def save_window_geometry(self, geometry, window_state):
         """保存窗口几何信息"""
@@ -85,29 +137,19 @@ class UIConfigManager:
     
     def save_command_section_visibility(self, visible: bool):
         """保存命令区域可见性"""
-        self.settings.beginGroup(self.project_group_name)
-        self.settings.setValue("commandSectionVisible", visible)
-        self.settings.endGroup()
+        self.set_value("commandSectionVisible", visible)
     
     def load_command_section_visibility(self) -> bool:
         """加载命令区域可见性"""
-        self.settings.beginGroup(self.project_group_name)
-        visible = self.settings.value("commandSectionVisible", False, type=bool)
-        self.settings.endGroup()
-        return visible
+        return self.get_value("commandSectionVisible")
     
     def load_quick_responses(self):
         """加载快捷回复配置"""
-        self.settings.beginGroup(self.project_group_name)
-        saved_responses = self.settings.value("quick_responses", [], type=list)
-        self.settings.endGroup()
-        return saved_responses
+        return self.get_value("quick_responses")
     
     def save_quick_responses(self, responses):
         """保存快捷回复配置"""
-        self.settings.beginGroup(self.project_group_name)
-        self.settings.setValue("quick_responses", responses)
-        self.settings.endGroup()
+        self.set_value("quick_responses", [tuple(item) for item in responses])
 
 
 # 默认按钮模式定义（统一管理，避免重复）
@@ -143,22 +185,6 @@ def is_default_button(button_text: str, response_text: str) -> bool:
             return True
     return False
 
-def get_project_settings_group(project_dir: str) -> str:
-    """
-    根据项目目录生成设置组名称
-    使用目录路径的哈希值来确保唯一性，同时保持可读性
-    """
-    # 使用项目目录的绝对路径创建哈希
-    dir_hash = hashlib.md5(project_dir.encode('utf-8')).hexdigest()[:8]
-    
-    # 获取项目目录名称（用于可读性）
-    import os
-    dir_name = os.path.basename(project_dir.rstrip(os.sep))
-    
-    # 组合成设置组名称
-    return f"Project_{dir_name}_{dir_hash}"
-
-
 def get_default_config() -> FeedbackConfig:
     """获取默认配置"""
     return FeedbackConfig(
@@ -171,5 +197,6 @@ def get_default_config() -> FeedbackConfig:
         visible_buttons=[],
         language="zh_CN",
         use_base64_transmission=True,
-        base64_target_size_kb=30
+        base64_target_size_kb=30,
+        enable_follow_up=False
     ) 
\ No newline at end of file
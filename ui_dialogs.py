@@ -18,7 +18,8 @@ class QuickResponseEditDialog(QDialog):
         super().__init__(parent)
         self.quick_responses = quick_responses.copy()
         self.parent_ui = parent
-        self.setWindowTitle(i18n.t("edit_quick_buttons_dialog"))
+        self.i18n = getattr(parent, "i18n", i18n)
+        self.setWindowTitle(self.i18n.t("edit_quick_buttons_dialog"))
         self.setModal(True)
         self.resize(600, 500)
         
@@ -39,17 +40,17 @@ class QuickResponseEditDialog(QDialog):
         layout = QVBoxLayout(self)
         
         # 说明标签
-        self.info_label = QLabel(i18n.t("edit_instruction"))
+        self.info_label = QLabel(self.i18n.t("edit_instruction"))
         layout.addWidget(self.info_label)
         
         # 按钮尺寸设置区域
-        self.size_group = QGroupBox(i18n.t("button_size_settings"))
+        self.size_group = QGroupBox(self.i18n.t("button_size_settings"))
         size_layout = QHBoxLayout(self.size_group)
         
-        self.size_small = QRadioButton(i18n.t("small"))
-        self.size_medium = QRadioButton(i18n.t("medium"))
-        self.size_large = QRadioButton(i18n.t("large"))
-        self.size_custom = QRadioButton(i18n.t("custom"))
+        self.size_small = QRadioButton(self.i18n.t("small"))
+        self.size_medium = QRadioButton(self.i18n.t("medium"))
+        self.size_large = QRadioButton(self.i18n.t("large"))
+        self.size_custom = QRadioButton(self.i18n.t("custom"))
         
         # 根据父窗口配置设置初始状态
         if self.parent_ui:
@@ -67,10 +68,10 @@ class QuickResponseEditDialog(QDialog):
         
         # 自定义尺寸输入
         self.custom_width = QLineEdit()
-        self.custom_width.setPlaceholderText(i18n.t("placeholder_width"))
+        self.custom_width.setPlaceholderText(self.i18n.t("placeholder_width"))
         self.custom_width.setMaximumWidth(60)
         self.custom_height = QLineEdit()
-        self.custom_height.setPlaceholderText(i18n.t("placeholder_height"))
+        self.custom_height.setPlaceholderText(self.i18n.t("placeholder_height"))
         self.custom_height.setMaximumWidth(60)
         
         if self.parent_ui:
@@ -81,10 +82,10 @@ class QuickResponseEditDialog(QDialog):
         size_layout.addWidget(self.size_medium)
         size_layout.addWidget(self.size_large)
         size_layout.addWidget(self.size_custom)
-        self.width_label = QLabel(i18n.t("width") + ":")
+        self.width_label = QLabel(self.i18n.t("width") + ":")
         size_layout.addWidget(self.width_label)
         size_layout.addWidget(self.custom_width)
-        self.height_label = QLabel(i18n.t("height") + ":")
+        self.height_label = QLabel(self.i18n.t("height") + ":")
         size_layout.addWidget(self.height_label)
         size_layout.addWidget(self.custom_height)
         size_layout.addStretch()
@@ -92,11 +93,11 @@ class QuickResponseEditDialog(QDialog):
         layout.addWidget(self.size_group)
         
         # 语言设置区域
-        self.language_group = QGroupBox(i18n.t("language_settings"))
+        self.language_group = QGroupBox(self.i18n.t("language_settings"))
         language_layout = QHBoxLayout(self.language_group)
         
-        self.language_zh = QRadioButton(i18n.t("chinese"))
-        self.language_en = QRadioButton(i18n.t("english"))
+        self.language_zh = QRadioButton(self.i18n.t("chinese"))
+        self.language_en = QRadioButton(self.i18n.t("english"))
         
         # 根据父窗口配置设置初始状态
         if self.parent_ui:
@@ -122,34 +123,34 @@ class QuickResponseEditDialog(QDialog):
         # 按钮行
         button_layout = QHBoxLayout()
         
-        self.add_button = QPushButton(i18n.t("add"))
+        self.add_button = QPushButton(self.i18n.t("add"))
         self.add_button.clicked.connect(self._add_item)
         button_layout.addWidget(self.add_button)
         
-        self.delete_button = QPushButton(i18n.t("delete"))
+        self.delete_button = QPushButton(self.i18n.t("delete"))
         self.delete_button.clicked.connect(self._delete_item)
         button_layout.addWidget(self.delete_button)
         
         # 添加上移和下移按钮
-        self.move_up_button = QPushButton(i18n.t("move_up"))
+        self.move_up_button = QPushButton(self.i18n.t("move_up"))
         self.move_up_button.clicked.connect(self._move_item_up)
         button_layout.addWidget(self.move_up_button)
         
-        self.move_down_button = QPushButton(i18n.t("move_down"))
+        self.move_down_button = QPushButton(self.i18n.t("move_down"))
         self.move_down_button.clicked.connect(self._move_item_down)
         button_layout.addWidget(self.move_down_button)
         
-        self.reset_button = QPushButton(i18n.t("reset_to_default"))
+        self.reset_button = QPushButton(self.i18n.t("reset_to_default"))
         self.reset_button.clicked.connect(self._reset_to_default)
         button_layout.addWidget(self.reset_button)
         
         button_layout.addStretch()
         
-        self.ok_button = QPushButton(i18n.t("ok"))
+        self.ok_button = QPushButton(self.i18n.t("ok"))
         self.ok_button.clicked.connect(self._save_and_accept)
         button_layout.addWidget(self.ok_button)
         
-        self.cancel_button = QPushButton(i18n.t("cancel"))
+        self.cancel_button = QPushButton(self.i18n.t("cancel"))
         self.cancel_button.clicked.connect(self.reject)
         button_layout.addWidget(self.cancel_button)
         
@@ -187,55 +188,55 @@ class QuickResponseEditDialog(QDialog):
     
     def _refresh_ui_text(self):
         """刷新界面文本以适应语言变化"""
-        self.setWindowTitle(i18n.t("edit_quick_buttons_dialog"))
+        self.setWindowTitle(self.i18n.t("edit_quick_buttons_dialog"))
         
         if self.info_label:
-            self.info_label.setText(i18n.t("edit_instruction"))
+            self.info_label.setText(self.i18n.t("edit_instruction"))
         
         if self.size_group:
-            self.size_group.setTitle(i18n.t("button_size_settings"))
+            self.size_group.setTitle(self.i18n.t("button_size_settings"))
         
         if self.language_group:
-            self.language_group.setTitle(i18n.t("language_settings"))
+            self.language_group.setTitle(self.i18n.t("language_settings"))
         
         if self.size_small:
-            self.size_small.setText(i18n.t("small"))
+            self.size_small.setText(self.i18n.t("small"))
         if self.size_medium:
-            self.size_medium.setText(i18n.t("medium"))
+            self.size_medium.setText(self.i18n.t("medium"))
         if self.size_large:
-            self.size_large.setText(i18n.t("large"))
+            self.size_large.setText(self.i18n.t("large"))
         if self.size_custom:
-            self.size_custom.setText(i18n.t("custom"))
+            self.size_custom.setText(self.i18n.t("custom"))
         
         if self.language_zh:
-            self.language_zh.setText(i18n.t("chinese"))
+            self.language_zh.setText(self.i18n.t("chinese"))
         if self.language_en:
-            self.language_en.setText(i18n.t("english"))
+            self.language_en.setText(self.i18n.t("english"))
         
         if self.width_label:
-            self.width_label.setText(i18n.t("width") + ":")
+            self.width_label.setText(self.i18n.t("width") + ":")
         if self.height_label:
-            self.height_label.setText(i18n.t("height") + ":")
+            self.height_label.setText(self.i18n.t("height") + ":")
         
         if self.custom_width:
-            self.custom_width.setPlaceholderText(i18n.t("placeholder_width"))
+            self.custom_width.setPlaceholderText(self.i18n.t("placeholder_width"))
         if self.custom_height:
-            self.custom_height.setPlaceholderText(i18n.t("placeholder_height"))
+            self.custom_height.setPlaceholderText(self.i18n.t("placeholder_height"))
         
         if self.add_button:
-            self.add_button.setText(i18n.t("add"))
+            self.add_button.setText(self.i18n.t("add"))
         if self.delete_button:
-            self.delete_button.setText(i18n.t("delete"))
+            self.delete_button.setText(self.i18n.t("delete"))
         if self.move_up_button:
-            self.move_up_button.setText(i18n.t("move_up"))
+            self.move_up_button.setText(self.i18n.t("move_up"))
         if self.move_down_button:
-            self.move_down_button.setText(i18n.t("move_down"))
+            self.move_down_button.setText(self.i18n.t("move_down"))
         if self.reset_button:
-            self.reset_button.setText(i18n.t("reset_to_default"))
+            self.reset_button.setText(self.i18n.t("reset_to_default"))
         if self.ok_button:
-            self.ok_button.setText(i18n.t("ok"))
+            self.ok_button.setText(self.i18n.t("ok"))
         if self.cancel_button:
-            self.cancel_button.setText(i18n.t("cancel"))
+            self.cancel_button.setText(self.i18n.t("cancel"))
     
     def _populate_list(self):
         """填充列表"""
@@ -324,14 +325,14 @@ class QuickResponseEditDialog(QDialog):
         if has_custom:
             # 创建自定义选择对话框
             choice_dialog = QMessageBox(self)
-            choice_dialog.setWindowTitle(i18n.t("reset_options"))
-            choice_dialog.setText(i18n.t("reset_options_message"))
-            choice_dialog.setInformativeText(i18n.t("reset_options_info"))
+            choice_dialog.setWindowTitle(self.i18n.t("reset_options"))
+            choice_dialog.setText(self.i18n.t("reset_options_message"))
+            choice_dialog.setInformativeText(self.i18n.t("reset_options_info"))
             
             # 添加三个选择按钮
-            reset_defaults_only = choice_dialog.addButton(i18n.t("reset_defaults_only"), QMessageBox.ButtonRole.ActionRole)
-            reset_all = choice_dialog.addButton(i18n.t("reset_all_buttons"), QMessageBox.ButtonRole.ActionRole)
-            cancel_button = choice_dialog.addButton(i18n.t("cancel"), QMessageBox.ButtonRole.RejectRole)
+            reset_defaults_only = choice_dialog.addButton(self.i18n.t("reset_defaults_only"), QMessageBox.ButtonRole.ActionRole)
+            reset_all = choice_dialog.addButton(self.i18n.t("reset_all_buttons"), QMessageBox.ButtonRole.ActionRole)
+            cancel_button = choice_dialog.addButton(self.i18n.t("cancel"), QMessageBox.ButtonRole.RejectRole)
             
             choice_dialog.setDefaultButton(reset_defaults_only)
             choice_dialog.exec()
@@ -352,12 +353,6 @@ class QuickResponseEditDialog(QDialog):
         
         # 执行重置
         # 清理保存的快捷按钮配置
-        if hasattr(self.parent_ui, 'settings') and hasattr(self.parent_ui, 'project_group_name'):
-            self.parent_ui.settings.beginGroup(self.parent_ui.project_group_name)
-            self.parent_ui.settings.remove("quick_responses")  # 删除保存的快捷按钮配置
-            self.parent_ui.settings.endGroup()
-        
-        # 清理config_manager中的配置
         if hasattr(self.parent_ui, 'config_manager'):
             self.parent_ui.config_manager.save_quick_responses([])  # 清空保存的配置
         
@@ -458,7 +453,7 @@ class QuickResponseEditDialog(QDialog):
                 self.parent_ui.config["language"] = "en_US"
                 if old_language != "en_US":
                     # 语言发生变化，切换语言并更新按钮
-                    i18n.set_language("en_US")
+                    self.i18n.set_language("en_US")
                     self._update_buttons_for_language_change()
                     self._refresh_ui_text()
                     if hasattr(self.parent_ui, '_refresh_ui_text'):
@@ -468,7 +463,7 @@ class QuickResponseEditDialog(QDialog):
                 self.parent_ui.config["language"] = "zh_CN"
                 if old_language != "zh_CN":
                     # 语言发生变化，切换语言并更新按钮
-                    i18n.set_language("zh_CN")
+                    self.i18n.set_language("zh_CN")
                     self._update_buttons_for_language_change()
                     self._refresh_ui_text()
                     if hasattr(self.parent_ui, '_refresh_ui_text'):
@@ -502,28 +497,29 @@ class QuickResponseItemDialog(QDialog):
     
     def __init__(self, button_text, response_text, parent=None):
         super().__init__(parent)
-        self.setWindowTitle(i18n.t("edit_quick_button"))
+        self.i18n = getattr(parent, "i18n", i18n)
+        self.setWindowTitle(self.i18n.t("edit_quick_button"))
         self.setModal(True)
         self.resize(400, 200)
         
         layout = QVBoxLayout(self)
         
         # 按钮文本输入
-        layout.addWidget(QLabel(i18n.t("button_text")))
+        layout.addWidget(QLabel(self.i18n.t("button_text")))
         self.button_text_edit = QLineEdit(button_text)
         layout.addWidget(self.button_text_edit)
         
         # 反馈内容输入
-        layout.addWidget(QLabel(i18n.t("feedback_content")))
+        layout.addWidget(QLabel(self.i18n.t("feedback_content")))
         self.response_text_edit = QTextEdit(response_text)
         self.response_text_edit.setMaximumHeight(80)
         layout.addWidget(self.response_text_edit)
         
         # 按钮
         button_layout = QHBoxLayout()
-        ok_button = QPushButton(i18n.t("ok"))
+        ok_button = QPushButton(self.i18n.t("ok"))
         ok_button.clicked.connect(self.accept)
-        cancel_button = QPushButton(i18n.t("cancel"))
+        cancel_button = QPushButton(self.i18n.t("cancel"))
         cancel_button.clicked.connect(self.reject)
         
         button_layout.addStretch()
@@ -555,7 +551,8 @@ class TempImagesCleanupDialog(QDialog):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setWindowTitle(i18n.t("cleanup_temp_images"))
+        self.i18n = getattr(parent, "i18n", i18n)
+        self.setWindowTitle(self.i18n.t("cleanup_temp_images"))
         self.setModal(True)
         self.resize(500, 300)
         self.cleanup_thread = None
@@ -567,7 +564,7 @@ class TempImagesCleanupDialog(QDialog):
         layout = QVBoxLayout(self)
         
         # 信息区域
-        info_group = QGroupBox(i18n.t("temp_images_info"))
+        info_group = QGroupBox(self.i18n.t("temp_images_info"))
         info_layout = QVBoxLayout(info_group)
         
         self.path_label = QLabel()
@@ -581,15 +578,15 @@ class TempImagesCleanupDialog(QDialog):
         layout.addWidget(info_group)
         
         # 清理选项
-        options_group = QGroupBox(i18n.t("cleanup_options"))
+        options_group = QGroupBox(self.i18n.t("cleanup_options"))
         options_layout = QVBoxLayout(options_group)
         
         days_layout = QHBoxLayout()
-        days_layout.addWidget(QLabel(i18n.t("cleanup_days_old")))
+        days_layout.addWidget(QLabel(self.i18n.t("cleanup_days_old")))
         self.days_spin = QLineEdit("7")
         self.days_spin.setMaximumWidth(60)
         days_layout.addWidget(self.days_spin)
-        days_layout.addWidget(QLabel(i18n.t("days")))
+        days_layout.addWidget(QLabel(self.i18n.t("days")))
         days_layout.addStretch()
         
         options_layout.addLayout(days_layout)
@@ -609,17 +606,17 @@ class TempImagesCleanupDialog(QDialog):
         # 按钮
         button_layout = QHBoxLayout()
         
-        self.refresh_button = QPushButton(i18n.t("refresh"))
+        self.refresh_button = QPushButton(self.i18n.t("refresh"))
         self.refresh_button.clicked.connect(self.refresh_info)
         button_layout.addWidget(self.refresh_button)
         
-        self.cleanup_button = QPushButton(i18n.t("start_cleanup"))
+        self.cleanup_button = QPushButton(self.i18n.t("start_cleanup"))
         self.cleanup_button.clicked.connect(self.start_cleanup)
         button_layout.addWidget(self.cleanup_button)
         
         button_layout.addStretch()
         
-        close_button = QPushButton(i18n.t("close"))
+        close_button = QPushButton(self.i18n.t("close"))
         close_button.clicked.connect(self.accept)
         button_layout.addWidget(close_button)
         
@@ -628,7 +625,7 @@ class TempImagesCleanupDialog(QDialog):
     def refresh_info(self):
         """刷新信息"""
         temp_dir = get_temp_images_dir()
-        self.path_label.setText(f"{i18n.t('temp_directory')}: {temp_dir}")
+        self.path_label.setText(f"{self.i18n.t('temp_directory')}: {temp_dir}")
         
         if os.path.exists(temp_dir):
             files = [f for f in os.listdir(temp_dir) if f.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp'))]
@@ -638,18 +635,18 @@ class TempImagesCleanupDialog(QDialog):
                 if os.path.isfile(file_path):
                     total_size += os.path.getsize(file_path)
             
-            self.count_label.setText(f"{i18n.t('file_count')}: {len(files)}")
-            self.size_label.setText(f"{i18n.t('total_size')}: {self.format_size(total_size)}")
+            self.count_label.setText(f"{self.i18n.t('file_count')}: {len(files)}")
+            self.size_label.setText(f"{self.i18n.t('total_size')}: {self.format_size(total_size)}")
         else:
-            self.count_label.setText(f"{i18n.t('file_count')}: 0")
-            self.size_label.setText(f"{i18n.t('total_size')}: 0 B")
+            self.count_label.setText(f"{self.i18n.t('file_count')}: 0")
+            self.size_label.setText(f"{self.i18n.t('total_size')}: 0 B")
     
     def start_cleanup(self):
         """开始清理"""
         try:
             days_old = int(self.days_spin.text())
         except ValueError:
-            QMessageBox.warning(self, i18n.t("error"), i18n.t("invalid_days_input"))
+            QMessageBox.warning(self, self.i18n.t("error"), self.i18n.t("invalid_days_input"))
             return
         
         self.cleanup_button.setEnabled(False)
@@ -670,18 +667,18 @@ class TempImagesCleanupDialog(QDialog):
         # 格式化结果文本
         result_text = []
         if result.get('success', False):
-            result_text.append(i18n.t("cleanup_success"))
-            result_text.append(f"{i18n.t('deleted_files')}: {result.get('deleted_count', 0)}")
-            result_text.append(f"{i18n.t('freed_space')}: {self.format_size(result.get('freed_size', 0))}")
+            result_text.append(self.i18n.t("cleanup_success"))
+            result_text.append(f"{self.i18n.t('deleted_files')}: {result.get('deleted_count', 0)}")
+            result_text.append(f"{self.i18n.t('freed_space')}: {self.format_size(result.get('freed_size', 0))}")
             
             if result.get('errors'):
-                result_text.append(f"\n{i18n.t('errors')}:")
+                result_text.append(f"\n{self.i18n.t('errors')}:")
                 for error in result['errors']:
                     result_text.append(f"- {error}")
         else:
-            result_text.append(i18n.t("cleanup_failed"))
+            result_text.append(self.i18n.t("cleanup_failed"))
             if result.get('error'):
-                result_text.append(f"{i18n.t('error')}: {result['error']}")
+                result_text.append(f"{self.i18n.t('error')}: {result['error']}")
         
         self.result_text.setPlainText('\n'.join(result_text))
         
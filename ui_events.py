@@ -1,13 +1,11 @@
 """
 UI事件处理模块 - 负责处理各种UI事件
 """
-import subprocess
-import threading
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QTextCursor
 
-from i18n import i18n
 from ui_utils import kill_tree, get_user_environment
+from metrics import timed
 
 
 class UIEventManager:
@@ -25,12 +23,13 @@ class UIEventManager:
         cursor.movePosition(QTextCursor.End)
         self.parent_ui.log_text.setTextCursor(cursor)
     
+    @timed("ui.process_poll_ms")
     def check_process_status(self):
         """检查进程状态"""
         if self.parent_ui.process and self.parent_ui.process.poll() is not None:
             # 进程已终止
             exit_code = self.parent_ui.process.poll()
-            self.append_log(f"\n{i18n.t('process_exited')} {exit_code}\n")
+            self.append_log(f"\n{self.parent_ui.i18n.t('process_exited')} {exit_code}\n")
             self.parent_ui.run_button.setText("&Run")
             self.parent_ui.process = None
             self.parent_ui.activateWindow()
@@ -58,12 +57,16 @@ class UIEventManager:
 
         command = self.parent_ui.command_entry.text()
         if not command:
-            self.append_log(i18n.t("please_enter_command"))
+            self.append_log(self.parent_ui.i18n.t("please_enter_command"))
             return
 
         self.append_log(f"$ {command}\n")
         self.parent_ui.run_button.setText("Sto&p")
 
+        # 命令执行相关模块在首次运行命令时才导入
+        import subprocess
+        import threading
+
         try:
             self.parent_ui.process = subprocess.Popen(
                 command,
@@ -106,7 +109,7 @@ class UIEventManager:
             self.status_timer.start(check_interval)
 
         except Exception as e:
-            self.append_log(f"{i18n.t('error_running_command')}: {str(e)}\n")
+            self.append_log(f"{self.parent_ui.i18n.t('error_running_command')}: {str(e)}\n")
             self.parent_ui.run_button.setText("&Run")
     
     def clear_logs(self):
@@ -123,10 +126,8 @@ class UIEventManager:
         else:
             self.parent_ui.toggle_command_button.setText("Show Command Section")
         
-        # 立即保存此项目的可见性状态
-        self.parent_ui.settings.beginGroup(self.parent_ui.project_group_name)
-        self.parent_ui.settings.setValue("commandSectionVisible", self.parent_ui.command_group.isVisible())
-        self.parent_ui.settings.endGroup()
+        # 记录此项目的可见性状态（延迟写回）
+        self.parent_ui.config_manager.set_value("commandSectionVisible", self.parent_ui.command_group.isVisible())
 
         # 仅调整窗口高度
         new_height = self.parent_ui.centralWidget().sizeHint().height()
@@ -155,16 +156,16 @@ class UIEventManager:
     
     def handle_close_event(self, event):
         """处理窗口关闭事件"""
-        # 保存主窗口的通用UI设置（几何、状态）
-        self.parent_ui.settings.beginGroup("MainWindow_General")
-        self.parent_ui.settings.setValue("geometry", self.parent_ui.saveGeometry())
-        self.parent_ui.settings.setValue("windowState", self.parent_ui.saveState())
-        self.parent_ui.settings.endGroup()
-
-        # 保存项目特定的命令区域可见性（由于toggle中的立即保存，这里稍有冗余，但无害）
-        self.parent_ui.settings.beginGroup(self.parent_ui.project_group_name)
-        self.parent_ui.settings.setValue("commandSectionVisible", self.parent_ui.command_group.isVisible())
-        self.parent_ui.settings.endGroup()
+        # 保存主窗口的通用UI设置（几何、状态），嵌入标签页时不保存
+        if self.parent_ui.isWindow():
+            self.parent_ui.settings.beginGroup("MainWindow_General")
+            self.parent_ui.settings.setValue("geometry", self.parent_ui.saveGeometry())
+            self.parent_ui.settings.setValue("windowState", self.parent_ui.saveState())
+            self.parent_ui.settings.endGroup()
+
+        # 保存项目特定的命令区域可见性，并写回所有未保存的项目配置
+        self.parent_ui.config_manager.set_value("commandSectionVisible", self.parent_ui.command_group.isVisible())
+        self.parent_ui.config_manager.flush()
 
         if self.parent_ui.process:
             kill_tree(self.parent_ui.process)
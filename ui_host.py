@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI宿主进程模块 - 常驻进程，保持QApplication和已导入模块存活，按请求创建反馈窗口
+
+默认所有请求以标签页形式显示在同一个窗口中，由调度队列按优先级和项目公平性决定打开顺序。
+
+通信协议见 ipc_protocol.py（stdin/stdout上的分帧协议）：
+  请求帧: feedback {"id", "project_directory", "prompt", "priority", "questions", "trace_id"} / cancel {"id"} / metrics {"id"}
+  响应帧: ready / 结果帧序列（logs、text、attachment、end）/ error {"id", "error"} / metrics {"id"}（JSON快照）
+stdin 关闭时宿主进程退出。
+"""
+import os
+import sys
+import json
+import threading
+from collections import OrderedDict
+from functools import partial
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QObject, Signal
+
+from ipc_protocol import (
+    FRAME_READY, FRAME_FEEDBACK, FRAME_CANCEL, FRAME_ERROR, FRAME_METRICS,
+    ProtocolError, read_frame, write_frame, write_result_frames
+)
+from config import STICKY_WINDOW_ENV, STICKY_WINDOW_LIMIT, TABBED_WINDOW_ENV, MAX_OPEN_TABS
+from feedback_scheduler import FeedbackScheduler
+import tracing
+from metrics import metrics
+from profiling import SessionProfiler, is_profiling_enabled
+from ui_watchdog import EventLoopWatchdog, is_watchdog_enabled
+from ui_utils import get_dark_mode_palette, kill_tree
+from ui_tab_window import FeedbackTabWindow
+from feedback_ui import FeedbackUI
+
+
+class HostSignals(QObject):
+    """宿主信号类 - 将stdin读取线程收到的请求转交给GUI线程"""
+    request_received = Signal(dict)
+    input_closed = Signal()
+
+
+class FeedbackUIHost(QObject):
+    """常驻UI宿主：复用同一个QApplication，为每个请求创建反馈窗口"""
+
+    def __init__(self, app: QApplication, output_stream):
+        super().__init__()
+        self.app = app
+        self.output_stream = output_stream
+        self._output_lock = threading.Lock()
+        self.windows = {}  # 请求ID -> FeedbackUI
+        # 粘性模式：按项目目录保留空闲窗口，下次调用只替换提示内容
+        self.sticky = os.environ.get(STICKY_WINDOW_ENV, "0") == "1"
+        self.idle_windows: "OrderedDict[str, FeedbackUI]" = OrderedDict()
+        # 标签页模式：所有请求共用一个窗口，超出上限的请求在调度队列中等待
+        self.tabbed = os.environ.get(TABBED_WINDOW_ENV, "1") != "0"
+        self.scheduler = FeedbackScheduler()
+        self._tab_window: FeedbackTabWindow = None
+        # 会话剖析：从空闲转为有请求时开始，所有请求结束后保存一份结果
+        self.profiler = SessionProfiler("ui_host") if is_profiling_enabled() else None
+        # 卡顿检测：只在有请求时运行，空闲的宿主进程不做心跳唤醒
+        self.watchdog = EventLoopWatchdog() if is_watchdog_enabled() else None
+
+        self.signals = HostSignals()
+        self.signals.request_received.connect(self.handle_request)
+        self.signals.input_closed.connect(self.app.quit)
+
+    def start_reader(self, input_stream):
+        """启动stdin读取线程"""
+        def read_requests():
+            try:
+                while True:
+                    frame = read_frame(input_stream)
+                    if frame is None:
+                        break
+                    self.signals.request_received.emit(frame[0])
+            except (ProtocolError, OSError):
+                pass
+            self.signals.input_closed.emit()
+
+        threading.Thread(target=read_requests, daemon=True).start()
+
+    def send(self, header: dict, payload: bytes = b""):
+        """向服务端发送一帧"""
+        with self._output_lock:
+            write_frame(self.output_stream, header, payload)
+
+    def send_result(self, request_id, result: dict):
+        """以帧序列回传一次反馈结果"""
+        with self._output_lock:
+            write_result_frames(self.output_stream, request_id, result)
+
+    def handle_request(self, request: dict):
+        """处理一条反馈请求"""
+        if request.get("type") == FRAME_CANCEL:
+            self.cancel_request(request.get("id"))
+            return
+        if request.get("type") == FRAME_METRICS:
+            payload = json.dumps(metrics.snapshot()).encode("utf-8")
+            self.send({"type": FRAME_METRICS, "id": request.get("id")}, payload)
+            return
+        if request.get("type") != FRAME_FEEDBACK:
+            return
+
+        try:
+            priority = int(request.get("priority", 0))
+        except (TypeError, ValueError):
+            priority = 0
+        if self.profiler is not None:
+            self.profiler.start()
+        if self.watchdog is not None:
+            self.watchdog.start()
+        self.scheduler.push(request.get("id"), request.get("project_directory", ""), priority, request)
+        self._open_scheduled()
+
+    @property
+    def tab_window(self) -> FeedbackTabWindow:
+        """标签页窗口（首次使用时创建）"""
+        if self._tab_window is None:
+            self._tab_window = FeedbackTabWindow()
+            self._tab_window.close_all_requested.connect(self.finish_all)
+        return self._tab_window
+
+    def _open_scheduled(self):
+        """按调度顺序打开排队中的请求，直到达到标签页上限"""
+        while len(self.scheduler) > 0 and (not self.tabbed or len(self.windows) < MAX_OPEN_TABS):
+            request_id, request = self.scheduler.pop()
+            self._open_window(request_id, request)
+        if self.tabbed and self._tab_window is not None:
+            self._tab_window.set_queued_count(len(self.scheduler))
+        metrics.set_gauge("host.open_windows", len(self.windows))
+        metrics.set_gauge("host.queued_requests", len(self.scheduler))
+        metrics.set_gauge("host.idle_windows", len(self.idle_windows))
+        if not self.windows and len(self.scheduler) == 0:
+            if self.profiler is not None:
+                self.profiler.stop()
+            if self.watchdog is not None:
+                self.watchdog.stop()
+
+    def _open_window(self, request_id, request: dict):
+        """为一条请求创建（或复用）反馈界面并显示"""
+        project_directory = request.get("project_directory", "")
+        prompt = request.get("prompt", "")
+        questions = request.get("questions")
+        trace_id = request.get("trace_id")
+
+        ui = self.idle_windows.pop(project_directory, None)
+        if ui is not None:
+            ui.reset_for_prompt(prompt, questions, trace_id)
+        else:
+            try:
+                ui = FeedbackUI(project_directory, prompt, questions, trace_id)
+            except Exception as e:
+                self.send({"type": FRAME_ERROR, "id": request_id, "error": f"创建反馈窗口失败: {str(e)}"})
+                return
+
+        ui.feedback_finished.connect(partial(self._on_feedback_finished, request_id))
+        self.windows[request_id] = ui
+        if self.tabbed:
+            self.tab_window.add_feedback(ui, request.get("priority", 0))
+            ui.show()
+        else:
+            ui.show()
+            ui.raise_()
+            ui.activateWindow()
+
+    def cancel_request(self, request_id):
+        """取消请求：关闭对应窗口（或移出队列）且不回传结果"""
+        if self.scheduler.remove(request_id):
+            self._open_scheduled()
+            return
+
+        ui = self.windows.pop(request_id, None)
+        if ui is not None:
+            ui.feedback_finished.disconnect()
+            ui.close()
+            self._release_window(ui)
+            self._open_scheduled()
+
+    def finish_all(self):
+        """用户关闭标签页窗口：排队中的请求返回空反馈，打开的请求按当前内容结束"""
+        while len(self.scheduler) > 0:
+            request_id, _ = self.scheduler.pop()
+            self.send_result(request_id, {"logs": "", "interactive_feedback": ""})
+        for ui in list(self.windows.values()):
+            ui.close()
+
+    def _on_feedback_finished(self, request_id, result: dict):
+        """窗口关闭后回传结果并释放窗口"""
+        ui = self.windows.pop(request_id, None)
+        if ui is None:
+            # 请求已被取消
+            return
+        ui.feedback_finished.disconnect()
+        self._release_window(ui)
+        with tracing.span("write_result_frames", trace_id=ui.trace_id):
+            self.send_result(request_id, dict(result))
+        metrics.inc("host.feedback_finished")
+        self._open_scheduled()
+        metrics.export_json()
+
+    def _release_window(self, ui: FeedbackUI):
+        """终止窗口中仍在运行的命令，粘性模式下保留窗口以便复用，否则释放"""
+        if ui.process:
+            kill_tree(ui.process)
+            ui.process = None
+        if self.tabbed and self._tab_window is not None:
+            self._tab_window.remove_feedback(ui)
+
+        if self.sticky and ui.project_directory not in self.idle_windows:
+            self.idle_windows[ui.project_directory] = ui
+            while len(self.idle_windows) > STICKY_WINDOW_LIMIT:
+                _, oldest = self.idle_windows.popitem(last=False)
+                oldest.deleteLater()
+            return
+        ui.deleteLater()
+
+
+def main():
+    """宿主进程入口"""
+    # 协议独占真实stdout，其余print输出重定向到stderr，避免污染协议流
+    protocol_out = sys.stdout.buffer
+    sys.stdout = sys.stderr
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    app.setPalette(get_dark_mode_palette(app))
+    app.setStyle("Fusion")
+    app.setQuitOnLastWindowClosed(False)
+
+    host = FeedbackUIHost(app, protocol_out)
+    host.start_reader(sys.stdin.buffer)
+    host.send({"type": FRAME_READY})
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+UI宿主客户端模块 - 负责在服务端启动并复用常驻UI宿主进程（ui_host.py）
+
+基于asyncio子进程实现，多个反馈请求可以同时进行，互不阻塞。
+"""
+import os
+import sys
+import json
+import uuid
+import asyncio
+from typing import Optional
+
+from config import UI_HOST_READY_TIMEOUT
+from ipc_protocol import (
+    FRAME_READY, FRAME_FEEDBACK, FRAME_CANCEL, FRAME_ERROR, FRAME_METRICS,
+    ProtocolError, ResultAssembler, encode_frame, read_frame_async
+)
+
+
+class UIHostClient:
+    """常驻UI宿主进程客户端"""
+
+    def __init__(self):
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Future] = None
+        self._pending: dict[str, asyncio.Future] = {}
+        self._assemblers: dict[str, ResultAssembler] = {}
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def host_script(self) -> str:
+        """获取ui_host.py的路径"""
+        return os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui_host.py")
+
+    def is_running(self) -> bool:
+        """宿主进程是否存活"""
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self):
+        """启动宿主进程（已在运行时直接返回，不等待就绪）"""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+            self._write_lock = asyncio.Lock()
+
+        async with self._start_lock:
+            if self.is_running():
+                return
+
+            self._ready = asyncio.get_running_loop().create_future()
+            self._process = await asyncio.create_subprocess_exec(
+                sys.executable, "-u", self.host_script,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                close_fds=True,
+            )
+            self._reader_task = asyncio.create_task(self._read_loop(self._process, self._ready))
+
+    async def _read_loop(self, process: asyncio.subprocess.Process, ready: asyncio.Future):
+        """读取宿主进程的帧并分发给对应的等待者"""
+        try:
+            while True:
+                frame = await read_frame_async(process.stdout)
+                if frame is None:
+                    break
+                header, payload = frame
+
+                frame_type = header.get("type")
+                if frame_type == FRAME_READY:
+                    if not ready.done():
+                        ready.set_result(True)
+                    continue
+
+                request_id = header.get("id")
+                if request_id not in self._pending:
+                    # 已取消的请求，丢弃其帧
+                    continue
+                if frame_type == FRAME_METRICS:
+                    future = self._pending.pop(request_id)
+                    if not future.done():
+                        future.set_result(json.loads(payload.decode("utf-8")))
+                    continue
+                if frame_type == FRAME_ERROR:
+                    self._assemblers.pop(request_id, None)
+                    future = self._pending.pop(request_id)
+                    if not future.done():
+                        future.set_exception(Exception(header.get("error", "Feedback UI host error")))
+                    continue
+
+                assembler = self._assemblers.setdefault(request_id, ResultAssembler())
+                if assembler.feed(header, payload):
+                    del self._assemblers[request_id]
+                    future = self._pending.pop(request_id)
+                    if not future.done():
+                        future.set_result(assembler.result())
+        except ProtocolError:
+            self._kill()
+        finally:
+            # 宿主进程退出：通知所有等待者
+            if not ready.done():
+                ready.set_exception(Exception("Failed to start feedback UI host"))
+            if self._process is process:
+                for future in self._pending.values():
+                    if not future.done():
+                        future.set_exception(Exception("Feedback UI host exited unexpectedly"))
+                self._pending.clear()
+                self._assemblers.clear()
+
+    async def _wait_ready(self):
+        """等待宿主进程完成QApplication初始化"""
+        try:
+            await asyncio.wait_for(asyncio.shield(self._ready), UI_HOST_READY_TIMEOUT)
+        except asyncio.TimeoutError:
+            self._kill()
+            raise Exception("Failed to start feedback UI host")
+
+    async def _send(self, header: dict):
+        """向宿主进程发送一帧"""
+        async with self._write_lock:
+            self._process.stdin.write(encode_frame(header))
+            await self._process.stdin.drain()
+
+    def _kill(self):
+        """终止宿主进程"""
+        if self.is_running():
+            try:
+                self._process.kill()
+            except Exception:
+                pass
+
+    async def request_feedback(self, project_directory: str, summary: str, priority: int = 0,
+                               questions: Optional[list] = None, trace_id: Optional[str] = None) -> dict:
+        """请求宿主进程显示反馈窗口并等待结果，取消时关闭对应窗口"""
+        await self.start()
+        await self._wait_ready()
+
+        request_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._send({
+                "type": FRAME_FEEDBACK,
+                "id": request_id,
+                "project_directory": project_directory,
+                "prompt": summary,
+                "priority": priority,
+                "questions": questions,
+                "trace_id": trace_id,
+            })
+        except (OSError, RuntimeError) as e:
+            self._pending.pop(request_id, None)
+            self._kill()
+            raise Exception(f"Failed to send request to feedback UI host: {e}")
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            self._pending.pop(request_id, None)
+            self._assemblers.pop(request_id, None)
+            if self.is_running():
+                try:
+                    await self._send({"type": FRAME_CANCEL, "id": request_id})
+                except (OSError, RuntimeError):
+                    pass
+            raise
+
+    async def request_metrics(self, timeout: float = 5) -> Optional[dict]:
+        """获取宿主进程的指标快照，宿主未运行或超时时返回None"""
+        if not self.is_running() or self._ready is None or not self._ready.done():
+            return None
+
+        request_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._send({"type": FRAME_METRICS, "id": request_id})
+            return await asyncio.wait_for(future, timeout)
+        except (OSError, RuntimeError, asyncio.TimeoutError):
+            return None
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def stop(self):
+        """关闭宿主进程（关闭stdin后宿主自行退出）"""
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+            await asyncio.wait_for(self._process.wait(), 5)
+        except Exception:
+            self._kill()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        self._process = None
+        self._reader_task = None
+
+
+# 全局实例
+ui_host_client = UIHostClient()
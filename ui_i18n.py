@@ -1,7 +1,6 @@
 """
 国际化UI模块 - 负责UI文本刷新和语言切换
 """
-from i18n import i18n
 
 
 class UIInternationalization:
@@ -19,67 +18,71 @@ class UIInternationalization:
                 
                 # 更新命令区域
                 if hasattr(self.parent_ui, 'command_group') and self.parent_ui.command_group is not None:
-                    self.parent_ui.command_group.setTitle(i18n.t("command"))
+                    self.parent_ui.command_group.setTitle(self.parent_ui.i18n.t("command"))
                 
                 if hasattr(self.parent_ui, 'run_command_edit') and self.parent_ui.run_command_edit is not None:
-                    self.parent_ui.run_command_edit.setPlaceholderText(i18n.t("placeholder_command"))
+                    self.parent_ui.run_command_edit.setPlaceholderText(self.parent_ui.i18n.t("placeholder_command"))
                 
                 if hasattr(self.parent_ui, 'execute_checkbox') and self.parent_ui.execute_checkbox is not None:
-                    self.parent_ui.execute_checkbox.setText(i18n.t("auto_execute"))
+                    self.parent_ui.execute_checkbox.setText(self.parent_ui.i18n.t("auto_execute"))
                 
                 if hasattr(self.parent_ui, 'run_button') and self.parent_ui.run_button is not None:
-                    self.parent_ui.run_button.setText(i18n.t("run"))
+                    self.parent_ui.run_button.setText(self.parent_ui.i18n.t("run"))
                 
                 if hasattr(self.parent_ui, 'clear_button') and self.parent_ui.clear_button is not None:
-                    self.parent_ui.clear_button.setText(i18n.t("clear"))
+                    self.parent_ui.clear_button.setText(self.parent_ui.i18n.t("clear"))
                 
                 if hasattr(self.parent_ui, 'submit_button') and self.parent_ui.submit_button is not None:
-                    self.parent_ui.submit_button.setText(i18n.t("send_feedback"))
+                    self.parent_ui.submit_button.setText(self.parent_ui.i18n.t("send_feedback"))
             except RuntimeError:
                 # UI对象已被删除，忽略此错误
                 pass
             
             try:
                 if hasattr(self.parent_ui, 'feedback_text') and self.parent_ui.feedback_text is not None:
-                    self.parent_ui.feedback_text.setPlaceholderText(i18n.t("placeholder_feedback"))
+                    self.parent_ui.feedback_text.setPlaceholderText(self.parent_ui.i18n.t("placeholder_feedback"))
                 
                 if hasattr(self.parent_ui, 'working_dir_label') and self.parent_ui.working_dir_label is not None:
                     formatted_path = self.parent_ui._format_windows_path(self.parent_ui.project_directory)
-                    self.parent_ui.working_dir_label.setText(f"{i18n.t('working_directory')}: {formatted_path}")
+                    self.parent_ui.working_dir_label.setText(f"{self.parent_ui.i18n.t('working_directory')}: {formatted_path}")
                 
                 # 更新组框标题
                 if hasattr(self.parent_ui, 'command_group') and self.parent_ui.command_group is not None:
-                    self.parent_ui.command_group.setTitle(i18n.t("command"))
+                    self.parent_ui.command_group.setTitle(self.parent_ui.i18n.t("command"))
                 
                 if hasattr(self.parent_ui, 'feedback_group') and self.parent_ui.feedback_group is not None:
-                    self.parent_ui.feedback_group.setTitle(i18n.t("feedback"))
+                    self.parent_ui.feedback_group.setTitle(self.parent_ui.i18n.t("feedback"))
                 
                 # 更新反馈后缀选项
                 if hasattr(self.parent_ui, 'suffix_group') and self.parent_ui.suffix_group is not None:
-                    self.parent_ui.suffix_group.setTitle(i18n.t("feedback_suffix_options"))
+                    self.parent_ui.suffix_group.setTitle(self.parent_ui.i18n.t("feedback_suffix_options"))
                 
                 if hasattr(self.parent_ui, 'suffix_radio_force') and self.parent_ui.suffix_radio_force is not None:
-                    self.parent_ui.suffix_radio_force.setText(i18n.t("force_mcp_call"))
-                    self.parent_ui.suffix_radio_force.setToolTip(i18n.t("force_mcp_tooltip"))
+                    self.parent_ui.suffix_radio_force.setText(self.parent_ui.i18n.t("force_mcp_call"))
+                    self.parent_ui.suffix_radio_force.setToolTip(self.parent_ui.i18n.t("force_mcp_tooltip"))
                 
                 if hasattr(self.parent_ui, 'suffix_radio_smart') and self.parent_ui.suffix_radio_smart is not None:
-                    self.parent_ui.suffix_radio_smart.setText(i18n.t("smart_judgment"))
-                    self.parent_ui.suffix_radio_smart.setToolTip(i18n.t("smart_judgment_tooltip"))
+                    self.parent_ui.suffix_radio_smart.setText(self.parent_ui.i18n.t("smart_judgment"))
+                    self.parent_ui.suffix_radio_smart.setToolTip(self.parent_ui.i18n.t("smart_judgment_tooltip"))
                 
                 if hasattr(self.parent_ui, 'suffix_radio_none') and self.parent_ui.suffix_radio_none is not None:
-                    self.parent_ui.suffix_radio_none.setText(i18n.t("no_special_append"))
-                    self.parent_ui.suffix_radio_none.setToolTip(i18n.t("no_append_tooltip"))
+                    self.parent_ui.suffix_radio_none.setText(self.parent_ui.i18n.t("no_special_append"))
+                    self.parent_ui.suffix_radio_none.setToolTip(self.parent_ui.i18n.t("no_append_tooltip"))
+                
+                if hasattr(self.parent_ui, 'follow_up_checkbox') and self.parent_ui.follow_up_checkbox is not None:
+                    self.parent_ui.follow_up_checkbox.setText(self.parent_ui.i18n.t("allow_follow_up"))
+                    self.parent_ui.follow_up_checkbox.setToolTip(self.parent_ui.i18n.t("allow_follow_up_tooltip"))
                 
                 # 更新图片传输选项区域
                 if hasattr(self.parent_ui, 'image_transmission_group') and self.parent_ui.image_transmission_group is not None:
-                    self.parent_ui.image_transmission_group.setTitle(i18n.t("image_transmission_options"))
+                    self.parent_ui.image_transmission_group.setTitle(self.parent_ui.i18n.t("image_transmission_options"))
                 
                 if hasattr(self.parent_ui, 'base64_checkbox') and self.parent_ui.base64_checkbox is not None:
-                    self.parent_ui.base64_checkbox.setText(i18n.t("enable_base64_transmission"))
-                    self.parent_ui.base64_checkbox.setToolTip(i18n.t("base64_transmission_tooltip"))
+                    self.parent_ui.base64_checkbox.setText(self.parent_ui.i18n.t("enable_base64_transmission"))
+                    self.parent_ui.base64_checkbox.setToolTip(self.parent_ui.i18n.t("base64_transmission_tooltip"))
                 
                 if hasattr(self.parent_ui, 'size_limit_label') and self.parent_ui.size_limit_label is not None:
-                    self.parent_ui.size_limit_label.setText(i18n.t("target_size"))
+                    self.parent_ui.size_limit_label.setText(self.parent_ui.i18n.t("target_size"))
             except RuntimeError:
                 # UI对象已被删除，忽略此错误
                 pass
@@ -12,8 +12,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont, QFontDatabase
 
-from i18n import i18n
 from clipboard_image_widget import ClipboardImageWidget
+from question_form import QuestionFormWidget
 from ui_utils import FeedbackTextEdit
 
 
@@ -66,7 +66,7 @@ class UILayoutManager:
     def _create_working_directory_label(self, layout):
         """创建工作目录标签"""
         formatted_path = self._format_windows_path(self.parent_ui.project_directory)
-        self.parent_ui.working_dir_label = QLabel(f"{i18n.t('working_directory')}: {formatted_path}")
+        self.parent_ui.working_dir_label = QLabel(f"{self.parent_ui.i18n.t('working_directory')}: {formatted_path}")
         layout.addWidget(self.parent_ui.working_dir_label)
     
     def _create_command_input_row(self, layout):
@@ -94,11 +94,11 @@ class UILayoutManager:
         self.parent_ui.auto_check.stateChanged.connect(self.parent_ui.settings_manager.update_config_from_ui)
 
         # 工具菜单按钮
-        self.parent_ui.tools_button = QPushButton(i18n.t("tools_menu"))
-        self.parent_ui.tools_button.setToolTip(i18n.t("tools_menu_tooltip"))
+        self.parent_ui.tools_button = QPushButton(self.parent_ui.i18n.t("tools_menu"))
+        self.parent_ui.tools_button.setToolTip(self.parent_ui.i18n.t("tools_menu_tooltip"))
         self.parent_ui.tools_button.clicked.connect(self._show_tools_menu)
 
-        self.parent_ui.save_button = QPushButton(i18n.t("save_configuration"))
+        self.parent_ui.save_button = QPushButton(self.parent_ui.i18n.t("save_configuration"))
         self.parent_ui.save_button.clicked.connect(self.parent_ui.settings_manager.save_config)
 
         auto_layout.addWidget(self.parent_ui.auto_check)
@@ -139,6 +139,9 @@ class UILayoutManager:
         # 描述标签
         self._create_description_label(feedback_layout)
         
+        # 批量问题表单（没有问题时隐藏）
+        self._create_question_form(feedback_layout)
+        
         # 快捷按钮区域
         self._create_quick_response_buttons(feedback_layout)
         
@@ -168,6 +171,12 @@ class UILayoutManager:
         self.parent_ui.description_label.setWordWrap(True)
         layout.addWidget(self.parent_ui.description_label)
     
+    def _create_question_form(self, layout):
+        """创建批量问题表单"""
+        self.parent_ui.question_form = QuestionFormWidget(translator=self.parent_ui.i18n)
+        self.parent_ui.question_form.set_questions(self.parent_ui.questions)
+        layout.addWidget(self.parent_ui.question_form)
+    
     def _create_quick_response_buttons(self, layout):
         """创建快捷按钮区域"""
         # 确保完全清理之前的按钮
@@ -242,18 +251,18 @@ class UILayoutManager:
     
     def _create_feedback_text_area(self, layout):
         """创建反馈文本区域"""
-        self.parent_ui.feedback_text = FeedbackTextEdit()
+        self.parent_ui.feedback_text = FeedbackTextEdit(translator=self.parent_ui.i18n)
         font_metrics = self.parent_ui.feedback_text.fontMetrics()
         row_height = font_metrics.height()
         padding = (self.parent_ui.feedback_text.contentsMargins().top() + 
                   self.parent_ui.feedback_text.contentsMargins().bottom() + 3)
         self.parent_ui.feedback_text.setMinimumHeight(4 * row_height + padding)
-        self.parent_ui.feedback_text.setPlaceholderText(i18n.t("placeholder_feedback"))
+        self.parent_ui.feedback_text.setPlaceholderText(self.parent_ui.i18n.t("placeholder_feedback"))
         layout.addWidget(self.parent_ui.feedback_text)
     
     def _create_clipboard_image_widget(self, layout):
         """创建剪贴板图片组件"""
-        self.parent_ui.clipboard_image_widget = ClipboardImageWidget()
+        self.parent_ui.clipboard_image_widget = ClipboardImageWidget(translator=self.parent_ui.i18n)
         self.parent_ui.clipboard_image_widget.images_changed.connect(self.parent_ui.event_manager.on_images_changed)
         layout.addWidget(self.parent_ui.clipboard_image_widget)
         
@@ -262,16 +271,16 @@ class UILayoutManager:
     
     def _create_image_transmission_options(self, layout):
         """创建图片传输选项"""
-        self.parent_ui.image_transmission_group = QGroupBox(i18n.t("image_transmission_options"))
+        self.parent_ui.image_transmission_group = QGroupBox(self.parent_ui.i18n.t("image_transmission_options"))
         transmission_layout = QHBoxLayout(self.parent_ui.image_transmission_group)
         transmission_layout.setContentsMargins(6, 6, 6, 6)
         transmission_layout.setSpacing(8)
         
-        self.parent_ui.base64_checkbox = QCheckBox(i18n.t("enable_base64_transmission"))
-        self.parent_ui.base64_checkbox.setToolTip(i18n.t("base64_transmission_tooltip"))
+        self.parent_ui.base64_checkbox = QCheckBox(self.parent_ui.i18n.t("enable_base64_transmission"))
+        self.parent_ui.base64_checkbox.setToolTip(self.parent_ui.i18n.t("base64_transmission_tooltip"))
         self.parent_ui.base64_checkbox.toggled.connect(self.parent_ui.settings_manager.update_base64_config)
         
-        self.parent_ui.size_limit_label = QLabel(i18n.t("target_size"))
+        self.parent_ui.size_limit_label = QLabel(self.parent_ui.i18n.t("target_size"))
         self.parent_ui.size_limit_combo = QComboBox()
         self.parent_ui.size_limit_combo.addItems(["30KB", "50KB", "80KB", "100KB"])
         self.parent_ui.size_limit_combo.setCurrentText("30KB")
@@ -286,21 +295,21 @@ class UILayoutManager:
     
     def _create_feedback_suffix_options(self, layout):
         """创建反馈后缀选项"""
-        self.parent_ui.suffix_group = QGroupBox(i18n.t("feedback_suffix_options"))
+        self.parent_ui.suffix_group = QGroupBox(self.parent_ui.i18n.t("feedback_suffix_options"))
         suffix_layout = QHBoxLayout(self.parent_ui.suffix_group)
         suffix_layout.setContentsMargins(6, 6, 6, 6)
         suffix_layout.setSpacing(8)
         
-        self.parent_ui.suffix_radio_force = QRadioButton(i18n.t("force_mcp_call"))
-        self.parent_ui.suffix_radio_force.setToolTip(i18n.t("force_mcp_tooltip"))
+        self.parent_ui.suffix_radio_force = QRadioButton(self.parent_ui.i18n.t("force_mcp_call"))
+        self.parent_ui.suffix_radio_force.setToolTip(self.parent_ui.i18n.t("force_mcp_tooltip"))
         self.parent_ui.suffix_radio_force.toggled.connect(self.parent_ui.settings_manager.update_suffix_config)
         
-        self.parent_ui.suffix_radio_smart = QRadioButton(i18n.t("smart_judgment"))
-        self.parent_ui.suffix_radio_smart.setToolTip(i18n.t("smart_judgment_tooltip"))
+        self.parent_ui.suffix_radio_smart = QRadioButton(self.parent_ui.i18n.t("smart_judgment"))
+        self.parent_ui.suffix_radio_smart.setToolTip(self.parent_ui.i18n.t("smart_judgment_tooltip"))
         self.parent_ui.suffix_radio_smart.toggled.connect(self.parent_ui.settings_manager.update_suffix_config)
         
-        self.parent_ui.suffix_radio_none = QRadioButton(i18n.t("no_special_append"))
-        self.parent_ui.suffix_radio_none.setToolTip(i18n.t("no_append_tooltip"))
+        self.parent_ui.suffix_radio_none = QRadioButton(self.parent_ui.i18n.t("no_special_append"))
+        self.parent_ui.suffix_radio_none.setToolTip(self.parent_ui.i18n.t("no_append_tooltip"))
         self.parent_ui.suffix_radio_none.toggled.connect(self.parent_ui.settings_manager.update_suffix_config)
         
         suffix_layout.addWidget(self.parent_ui.suffix_radio_force)
@@ -308,6 +317,12 @@ class UILayoutManager:
         suffix_layout.addWidget(self.parent_ui.suffix_radio_none)
         suffix_layout.addStretch()
         
+        self.parent_ui.follow_up_checkbox = QCheckBox(self.parent_ui.i18n.t("allow_follow_up"))
+        self.parent_ui.follow_up_checkbox.setToolTip(self.parent_ui.i18n.t("allow_follow_up_tooltip"))
+        self.parent_ui.follow_up_checkbox.setChecked(self.parent_ui.config.get("enable_follow_up", False))
+        self.parent_ui.follow_up_checkbox.toggled.connect(self.parent_ui.settings_manager.update_follow_up_config)
+        suffix_layout.addWidget(self.parent_ui.follow_up_checkbox)
+        
         layout.addWidget(self.parent_ui.suffix_group)
         
         # 设置初始状态
@@ -324,7 +339,7 @@ class UILayoutManager:
     
     def _create_submit_button(self, layout):
         """创建提交按钮"""
-        self.parent_ui.submit_button = QPushButton(i18n.t("send_feedback"))
+        self.parent_ui.submit_button = QPushButton(self.parent_ui.i18n.t("send_feedback"))
         self.parent_ui.submit_button.clicked.connect(self.parent_ui.feedback_logic_manager.submit_feedback)
         layout.addWidget(self.parent_ui.submit_button)
     
@@ -372,7 +387,7 @@ class UILayoutManager:
         menu = QMenu(self.parent_ui)
         
         # 临时文件清理
-        cleanup_action = menu.addAction("🗑️ " + i18n.t("cleanup_temp_images"))
+        cleanup_action = menu.addAction("🗑️ " + self.parent_ui.i18n.t("cleanup_temp_images"))
         cleanup_action.triggered.connect(self.parent_ui.event_manager.cleanup_temp_images)
         
         # 可以在这里添加更多工具选项
@@ -1,8 +1,12 @@
 """
 UI性能优化模块 - 负责UI性能优化和缓存管理
 """
+import time
+
 from PySide6.QtCore import QTimer
 
+from metrics import metrics
+
 
 class UIPerformanceManager:
     """UI性能优化管理器"""
@@ -16,14 +20,8 @@ class UIPerformanceManager:
         self._is_batch_updating = False  # 批量更新状态标志
         self._pending_layout_update = False  # 待处理的布局更新标志
         
-        # 性能监控
-        self._performance_stats = {
-            "button_rebuilds": 0,
-            "incremental_updates": 0,
-            "cache_hits": 0,
-            "cache_misses": 0,
-            "batch_updates": 0
-        }
+        # 性能监控：计数和耗时统一记录到进程内共享的指标注册表（metrics.py）
+        self.metrics = metrics
     
     def batch_ui_updates(self, func):
         """批量处理UI更新的装饰器方法"""
@@ -32,7 +30,8 @@ class UIPerformanceManager:
             return func()
             
         self._is_batch_updating = True
-        self._performance_stats["batch_updates"] += 1
+        self.metrics.inc("ui.batch_updates")
+        start = time.perf_counter()
         self.parent_ui.setUpdatesEnabled(False)
         try:
             result = func()
@@ -42,6 +41,7 @@ class UIPerformanceManager:
             self.parent_ui.setUpdatesEnabled(True)
             # 强制重绘一次
             self.parent_ui.update()
+            self.metrics.observe("ui.batch_update_ms", (time.perf_counter() - start) * 1000)
     
     def schedule_layout_update(self):
         """延迟布局更新，避免频繁重计算"""
@@ -64,11 +64,13 @@ class UIPerformanceManager:
     def _do_layout_update(self):
         """实际执行布局更新"""
         def update_func():
-            self.parent_ui.centralWidget().updateGeometry()
-            self.parent_ui.centralWidget().layout().invalidate()
-            self.parent_ui.centralWidget().layout().activate()
+            with self.metrics.timer("ui.layout_pass_ms"):
+                self.parent_ui.centralWidget().updateGeometry()
+                self.parent_ui.centralWidget().layout().invalidate()
+                self.parent_ui.centralWidget().layout().activate()
             return True
         
+        self.metrics.inc("ui.layout_passes")
         return self.batch_ui_updates(update_func)
     
 
@@ -95,7 +97,10 @@ class UIPerformanceManager:
     
     def get_performance_stats(self):
         """获取性能统计信息（用于调试）"""
-        return self._performance_stats.copy()
+        return {
+            name: self.metrics.counter(f"ui.{name}")
+            for name in ("button_rebuilds", "incremental_updates", "cache_hits", "cache_misses", "batch_updates", "stalls")
+        }
     
     def log_performance_stats(self):
         """输出性能统计到日志（用于调试）"""
@@ -104,6 +109,18 @@ class UIPerformanceManager:
         if stats["cache_hits"] + stats["cache_misses"] > 0:
             cache_hit_rate = stats["cache_hits"] / (stats["cache_hits"] + stats["cache_misses"]) * 100
         
+        snapshot = self.metrics.snapshot()
+        histogram_lines = "\n".join(
+            f"{name}: p50={h['p50']:.2f}ms p95={h['p95']:.2f}ms p99={h['p99']:.2f}ms (n={h['count']})"
+            for name, h in sorted(snapshot["histograms"].items())
+        )
+        # 最近一次卡顿的主线程调用栈（最内层几帧）
+        recent_stalls = snapshot["events"].get("ui.stall", [])
+        last_stall = ""
+        if recent_stalls:
+            stall = recent_stalls[-1]
+            stack_tail = "\n".join(stall["stack"].strip().splitlines()[-6:])
+            last_stall = f"Last stall: {stall['duration_ms']:.0f}ms\n{stack_tail}\n"
         perf_log = f"""
 === UI Performance Statistics ===
 Button rebuilds: {stats['button_rebuilds']}
@@ -112,6 +129,8 @@ Cache hits: {stats['cache_hits']}
 Cache misses: {stats['cache_misses']}
 Cache hit rate: {cache_hit_rate:.1f}%
 Batch updates: {stats['batch_updates']}
+UI stalls: {stats['stalls']}
+{last_stall}{histogram_lines}
 ================================"""
         
         if hasattr(self.parent_ui, '_append_log'):
@@ -119,8 +138,7 @@ Batch updates: {stats['batch_updates']}
     
     def increment_stat(self, stat_name):
         """增加统计计数"""
-        if stat_name in self._performance_stats:
-            self._performance_stats[stat_name] += 1
+        self.metrics.inc(f"ui.{stat_name}")
     
     @property
     def is_batch_updating(self):
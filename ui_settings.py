@@ -6,7 +6,6 @@ import hashlib
 from PySide6.QtCore import QSettings
 from PySide6.QtWidgets import QApplication
 
-from i18n import i18n
 from ui_config import get_project_settings_group
 
 
@@ -21,12 +20,9 @@ class UISettingsManager:
         # 加载通用UI设置
         self._load_general_settings()
         
-        # 加载项目特定设置
+        # 加载项目特定设置（包括base64传输配置）
         self._load_project_settings()
         
-        # 加载base64传输配置
-        self._load_base64_settings()
-        
         # 构建最终配置
         return self._build_config()
     
@@ -49,26 +45,23 @@ class UISettingsManager:
         self.parent_ui.settings.endGroup()
     
     def _load_project_settings(self):
-        """加载项目特定设置"""
-        self.parent_ui.settings.beginGroup(self.parent_ui.project_group_name)
+        """加载项目特定设置（来自项目配置快照，不逐项访问存储）"""
+        profile = self.parent_ui.config_manager.load_profile()
         
-        self.loaded_run_command = self.parent_ui.settings.value("run_command", "", type=str)
-        self.loaded_execute_auto = self.parent_ui.settings.value("execute_automatically", False, type=bool)
-        self.loaded_suffix_mode = self.parent_ui.settings.value("suffix_mode", "force", type=str)
-        self.loaded_button_size = self.parent_ui.settings.value("button_size", "medium", type=str)
-        self.loaded_custom_width = self.parent_ui.settings.value("custom_button_width", 120, type=int)
-        self.loaded_custom_height = self.parent_ui.settings.value("custom_button_height", 40, type=int)
-        self.loaded_visible_buttons = self.parent_ui.settings.value("visible_buttons", 
-                                                                   list(range(len(self.parent_ui.default_quick_responses))), type=list)
-        self.loaded_language = self.parent_ui.settings.value("language", "zh_CN", type=str)
-        self.command_section_visible = self.parent_ui.settings.value("commandSectionVisible", False, type=bool)
+        self.loaded_run_command = profile["run_command"]
+        self.loaded_execute_auto = profile["execute_automatically"]
+        self.loaded_suffix_mode = profile["suffix_mode"]
+        self.loaded_button_size = profile["button_size"]
+        self.loaded_custom_width = profile["custom_button_width"]
+        self.loaded_custom_height = profile["custom_button_height"]
+        self.loaded_visible_buttons = profile["visible_buttons"]
+        self.loaded_language = profile["language"]
+        self.command_section_visible = profile["commandSectionVisible"]
+        self.loaded_enable_follow_up = profile["enable_follow_up"]
         
-        self.parent_ui.settings.endGroup()
-    
-    def _load_base64_settings(self):
-        """加载base64传输配置"""
-        self.loaded_use_base64 = self.parent_ui.settings.value("use_base64_transmission", True, type=bool)
-        self.loaded_base64_size = self.parent_ui.settings.value("base64_target_size_kb", 30, type=int)
+        # base64传输配置与其他项目配置一起保存在项目设置组中
+        self.loaded_use_base64 = profile["use_base64_transmission"]
+        self.loaded_base64_size = profile["base64_target_size_kb"]
     
     def _build_config(self):
         """构建配置字典"""
@@ -82,26 +75,16 @@ class UISettingsManager:
             "visible_buttons": self.loaded_visible_buttons if self.loaded_visible_buttons else list(range(len(self.parent_ui.default_quick_responses))),
             "language": self.loaded_language,
             "use_base64_transmission": self.loaded_use_base64,
-            "base64_target_size_kb": self.loaded_base64_size
+            "base64_target_size_kb": self.loaded_base64_size,
+            "enable_follow_up": self.loaded_enable_follow_up
         }
     
     def save_config(self):
-        """保存所有配置到QSettings"""
-        self.parent_ui.settings.beginGroup(self.parent_ui.project_group_name)
-        self.parent_ui.settings.setValue("run_command", self.parent_ui.config["run_command"])
-        self.parent_ui.settings.setValue("execute_automatically", self.parent_ui.config["execute_automatically"])
-        self.parent_ui.settings.setValue("suffix_mode", self.parent_ui.config["suffix_mode"])
-        self.parent_ui.settings.setValue("button_size", self.parent_ui.config["button_size"])
-        self.parent_ui.settings.setValue("custom_button_width", self.parent_ui.config["custom_button_width"])
-        self.parent_ui.settings.setValue("custom_button_height", self.parent_ui.config["custom_button_height"])
-        self.parent_ui.settings.setValue("visible_buttons", self.parent_ui.config["visible_buttons"])
-        self.parent_ui.settings.setValue("language", self.parent_ui.config["language"])
-        self.parent_ui.settings.setValue("use_base64_transmission", self.parent_ui.config["use_base64_transmission"])
-        self.parent_ui.settings.setValue("base64_target_size_kb", self.parent_ui.config["base64_target_size_kb"])
-        self.parent_ui.settings.endGroup()
+        """保存所有配置（只有变化的项会在防抖后写回存储）"""
+        self.parent_ui.config_manager.save_config(self.parent_ui.config)
         
         if hasattr(self.parent_ui, 'event_manager'):
-            self.parent_ui.event_manager.append_log(i18n.t("configuration_saved"))
+            self.parent_ui.event_manager.append_log(self.parent_ui.i18n.t("configuration_saved"))
     
     def update_config_from_ui(self):
         """从UI控件更新配置"""
@@ -117,15 +100,20 @@ class UISettingsManager:
         elif self.parent_ui.suffix_radio_none.isChecked():
             self.parent_ui.config["suffix_mode"] = "none"
         
-        # 立即保存配置变更
-        self.parent_ui.settings.beginGroup(self.parent_ui.project_group_name)
-        self.parent_ui.settings.setValue("suffix_mode", self.parent_ui.config["suffix_mode"])
-        self.parent_ui.settings.endGroup()
+        # 保存配置变更（延迟写回）
+        self.parent_ui.config_manager.set_value("suffix_mode", self.parent_ui.config["suffix_mode"])
         
         # 记录配置保存日志
         if hasattr(self.parent_ui, 'event_manager'):
             self.parent_ui.event_manager.append_log(f"后缀模式已更新为: {self.parent_ui.config['suffix_mode']}\n")
     
+    def update_follow_up_config(self):
+        """更新追加反馈配置"""
+        self.parent_ui.config["enable_follow_up"] = self.parent_ui.follow_up_checkbox.isChecked()
+        
+        # 保存配置变更（延迟写回）
+        self.parent_ui.config_manager.set_value("enable_follow_up", self.parent_ui.config["enable_follow_up"])
+    
     def update_base64_config(self):
         """更新base64传输配置"""
         self.parent_ui.config["use_base64_transmission"] = self.parent_ui.base64_checkbox.isChecked()
@@ -148,4 +136,4 @@ class UISettingsManager:
             self.parent_ui.toggle_command_button.setText("Show Command Section")
         
         # 设置国际化语言
-        i18n.set_language(self.loaded_language) 
\ No newline at end of file
+        self.parent_ui.i18n.set_language(self.loaded_language) 
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+标签页窗口模块 - 负责在一个窗口中以标签页承载多个待回复的反馈请求
+"""
+import os
+
+from PySide6.QtWidgets import QMainWindow, QTabWidget
+from PySide6.QtCore import Qt, QSettings, Signal
+from PySide6.QtGui import QIcon
+
+from i18n import i18n
+from ui_utils import set_dark_title_bar
+
+TAB_TITLE_MAX_LENGTH = 24  # 标签页标题中提示文本的最大长度
+
+
+class FeedbackTabWindow(QMainWindow):
+    """多请求标签页窗口：每个反馈请求占一个标签页，用户可按任意顺序回复"""
+
+    # 用户关闭整个窗口时发出，由宿主结束所有打开和排队中的请求
+    close_all_requested = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle(i18n.t("window_title"))
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        self.setWindowIcon(QIcon(os.path.join(script_dir, "images", "feedback.png")))
+        self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
+
+        self.tabs = QTabWidget()
+        self.tabs.setTabsClosable(True)
+        self.tabs.setMovable(True)
+        self.tabs.setDocumentMode(True)
+        self.tabs.tabCloseRequested.connect(self._on_tab_close_requested)
+        self.setCentralWidget(self.tabs)
+
+        self.settings = QSettings("InteractiveFeedbackMCP", "InteractiveFeedbackMCP")
+        self.settings.beginGroup("TabWindow")
+        geometry = self.settings.value("geometry")
+        self.settings.endGroup()
+        if geometry:
+            self.restoreGeometry(geometry)
+        else:
+            self.resize(860, 680)
+
+        set_dark_title_bar(self, True)
+
+    @staticmethod
+    def tab_title(project_directory: str, prompt: str) -> str:
+        """生成标签页标题：项目名 + 提示首行"""
+        project_name = os.path.basename(os.path.normpath(project_directory)) if project_directory else ""
+        first_line = prompt.strip().splitlines()[0] if prompt.strip() else ""
+        if len(first_line) > TAB_TITLE_MAX_LENGTH:
+            first_line = first_line[:TAB_TITLE_MAX_LENGTH - 1] + "…"
+        return f"{project_name}: {first_line}" if project_name else first_line
+
+    def add_feedback(self, ui, priority: int = 0):
+        """添加一个反馈界面，优先级高的标签页排在前面"""
+        index = 0
+        while index < self.tabs.count() and self.tabs.tabBar().tabData(index) >= priority:
+            index += 1
+
+        index = self.tabs.insertTab(index, ui, self.tab_title(ui.project_directory, ui.prompt))
+        self.tabs.tabBar().setTabData(index, priority)
+        self.tabs.setTabToolTip(index, ui.prompt)
+        if self.tabs.count() == 1:
+            self.tabs.setCurrentIndex(index)
+
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def remove_feedback(self, ui):
+        """移除反馈界面的标签页，没有剩余标签页时隐藏窗口"""
+        index = self.tabs.indexOf(ui)
+        if index < 0:
+            return
+        self.tabs.removeTab(index)
+        ui.setParent(None)
+
+        if self.tabs.count() == 0:
+            self._save_geometry()
+            self.hide()
+        else:
+            # 切换到优先级最高的请求
+            self.tabs.setCurrentIndex(0)
+
+    def set_queued_count(self, count: int):
+        """在状态栏显示排队中的请求数"""
+        if count > 0:
+            self.statusBar().showMessage(i18n.t("queued_requests").format(count=count))
+        else:
+            self.statusBar().clearMessage()
+
+    def _on_tab_close_requested(self, index: int):
+        """关闭标签页等同于关闭对应的反馈窗口（返回当前结果）"""
+        widget = self.tabs.widget(index)
+        if widget is not None:
+            widget.close()
+
+    def _save_geometry(self):
+        """保存窗口几何"""
+        self.settings.beginGroup("TabWindow")
+        self.settings.setValue("geometry", self.saveGeometry())
+        self.settings.endGroup()
+
+    def closeEvent(self, event):
+        """关闭整个窗口时结束所有请求"""
+        self._save_geometry()
+        self.close_all_requested.emit()
+        super().closeEvent(event)
@@ -3,14 +3,16 @@ UI工具模块 - 包含通用UI工具函数和自定义组件
 """
 import os
 import sys
-import subprocess
 import signal
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from PySide6.QtWidgets import QApplication, QTextEdit, QWidget
 from PySide6.QtCore import QObject, Signal, Qt
 from PySide6.QtGui import QColor, QPalette, QKeyEvent
 from i18n import i18n
 
+if TYPE_CHECKING:
+    import subprocess
+
 
 def set_dark_title_bar(widget: QWidget, dark_title_bar: bool) -> None:
     """设置窗口标题栏为暗色模式（Windows特定）"""
@@ -74,10 +76,11 @@ def get_dark_mode_palette(app: QApplication):
     return palette
 
 
-def kill_tree(process: subprocess.Popen):
+def kill_tree(process: "subprocess.Popen"):
     """终止进程树（跨平台）"""
     if sys.platform == "win32":
         # Windows: 使用taskkill命令终止进程树
+        import subprocess
         try:
             subprocess.run(
                 ["taskkill", "/F", "/T", "/PID", str(process.pid)],
@@ -132,10 +135,11 @@ class LogSignals(QObject):
 class FeedbackTextEdit(QTextEdit):
     """自定义文本编辑器 - 支持图片粘贴和拖放"""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, translator=None):
         super().__init__(parent)
+        self.i18n = translator or i18n  # 所属窗口的翻译器
         self.setAcceptDrops(True)
-        self.setPlaceholderText(i18n.t("placeholder_feedback"))
+        self.setPlaceholderText(self.i18n.t("placeholder_feedback"))
 
     def keyPressEvent(self, event: QKeyEvent):
         """处理键盘事件"""
@@ -0,0 +1,96 @@
+"""
+事件循环看门狗模块 - 负责检测Qt事件循环卡顿并记录卡顿时主线程的调用栈
+
+高频心跳定时器测量事件循环延迟（ui.event_loop_lag_ms）；后台线程发现心跳停滞超过阈值时，
+通过 sys._current_frames() 抓取主线程的Python调用栈。卡顿计入 ui.stalls / ui.stall_ms，
+调用栈作为 ui.stall 事件写入共享指标注册表（metrics.py）。
+"""
+import os
+import sys
+import time
+import threading
+import traceback
+from typing import Optional
+
+from PySide6.QtCore import QObject, QTimer, Qt
+
+from config import WATCHDOG_ENV, WATCHDOG_INTERVAL_MS, WATCHDOG_STALL_MS
+from metrics import metrics
+
+
+def is_watchdog_enabled() -> bool:
+    """看门狗是否启用（默认启用）"""
+    return os.environ.get(WATCHDOG_ENV, "1") != "0"
+
+
+class EventLoopWatchdog(QObject):
+    """事件循环看门狗"""
+
+    def __init__(self, interval_ms: int = WATCHDOG_INTERVAL_MS, stall_ms: int = WATCHDOG_STALL_MS, parent=None):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.stall_ms = stall_ms
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_tick)
+
+        self._main_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stall_stack: Optional[str] = None  # 后台线程在卡顿期间抓到的调用栈
+        self._stack_lock = threading.Lock()
+        self._stop_event: Optional[threading.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._timer.isActive()
+
+    def start(self):
+        """启动心跳定时器和监视线程（需在GUI线程调用）"""
+        if self.running:
+            return
+        self._main_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._timer.start(self.interval_ms)
+
+        self._stop_event = threading.Event()
+        threading.Thread(target=self._monitor, args=(self._stop_event,), daemon=True).start()
+
+    def stop(self):
+        """停止检测"""
+        self._timer.stop()
+        if self._stop_event is not None:
+            self._stop_event.set()
+            self._stop_event = None
+
+    def _on_tick(self):
+        """心跳：计算本次延迟，超过阈值时记录卡顿"""
+        now = time.monotonic()
+        lag_ms = max(0.0, (now - self._last_tick) * 1000 - self.interval_ms)
+        self._last_tick = now
+        metrics.observe("ui.event_loop_lag_ms", lag_ms)
+
+        with self._stack_lock:
+            stack, self._stall_stack = self._stall_stack, None
+
+        if lag_ms >= self.stall_ms:
+            metrics.inc("ui.stalls")
+            metrics.observe("ui.stall_ms", lag_ms)
+            metrics.record_event("ui.stall", {"duration_ms": round(lag_ms, 1), "stack": stack or ""})
+            print(f"[watchdog] UI event loop stalled for {lag_ms:.0f}ms", file=sys.stderr)
+            if stack:
+                print(stack, file=sys.stderr)
+
+    def _monitor(self, stop_event: threading.Event):
+        """后台线程：心跳停滞超过阈值时抓取主线程调用栈（每次卡顿只抓一次）"""
+        check_interval = self.stall_ms / 2 / 1000
+        threshold = (self.stall_ms + self.interval_ms) / 1000
+        while not stop_event.wait(check_interval):
+            if time.monotonic() - self._last_tick < threshold:
+                continue
+            with self._stack_lock:
+                if self._stall_stack is not None:
+                    continue
+                frame = sys._current_frames().get(self._main_thread_id)
+                if frame is not None:
+                    self._stall_stack = "".join(traceback.format_stack(frame))